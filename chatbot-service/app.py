@@ -1,29 +1,105 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
-import torch
-import joblib
-import json
+from contextlib import asynccontextmanager
+import asyncio
+import os
+import random
+import time
 from pathlib import Path
+import sys
+
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from intent_cache import IntentCache
+from intent_model import IntentModel
+from micro_batcher import MicroBatcher
+from keyword_intents import RESPONSES, get_intent
+from shared.metrics import MetricsMiddleware, metrics
+from shared.work_pool import PoolOverloaded, WorkPool
 
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR / "model"
 
-# Load model and tokenizer
-tokenizer = DistilBertTokenizer.from_pretrained(MODEL_DIR)
-model = DistilBertForSequenceClassification.from_pretrained(MODEL_DIR)
-model.eval()
+# MODEL_LOADING=eager loads the model at import (blocking startup);
+# MODEL_LOADING=lazy loads it in a background warm-up task and answers with
+# keyword intents until it is ready
+MODEL_LOADING = os.environ.get("MODEL_LOADING", "eager")
+if MODEL_LOADING not in ("eager", "lazy"):
+    raise ValueError(f"Unknown MODEL_LOADING: {MODEL_LOADING}")
+
+# Inference backend: torch (fp32), int8 (torch dynamic quantization) or
+# onnx (ONNX Runtime, int8); the quantized files come from model_export.py
+INTENT_BACKEND = os.environ.get("INTENT_BACKEND", "torch")
+
+def load_intent_model():
+    start = time.perf_counter()
+    loaded = IntentModel.load(MODEL_DIR, INTENT_BACKEND)
+    return loaded, round(time.perf_counter() - start, 3)
+
+intent_model = None
+model_error = None
+model_load_seconds = None
+if MODEL_LOADING == "eager":
+    intent_model, model_load_seconds = load_intent_model()
+
+# Dedicated pool for model inference; requests beyond INFERENCE_WORKERS
+# running + INFERENCE_QUEUE waiting get a 503
+INFERENCE_QUEUE = int(os.environ.get("INFERENCE_QUEUE", "64"))
+inference_pool = WorkPool(
+    "inference",
+    max_workers=int(os.environ.get("INFERENCE_WORKERS", "2")),
+    max_queue=INFERENCE_QUEUE,
+)
+
+# CHAT_BATCHING=1 groups concurrent /chat messages into one forward pass
+CHAT_BATCHING = os.environ.get("CHAT_BATCHING", "0") == "1"
+batcher = MicroBatcher(
+    lambda messages: intent_model.predict_batch(messages),
+    max_batch_size=int(os.environ.get("CHAT_MAX_BATCH_SIZE", "16")),
+    max_wait_ms=float(os.environ.get("CHAT_MAX_WAIT_MS", "5")),
+    max_pending=INFERENCE_QUEUE,
+    run=inference_pool.run,
+) if CHAT_BATCHING else None
+
+# Cache of (intent, confidence) for repeated messages; INTENT_CACHE_SIZE=0 disables
+INTENT_CACHE_SIZE = int(os.environ.get("INTENT_CACHE_SIZE", "4096"))
+intent_cache = IntentCache(
+    max_size=INTENT_CACHE_SIZE,
+    ttl=float(os.environ.get("INTENT_CACHE_TTL", "600")),
+) if INTENT_CACHE_SIZE > 0 else None
 
-# Load label encoder
-label_encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+async def warm_up():
+    global intent_model, model_error, model_load_seconds
+    try:
+        intent_model, model_load_seconds = await asyncio.to_thread(load_intent_model)
+        print(f"✅ Intent model ready in {model_load_seconds}s")
+    except Exception as e:
+        model_error = str(e)
+        print(f"⚠️ Warning: Could not load intent model - {e}")
 
-# Load responses
-with open(MODEL_DIR / "responses.json", "r") as f:
-    responses = json.load(f)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(warm_up()) if intent_model is None else None
+    if batcher is not None:
+        batcher.start()
+    yield
+    if task is not None:
+        task.cancel()
+    if batcher is not None:
+        await batcher.stop()
+    inference_pool.shutdown()
 
-app = FastAPI(title="Admission Chatbot", version="1.0")
+app = FastAPI(title="Admission Chatbot", version="1.0", lifespan=lifespan)
+
+@app.exception_handler(PoolOverloaded)
+@app.exception_handler(asyncio.QueueFull)
+async def overloaded(request, exc: Exception):
+    detail = str(exc) if isinstance(exc, PoolOverloaded) else "inference batch queue is full"
+    return JSONResponse(status_code=503, content={"detail": detail}, headers={"Retry-After": "1"})
 
 # Add CORS middleware
 app.add_middleware(
@@ -34,6 +110,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus-style /metrics (per-route latency, tokenize/forward stages,
+# cache and pool gauges); METRICS=0 turns collection off
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+metrics.add_stats("pool", {"pool": "inference"}, inference_pool.stats,
+                  gauges=("running", "queued", "peak_queued"), counters=("completed", "failed", "rejected"))
+if intent_cache is not None:
+    metrics.add_stats("intent_cache", {}, intent_cache.stats,
+                      gauges=("size", "hit_ratio"), counters=("hits", "misses"))
+if batcher is not None:
+    metrics.add_stats("batcher", {}, batcher.stats, gauges=("pending",), counters=("batches", "items"))
+
 class ChatRequest(BaseModel):
     message: str
 
@@ -46,28 +134,66 @@ class ChatResponse(BaseModel):
 def root():
     return {"message": "Admission Chatbot API"}
 
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 until the intent model has loaded"""
+    if intent_model is None:
+        detail = f"Model failed to load: {model_error}" if model_error else "Model is loading"
+        raise HTTPException(status_code=503, detail=detail)
+    return {
+        "status": "ready",
+        "backend": intent_model.backend,
+        "model_load_seconds": model_load_seconds
+    }
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of all collected metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS=0)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the intent prediction cache"""
+    if intent_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **intent_cache.stats()}
+
+@app.get("/pool-stats")
+def pool_stats():
+    """Queue depth, rejections and timings of the inference pool"""
+    stats = {"inference": inference_pool.stats()}
+    if batcher is not None:
+        stats["batcher"] = batcher.stats()
+    return stats
+
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
-    # Tokenize input
-    inputs = tokenizer(req.message, return_tensors="pt", truncation=True, padding=True, max_length=128)
-    
-    # Predict
-    with torch.no_grad():
-        outputs = model(**inputs)
-        logits = outputs.logits
-        probabilities = torch.softmax(logits, dim=-1)
-        confidence, predicted_class = torch.max(probabilities, dim=-1)
-    
-    intent_idx = predicted_class.item()
-    confidence_score = confidence.item()
-    intent = label_encoder.inverse_transform([intent_idx])[0]
-    
-    # Get a random response for that intent
-    import random
-    response_text = random.choice(responses.get(intent, ["I'm not sure how to respond to that."]))
-    
+async def chat(req: ChatRequest):
+    if intent_model is None:
+        # Model still warming up: answer from keyword rules
+        intent = get_intent(req.message)
+        return ChatResponse(
+            intent=intent,
+            response=random.choice(RESPONSES[intent]),
+            confidence=0.0
+        )
+
+    model = intent_model
+    cached = intent_cache.get(req.message, model.version) if intent_cache is not None else None
+    if cached is not None:
+        intent, confidence_score = cached
+    else:
+        if batcher is not None:
+            intent, confidence_score = await batcher.submit(req.message)
+        else:
+            intent, confidence_score = await inference_pool.run(model.predict, req.message)
+        if intent_cache is not None:
+            intent_cache.put(req.message, model.version, (intent, confidence_score))
+    response_text = model.respond(intent)
+
     return ChatResponse(
         intent=intent,
         response=response_text,
         confidence=confidence_score
-    )
\ No newline at end of file
+    )
@@ -1,13 +1,36 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 import pandas as pd
 from pathlib import Path
+import os
 import random
-import re
+import sys
+
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from cutoff_cube import CutoffCube
+from keyword_intents import RESPONSES, MessageFeatures, analyze_message
+from shared.college_ids import CollegeIds, registry_path
+from shared.metrics import MetricsMiddleware, metrics
+from shared.work_pool import PoolOverloaded, WorkPool
 
 app = FastAPI(title="Admission Chatbot", version="1.0")
 
+# Dedicated pool for cube lookups and college-name search; requests beyond
+# QUERY_WORKERS running + QUERY_QUEUE waiting get a 503
+query_pool = WorkPool(
+    "query",
+    max_workers=int(os.environ.get("QUERY_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.environ.get("QUERY_QUEUE", "64")),
+)
+
+@app.exception_handler(PoolOverloaded)
+async def pool_overloaded(request, exc: PoolOverloaded):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -17,18 +40,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus-style /metrics (per-route latency, hot-path stages and pool
+# gauges); METRICS=0 turns collection off
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+metrics.add_stats("pool", {"pool": "query"}, query_pool.stats,
+                  gauges=("running", "queued", "peak_queued"), counters=("completed", "failed", "rejected"))
+
 # Load database
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR.parent / "database" / "cutoff_history.csv"
+DB_DIR = BASE_DIR.parent / "database"
+DB_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", DB_DIR / "cutoff_history.csv"))
+
+sys.path.append(str(DB_DIR))
+from cutoff_snapshot import SnapshotStore
 
-try:
-    cutoff_df = pd.read_csv(DB_PATH)
-    print(f"✅ Loaded {len(cutoff_df)} college records from database")
+def build_data(cutoff_df: pd.DataFrame, college_ids=None):
+    """Cutoff table plus its precomputed aggregate cube"""
+    if cutoff_df.empty:
+        return cutoff_df, None
+    if college_ids is None:
+        # Same persisted college ids as ml-service and the snapshots
+        college_ids = CollegeIds(registry_path(DB_PATH)).register(cutoff_df["Name"].unique())
+    return cutoff_df, CutoffCube(cutoff_df, college_ids=college_ids)
+
+# Prefer the shared memory-mapped snapshot (swapped when a new one is published),
+# fall back to a private CSV load when none exists
+snapshot_store = SnapshotStore(lambda snapshot: build_data(snapshot.to_frame(), snapshot.college_ids()))
+csv_data = None
+if snapshot_store.version:
+    cutoff_df = snapshot_store.get()[0]
+    print(f"✅ Mapped snapshot {snapshot_store.version} with {len(cutoff_df)} college records")
+else:
+    try:
+        cutoff_df = pd.read_csv(DB_PATH)
+        print(f"✅ Loaded {len(cutoff_df)} college records from database")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not load database - {e}")
+        cutoff_df = pd.DataFrame()
+    csv_data = build_data(cutoff_df)
+if not cutoff_df.empty:
     print(f"📊 Courses: {cutoff_df['course'].unique().tolist()}")
     print(f"📊 Categories: {cutoff_df['category'].unique().tolist()}")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load database - {e}")
-    cutoff_df = pd.DataFrame()
+
+def cutoff_data():
+    """(cutoff_df, cutoff_cube) for the current dataset"""
+    return snapshot_store.get() or csv_data
+
+# Intents where a college name in the message gets that college's cutoffs
+COLLEGE_INTENTS = ("cutoff", "college_search", "admission_probability")
+COLLEGE_ROWS = 10
 
 class ChatRequest(BaseModel):
     message: str
@@ -38,176 +99,64 @@ class ChatResponse(BaseModel):
     response: str
     confidence: float
 
-# Extract information from message
+# Extract information from message (one scan shared with get_intent)
 def extract_course(message: str):
     """Extract course from message"""
-    course_map = {
-        "cse": "CSE", "computer science": "CSE", "cs": "CSE",
-        "it": "IT", "information technology": "IT",
-        "ece": "ECE", "electronics": "ECE",
-        "eee": "EEE", "electrical": "EEE",
-        "mech": "MECH", "mechanical": "MECH",
-        "civil": "CIVIL"
-    }
-    message = message.lower()
-    for key, value in course_map.items():
-        if key in message:
-            return value
-    return None
+    return analyze_message(message).course
 
 def extract_category(message: str):
     """Extract category from message"""
-    message = message.upper()
-    categories = ["OC", "BC", "MBC", "SC", "ST"]
-    for cat in categories:
-        if cat in message:
-            return cat
-    return None
+    return analyze_message(message).category
 
 def extract_rank(message: str):
     """Extract rank number from message"""
-    numbers = re.findall(r'\b\d{1,6}\b', message)
-    if numbers:
-        return int(numbers[0])
-    return None
+    return analyze_message(message).rank
 
 def search_colleges(course: str = None, category: str = None, rank: int = None):
     """Search colleges based on criteria"""
-    if cutoff_df.empty:
+    _, cube = cutoff_data()
+    if cube is None:
         return []
     
-    df = cutoff_df.copy()
-    
-    if course:
-        df = df[df['course'] == course.upper()]
-    if category:
-        df = df[df['category'] == category.upper()]
-    if rank:
-        # Find colleges where cutoff rank is close to student rank
-        df = df[(df['cutoff_rank'] >= rank * 0.7) & (df['cutoff_rank'] <= rank * 1.3)]
-    
-    # Get latest year data
-    if not df.empty:
-        latest_year = df['year'].max()
-        df = df[df['year'] == latest_year]
-    
-    return df.head(5).to_dict('records')
-
-# Simple intent-response mapping
-RESPONSES = {
-    "greeting": [
-        "Hello! I'm here to help you with college admissions. I have access to cutoff data from 500+ colleges!",
-        "Hi there! I can help you find the perfect college based on your rank, course preference, and category.",
-        "Welcome to CampusMate! Ask me about college cutoffs, admission chances, or get personalized recommendations."
-    ],
-    "admission_process": [
-        "The admission process typically involves: 1) Check eligibility, 2) Take entrance exams, 3) Submit applications, 4) Attend counseling.",
-        "First, ensure you meet the eligibility criteria. Then prepare for entrance exams like JEE or state exams, and submit your application before the deadline."
-    ],
-    "cutoff": [
-        "I can provide specific cutoff information! Please tell me: your course (CSE/IT/ECE/EEE/MECH/CIVIL), category (OC/BC/MBC/SC/ST), and year.",
-        "Cutoff ranks vary by college, course, and category. Share your preferences and I'll give you detailed cutoff information from our database!",
-        "I have cutoff data from 2020-2023 for 500+ colleges. What course and category are you interested in?"
-    ],
-    "fees": [
-        "Fee structures vary significantly. Government colleges: ₹30,000-₹80,000/year. Private colleges: ₹80,000-₹3,00,000/year.",
-        "Most engineering colleges charge between ₹50,000 to ₹2,50,000 per year. Government colleges are more affordable.",
-        "Scholarships are available for SC/ST/BC categories. Many private colleges also offer merit scholarships."
-    ],
-    "eligibility": [
-        "Basic eligibility: Pass 12th with Physics, Chemistry, and Mathematics. Valid entrance exam scores (JEE/State exams).",
-        "Most colleges require minimum 50% in 12th (45% for reserved categories) and valid entrance exam ranks.",
-        "Check specific college websites for detailed eligibility. Requirements vary by course and institution type."
-    ],
-    "safe_dream_target": [
-        "Based on your rank, I can categorize colleges! Safe: 20% above cutoff, Target: Near cutoff, Dream: 10-20% below cutoff.",
-        "Share your rank, course, and category - I'll give you personalized Safe, Target, and Dream college lists from our database!",
-        "I recommend: 40% safe colleges, 40% target colleges, 20% dream colleges. Want me to find them for you?"
-    ],
-    "admission_probability": [
-        "I can calculate your admission chances! Just tell me: your rank, desired course, category, and the college you're interested in.",
-        "Share your rank and preferences - I'll analyze our cutoff database and give you probability estimates for multiple colleges!",
-        "Probability depends on historical cutoffs, your rank, category, and course. Give me your details for accurate predictions."
-    ],
-    "reservation": [
-        "Categories: OC (Open), BC (Backward Class), MBC (Most Backward), SC (Scheduled Caste), ST (Scheduled Tribe).",
-        "Reserved categories have lower cutoff ranks. Our database has separate cutoffs for each category.",
-        "Tell me your category (OC/BC/MBC/SC/ST) and I'll show you relevant cutoffs and colleges!"
-    ],
-    "college_search": [
-        "I can search our database of 500+ colleges! Tell me your rank, course preference (CSE/IT/ECE/EEE/MECH/CIVIL), and category.",
-        "Looking for specific colleges? Share your criteria and I'll find matching options from our comprehensive database!",
-        "Want college recommendations? Give me: your rank, course, and category - I'll find the best matches!"
-    ],
-    "courses": [
-        "Available courses: CSE (Computer Science), IT (Information Technology), ECE (Electronics), EEE (Electrical), MECH (Mechanical), CIVIL.",
-        "Popular choices: CSE and IT have high demand. ECE and EEE offer electronics focus. MECH and CIVIL are core engineering branches.",
-        "Each course has different cutoffs. Which one interests you? I can show specific cutoff data!"
-    ],
-    "trends": [
-        "You can view cutoff trends from 2020-2023 in our database. Trends show how cutoffs changed over years.",
-        "Historical data helps predict future cutoffs. Generally, cutoffs are increasing for popular branches like CSE and IT.",
-        "Want trend analysis for a specific college or course? Tell me and I'll pull the data!"
-    ],
-    "thanks": [
-        "You're welcome! Feel free to ask about more colleges or admission queries.",
-        "Happy to help! I'm here if you need more college information or predictions.",
-        "Glad I could assist! Come back anytime for admission guidance."
-    ],
-    "goodbye": [
-        "Goodbye! Best of luck with your admissions! 🎓",
-        "Take care! Remember, we're here to help with your college journey.",
-        "Best wishes! Feel free to return with more questions anytime."
-    ],
-    "default": [
-        "I can help with: college recommendations, cutoff information, admission probability, course details, and more!",
-        "Try asking: 'Show me colleges for CSE with rank 25000' or 'What's the cutoff for IT in Anna University?'",
-        "I have data on 500+ colleges! Ask about cutoffs, admission chances, courses (CSE/IT/ECE/EEE/MECH/CIVIL), or categories."
-    ]
-}
+    # Latest year's colleges whose cutoff is close to the student's rank
+    return cube.search(
+        course.upper() if course else None,
+        category.upper() if category else None,
+        rank
+    )
 
-def get_intent(message: str) -> str:
-    """Enhanced keyword-based intent detection"""
-    message = message.lower()
+def college_response(cube, college_id: int, name: str, course: str = None, category: str = None) -> str:
+    """Cutoffs of one named college, latest year first"""
+    rows = cube.college_cutoffs(college_id, course, category)
+    if not rows:
+        response = f"I found {name}, but have no cutoffs for it"
+        if course:
+            response += f" in {course}"
+        if category:
+            response += f" for {category} category"
+        return response + ". Try another course or category!"
     
-    if any(word in message for word in ["hi", "hello", "hey", "greetings", "good morning", "good afternoon"]):
-        return "greeting"
-    elif any(phrase in message for phrase in ["find college", "show college", "recommend college", "suggest college", "list college"]):
-        return "college_search"
-    elif any(phrase in message for phrase in ["cse", "it", "ece", "eee", "mech", "mechanical", "civil", "computer science", "information technology"]):
-        if any(word in message for word in ["course", "branch", "available", "what is"]):
-            return "courses"
-        return "college_search"
-    elif any(phrase in message for phrase in ["safe college", "dream college", "target college", "categorize"]):
-        return "safe_dream_target"
-    elif any(phrase in message for phrase in ["admission probability", "my chances", "will i get", "can i get", "probability"]):
-        return "admission_probability"
-    elif any(word in message for word in ["cutoff", "rank", "score", "marks"]):
-        return "cutoff"
-    elif any(word in message for word in ["fee", "cost", "tuition", "fees", "scholarship"]):
-        return "fees"
-    elif any(word in message for word in ["eligible", "eligibility", "qualify", "criteria"]):
-        return "eligibility"
-    elif any(word in message for word in ["process", "apply", "application", "admission"]):
-        return "admission_process"
-    elif any(word in message for word in ["reservation", "category", "bc", "sc", "st", "obc", "mbc"]):
-        return "reservation"
-    elif any(word in message for word in ["trend", "historical", "previous year", "past data"]):
-        return "trends"
-    elif any(word in message for word in ["thank", "thanks", "appreciate"]):
-        return "thanks"
-    elif any(word in message for word in ["bye", "goodbye", "see you", "exit", "quit"]):
-        return "goodbye"
-    else:
-        return "default"
-
-def generate_context_response(message: str, intent: str) -> str:
+    response = f"Cutoffs for {name}:\n\n"
+    for row in rows[:COLLEGE_ROWS]:
+        response += f"   {row['year']} | {row['course']} | {row['category']}: Cutoff Rank {row['cutoff_rank']}\n"
+    if len(rows) > COLLEGE_ROWS:
+        response += f"\n...and {len(rows) - COLLEGE_ROWS} more. Add a course or category to narrow it down!"
+    return response
+
+@metrics.timed("generate_context_response")
+def generate_context_response(message: str, intent: str, features: MessageFeatures = None) -> str:
     """Generate context-aware responses using database"""
     
     # Extract entities from message
-    course = extract_course(message)
-    category = extract_category(message)
-    rank = extract_rank(message)
+    features = features or analyze_message(message)
+    course, category, rank = features.course, features.category, features.rank
+    
+    # If user named a college (typos and partial names are fine), show its cutoffs
+    if intent in COLLEGE_INTENTS:
+        _, cube = cutoff_data()
+        college = cube.colleges.resolve(message) if cube is not None else None
+        if college:
+            return college_response(cube, *college, course, category)
     
     # If user provided specific criteria, search database
     if intent == "college_search" and (course or category or rank):
@@ -234,47 +183,56 @@ def generate_context_response(message: str, intent: str) -> str:
     
     # If user mentioned specific course/category in cutoff query
     elif intent == "cutoff" and (course or category):
-        if not cutoff_df.empty:
-            df = cutoff_df.copy()
+        _, cube = cutoff_data()
+        stats = cube.stats(course, category) if cube is not None else None
+        if stats:
+            avg_cutoff = stats["mean"]
+            min_cutoff = stats["min"]
+            max_cutoff = stats["max"]
+            
+            response = f"Cutoff information"
             if course:
-                df = df[df['course'] == course]
+                response += f" for {course}"
             if category:
-                df = df[df['category'] == category]
+                response += f" in {category} category"
+            response += f":\n\n"
+            response += f"📊 Average Cutoff: {int(avg_cutoff)}\n"
+            response += f"🔽 Lowest Cutoff: {int(min_cutoff)}\n"
+            response += f"🔼 Highest Cutoff: {int(max_cutoff)}\n\n"
+            response += f"Want specific college cutoffs? Tell me the college name!"
             
-            if not df.empty:
-                avg_cutoff = df['cutoff_rank'].mean()
-                min_cutoff = df['cutoff_rank'].min()
-                max_cutoff = df['cutoff_rank'].max()
-                
-                response = f"Cutoff information"
-                if course:
-                    response += f" for {course}"
-                if category:
-                    response += f" in {category} category"
-                response += f":\n\n"
-                response += f"📊 Average Cutoff: {int(avg_cutoff)}\n"
-                response += f"🔽 Lowest Cutoff: {int(min_cutoff)}\n"
-                response += f"🔼 Highest Cutoff: {int(max_cutoff)}\n\n"
-                response += f"Want specific college cutoffs? Tell me the college name!"
-                
-                return response
+            return response
     
     # Default to template response
     return random.choice(RESPONSES[intent])
 
+@app.get("/pool-stats")
+def pool_stats():
+    """Queue depth, rejections and timings of the query pool"""
+    return {"query": query_pool.stats()}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of all collected metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS=0)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def root():
     return {
         "message": "Admission Chatbot API",
         "status": "running",
-        "database_records": len(cutoff_df),
+        "database_records": len(cutoff_data()[0]),
         "features": ["college_search", "cutoff_info", "course_info", "recommendations"]
     }
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
-    intent = get_intent(req.message)
-    response_text = generate_context_response(req.message, intent)
+async def chat(req: ChatRequest):
+    features = analyze_message(req.message)
+    intent = features.intent
+    # Cube lookups and college search run on the query pool, off the event loop
+    response_text = await query_pool.run(generate_context_response, req.message, intent, features)
     confidence = random.uniform(0.80, 0.99)
     
     return ChatResponse(
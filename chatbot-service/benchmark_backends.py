@@ -0,0 +1,76 @@
+"""Accuracy-parity and latency/memory comparison of the intent backends.
+
+Each backend is loaded in a fresh interpreter and scored on every pattern
+in intents.json:
+  accuracy  - predicted tag matches the pattern's tag
+  agreement - predicted tag matches the fp32 torch backend
+  p50/p95   - single-message predict latency (ms)
+  rss       - resident memory after loading and scoring (MB)
+
+Usage: python benchmark_backends.py [--backends torch int8 onnx] [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROBE = """
+import json, resource, sys, time
+import numpy as np
+from pathlib import Path
+sys.path.append(str(Path.cwd().parent))
+from intent_model import IntentModel
+
+backend, repeat = sys.argv[1], int(sys.argv[2])
+base = Path.cwd()
+with open(base / "intents.json") as f:
+    intents = json.load(f)["intents"]
+patterns = [(p, i["tag"]) for i in intents for p in i["patterns"]]
+
+model = IntentModel.load(base / "model", backend)
+predicted = [model.predict(p)[0] for p, _ in patterns]
+timings = []
+for _ in range(repeat):
+    for p, _ in patterns:
+        t = time.perf_counter()
+        model.predict(p)
+        timings.append((time.perf_counter() - t) * 1000)
+print(json.dumps({
+    "predicted": predicted,
+    "accuracy": float(np.mean([pred == tag for pred, (_, tag) in zip(predicted, patterns)])),
+    "p50": float(np.percentile(timings, 50)),
+    "p95": float(np.percentile(timings, 95)),
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def run_backend(backend: str, repeat: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, backend, str(repeat)], cwd=BASE_DIR,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {backend: run_backend(backend, args.repeat) for backend in args.backends}
+    reference = results.get("torch", next(iter(results.values())))["predicted"]
+
+    print(f"{'backend':<8}{'accuracy':>10}{'agreement':>11}{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}")
+    for backend, r in results.items():
+        agreement = sum(a == b for a, b in zip(r["predicted"], reference)) / len(reference)
+        print(f"{backend:<8}{r['accuracy']:>10.3f}{agreement:>11.3f}"
+              f"{r['p50']:>9.2f}{r['p95']:>9.2f}{r['rss']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
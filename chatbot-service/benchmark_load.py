@@ -0,0 +1,73 @@
+"""Throughput and tail latency of /chat under a realistic message mix.
+
+Starts app_simple.py (or app.py with --app app) in-process over a
+synthetic cutoff history of --rows rows (database/synthetic_history.py),
+and replays a weighted mix of student messages (rank searches, named
+colleges with typos, course/category cutoffs and general questions) from
+--concurrency closed-loop clients through httpx's ASGI transport, so no
+server process or sockets are involved. Reports p50/p95/p99 latency and
+RPS per message kind and overall, plus the process RSS. --json also
+writes the numbers, with the git commit and settings, so runs can be
+compared across commits. Needs httpx (requirements-dev.txt).
+
+    python benchmark_load.py --rows 100000 --requests 5000 --concurrency 16
+    python benchmark_load.py --app app --json load_app.json
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR.parent))
+from shared.load_benchmark import parse_args, run
+
+# Relative weight of each kind of message in the mix
+MIX = {"search": 4, "college": 3, "cutoff": 2, "general": 1}
+GENERAL = [
+    "hello", "what is the fee structure", "am I eligible for engineering",
+    "how does reservation work", "which courses are available", "explain the admission process",
+]
+
+
+def misspell(name: str, rng) -> str:
+    """A student's version of a college name: lower case, a word dropped or a typo"""
+    words = name.lower().split()
+    if len(words) > 2 and rng.random() < 0.5:
+        words.pop(int(rng.integers(1, len(words))))
+    word = int(rng.integers(len(words)))
+    if len(words[word]) > 5:
+        cut = int(rng.integers(1, len(words[word]) - 1))
+        words[word] = words[word][:cut] + words[word][cut + 1:]
+    return " ".join(words)
+
+
+def make_requests(df, n: int, seed: int) -> list:
+    """n (kind, path, body) tuples drawn from the dataset's own values"""
+    rng = np.random.default_rng(seed)
+    rows = df.sample(n, replace=True, random_state=seed)
+    kinds = rng.choice(list(MIX), size=n, p=np.array(list(MIX.values())) / sum(MIX.values()))
+    ranks = rng.integers(df["cutoff_rank"].min(), df["cutoff_rank"].max() + 1, size=n)
+
+    requests = []
+    for kind, row, rank in zip(kinds, rows.itertuples(index=False), ranks.tolist()):
+        if kind == "search":
+            message = f"colleges for rank {rank} in {row.course} {row.category} category"
+        elif kind == "college":
+            message = f"what is the cutoff of {misspell(row.Name, rng)} for {row.course}"
+        elif kind == "cutoff":
+            message = f"cutoff for {row.course} in {row.category} category"
+        else:
+            message = GENERAL[int(rng.integers(len(GENERAL)))]
+        requests.append((kind, "/chat", {"message": message}))
+    return requests
+
+
+def main():
+    args = parse_args("In-process load test of chatbot-service", ["app_simple", "app"])
+    run("chatbot-service", BASE_DIR, args, lambda df, n: make_requests(df, n, args.seed), MIX,
+        label="messages", kind_name=lambda kind: f"chat:{kind}")
+
+
+if __name__ == "__main__":
+    main()
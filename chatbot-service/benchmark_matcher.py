@@ -0,0 +1,95 @@
+"""Benchmark the compiled keyword matcher against the old substring scans.
+
+Replays a chat log (one message per line, or JSON lines with a "message"
+field) through both implementations and reports throughput and every
+message where their intent or entities disagree. Without --log the corpus
+is the intents.json patterns plus a few typical student queries.
+
+Usage: python benchmark_matcher.py [--log chat_log.txt] [--repeat 200]
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from keyword_intents import COURSE_MAP, CATEGORIES, INTENT_RULES, COURSE_QUESTION_WORDS, analyze_message
+
+BASE_DIR = Path(__file__).resolve().parent
+
+SAMPLE_QUERIES = [
+    "Show me colleges for CSE with rank 25000",
+    "What's the cutoff for IT in Anna University?",
+    "which college is best with my rank 18000 in BC",
+    "can i get mechanical in MBC with 32000",
+    "list colleges for ece sc category",
+    "what is the fee structure",
+    "thanks a lot",
+]
+
+
+def legacy_analyze(message: str):
+    """The previous implementation: one substring scan per rule and entity"""
+    lower = message.lower()
+    intent = "default"
+    for rule_intent, keywords in INTENT_RULES:
+        if any(word in lower for word in keywords):
+            intent = rule_intent
+            if rule_intent == "course_mention":
+                intent = "courses" if any(w in lower for w in COURSE_QUESTION_WORDS) else "college_search"
+            break
+    course = next((value for key, value in COURSE_MAP.items() if key in lower), None)
+    upper = message.upper()
+    category = next((cat for cat in CATEGORIES if cat in upper), None)
+    numbers = re.findall(r'\b\d{1,6}\b', message)
+    rank = int(numbers[0]) if numbers else None
+    return intent, course, category, rank
+
+
+def load_corpus(log_path):
+    if log_path is None:
+        with open(BASE_DIR / "intents.json") as f:
+            intents = json.load(f)["intents"]
+        return [p for i in intents for p in i["patterns"]] + SAMPLE_QUERIES
+    messages = []
+    with open(log_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line).get("message", "")
+            messages.append(line)
+    return messages
+
+
+def throughput(fn, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in corpus:
+            fn(message)
+    return len(corpus) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", help="chat log, one message (or JSON object) per line")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.log)
+    legacy = throughput(legacy_analyze, corpus, args.repeat)
+    compiled = throughput(analyze_message, corpus, args.repeat)
+    print(f"{len(corpus)} messages x {args.repeat}")
+    print(f"legacy substring scans: {legacy:>12,.0f} msg/s")
+    print(f"compiled single scan:   {compiled:>12,.0f} msg/s  ({compiled / legacy:.1f}x)")
+
+    diffs = [(m, legacy_analyze(m), tuple(analyze_message(m))) for m in corpus]
+    diffs = [d for d in diffs if d[1] != d[2]]
+    print(f"\n{len(diffs)} messages changed (intent, course, category, rank):")
+    for message, old, new in diffs:
+        print(f"  {message!r}\n    legacy:   {old}\n    compiled: {new}")
+
+
+if __name__ == "__main__":
+    main()
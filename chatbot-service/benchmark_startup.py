@@ -0,0 +1,60 @@
+"""Startup-time benchmark for app.py in eager vs lazy model loading.
+
+Each run starts a fresh interpreter (so import caches don't carry over),
+imports app.py, starts the app and measures:
+  import     - time until `import app` returns
+  first_chat - time until the first /chat response (keyword fallback in lazy mode)
+  ready      - time until /ready returns 200
+
+Usage: python benchmark_startup.py [--runs 3] [--modes eager lazy]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+import app
+t_import = time.perf_counter() - t0
+with TestClient(app.app) as client:
+    client.post("/chat", json={"message": "hi"})
+    t_first = time.perf_counter() - t0
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.02)
+    t_ready = time.perf_counter() - t0
+print(json.dumps({"import": t_import, "first_chat": t_first, "ready": t_ready}))
+"""
+
+
+def run_once(mode: str) -> dict:
+    env = dict(os.environ, MODEL_LOADING=mode)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BASE_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["eager", "lazy"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'import':>10}{'first_chat':>12}{'ready':>10}   (median seconds, {args.runs} runs)")
+    for mode in args.modes:
+        runs = [run_once(mode) for _ in range(args.runs)]
+        med = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        print(f"{mode:<8}{med['import']:>10.3f}{med['first_chat']:>12.3f}{med['ready']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
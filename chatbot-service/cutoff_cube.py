@@ -0,0 +1,146 @@
+"""Precomputed cutoff aggregates and search groups for the chatbot.
+
+Built once per dataset load so chat responses never copy or filter the
+cutoff DataFrame:
+  - count/mean/min/max of cutoff_rank for every (course, category, year)
+    and all their rollups (None = all values of that dimension)
+  - per (course, category) rollup, row positions sorted by cutoff_rank, so a
+    rank-window search is two binary searches
+  - a CollegeSearch over the names (keyed by the registered college_ids)
+    plus each college's rows, so a college a student names is resolved and
+    listed without a scan
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from shared.college_search import CHAT_STOPWORDS, CollegeSearch
+
+DIMENSIONS = ("course", "category", "year")
+SEARCH_DIMENSIONS = ("course", "category")
+
+
+def _encode(column: pd.Series):
+    """(codes, values) for a column; categoricals reuse their codes"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.array.codes, np.asarray(column.cat.categories)
+    codes, values = pd.factorize(column, use_na_sentinel=False)
+    return codes, np.asarray(values)
+
+
+class SearchGroup:
+    """Rows of one (course, category) rollup, sorted by cutoff_rank"""
+
+    __slots__ = ("rows", "ranks", "latest_head")
+
+    def __init__(self, rows, ranks, latest_head):
+        self.rows = rows
+        self.ranks = ranks
+        self.latest_head = latest_head  # first rows (file order) of the latest year
+
+
+class CutoffCube:
+    def __init__(self, df: pd.DataFrame, head: int = 5, college_ids=None):
+        self.size = len(df)
+        self.head = head
+        self._columns = {col: _encode(df[col]) for col in ("Name", "course", "category")}
+        self._years = df["year"].to_numpy()
+        self._ranks = df["cutoff_rank"].to_numpy()
+
+        # Aggregates for every grouping set of (course, category, year)
+        self._stats = {}
+        for n in range(len(DIMENSIONS) + 1):
+            for dims in combinations(DIMENSIONS, n):
+                for key, agg in self._aggregate(df, dims):
+                    full_key = tuple(key[dims.index(d)] if d in dims else None for d in DIMENSIONS)
+                    self._stats[full_key] = agg
+
+        # College name search and rows per college
+        name_codes, names = self._columns["Name"]
+        self.colleges = CollegeSearch((name for name in names.tolist() if pd.notna(name)),
+                                      stopwords=CHAT_STOPWORDS, ids=college_ids)
+        self._name_codes = {str(name): code for code, name in enumerate(names.tolist())}
+        self._rows_by_name = np.argsort(name_codes, kind="stable")
+        self._name_starts = np.searchsorted(name_codes[self._rows_by_name], np.arange(len(names) + 1))
+
+        # Search groups for every rollup of (course, category)
+        self._groups = {}
+        for n in range(len(SEARCH_DIMENSIONS) + 1):
+            for dims in combinations(SEARCH_DIMENSIONS, n):
+                for key, rows in self._positions(df, dims):
+                    full_key = tuple(key[dims.index(d)] if d in dims else None for d in SEARCH_DIMENSIONS)
+                    self._groups[full_key] = self._search_group(rows)
+
+    @staticmethod
+    def _aggregate(df, dims):
+        ranks = df["cutoff_rank"]
+        if not dims:
+            if len(df):
+                yield (), {"count": len(df), "mean": float(ranks.mean()),
+                           "min": int(ranks.min()), "max": int(ranks.max())}
+            return
+        grouped = ranks.groupby([df[d] for d in dims], observed=True).agg(["count", "mean", "min", "max"])
+        for key, row in zip(grouped.index, grouped.itertuples(index=False)):
+            key = key if isinstance(key, tuple) else (key,)
+            key = tuple(int(k) if d == "year" else k for d, k in zip(dims, key))
+            yield key, {"count": int(row.count), "mean": float(row.mean),
+                        "min": int(row.min), "max": int(row.max)}
+
+    @staticmethod
+    def _positions(df, dims):
+        if not dims:
+            yield (), np.arange(len(df))
+            return
+        for key, rows in df.groupby([df[d] for d in dims], observed=True).indices.items():
+            yield (key if isinstance(key, tuple) else (key,)), rows
+
+    def _search_group(self, rows):
+        rows = rows[np.argsort(self._ranks[rows], kind="stable")]
+        ranks = self._ranks[rows]
+        years = self._years[rows]
+        latest = np.sort(rows[years == years.max()])[:self.head] if len(rows) else rows
+        return SearchGroup(rows, ranks, latest)
+
+    def stats(self, course=None, category=None, year=None):
+        """count/mean/min/max of cutoff_rank, or None if there are no rows"""
+        return self._stats.get((course, category, year))
+
+    def record(self, row: int) -> dict:
+        record = {}
+        for col, (codes, values) in self._columns.items():
+            record[col] = values[codes[row]]
+        record["year"] = int(self._years[row])
+        record["cutoff_rank"] = int(self._ranks[row])
+        return record
+
+    def search(self, course=None, category=None, rank=None) -> list:
+        """First rows of the latest year with cutoff within [0.7, 1.3] x rank"""
+        group = self._groups.get((course, category))
+        if group is None:
+            return []
+        if rank:
+            lo = np.searchsorted(group.ranks, rank * 0.7, side="left")
+            hi = np.searchsorted(group.ranks, rank * 1.3, side="right")
+            rows = group.rows[lo:hi]
+            if not len(rows):
+                return []
+            years = self._years[rows]
+            rows = np.sort(rows[years == years.max()])[:self.head]
+        else:
+            rows = group.latest_head
+        return [self.record(row) for row in rows.tolist()]
+
+    def college_cutoffs(self, college_id: int, course=None, category=None) -> list:
+        """Rows of one college (by college_id), latest year first"""
+        name = self.colleges.name(college_id)
+        if name is None:
+            return []
+        code = self._name_codes[name]
+        rows = self._rows_by_name[self._name_starts[code]:self._name_starts[code + 1]]
+        records = [self.record(row) for row in rows.tolist()]
+        records = [
+            r for r in records
+            if (course is None or r["course"] == course) and (category is None or r["category"] == category)
+        ]
+        return sorted(records, key=lambda r: (-r["year"], r["course"], r["category"]))
@@ -0,0 +1,75 @@
+"""Bounded LRU + TTL cache of intent predictions for repeated messages.
+
+Keys are messages lowercased with whitespace collapsed, which is exactly
+what the uncased DistilBERT tokenizer sees, so a cached (intent,
+confidence) is the same the model would return. Lookups pass the version
+of the model that is serving (IntentModel.version); entries cached for any
+other version are dropped, so a newly loaded model never answers with its
+predecessor's predictions.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_message(message: str) -> str:
+    return " ".join(message.lower().split())
+
+
+class IntentCache:
+    """Thread-safe LRU of normalized message -> (intent, confidence)"""
+
+    def __init__(self, max_size: int = 4096, ttl: float = 600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _check_version(self, version: str):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, message: str, version: str):
+        """(intent, confidence) cached for model version, or None"""
+        key = normalize_message(message)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, message: str, version: str, value):
+        key = normalize_message(message)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "version": self._version,
+            }
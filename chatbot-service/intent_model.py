@@ -0,0 +1,123 @@
+"""Fine-tuned DistilBERT intent classifier.
+
+transformers, torch and onnxruntime are imported inside load(), so
+importing this module is cheap and app.py can defer the heavy imports and
+weight loading to a background warm-up task.
+
+Backends (INTENT_BACKEND in app.py):
+  torch - the fp32 checkpoint in PyTorch eager mode
+  int8  - torch dynamic int8 quantization (model_int8.pt)
+  onnx  - ONNX Runtime with the int8-quantized graph (model_int8.onnx)
+The quantized files are written by model_export.py.
+"""
+import hashlib
+import json
+import os
+import random
+
+import joblib
+import numpy as np
+
+from shared.metrics import metrics
+
+TORCH_INT8_FILE = "model_int8.pt"
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+BACKENDS = ("torch", "int8", "onnx")
+
+
+def model_version(model_dir) -> str:
+    """Short hash of the names, sizes and mtimes of the checkpoint files"""
+    digest = hashlib.sha256()
+    for entry in sorted(os.scandir(model_dir), key=lambda e: e.name):
+        if entry.is_file():
+            stat = entry.stat()
+            digest.update(f"{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _torch_forward(model):
+    import torch
+
+    def forward(inputs):
+        with torch.no_grad():
+            logits = model(**inputs).logits
+            return torch.softmax(logits, dim=-1).numpy()
+    return forward
+
+
+def _onnx_forward(path):
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+
+    def forward(inputs):
+        logits = session.run(None, {
+            "input_ids": inputs["input_ids"],
+            "attention_mask": inputs["attention_mask"],
+        })[0]
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+    return forward
+
+
+class IntentModel:
+    """Tokenizer, classifier, label encoder and responses for one checkpoint"""
+
+    def __init__(self, tokenizer, forward, label_encoder, responses, backend="torch",
+                 version="unversioned"):
+        self.tokenizer = tokenizer
+        self.forward = forward  # tokenized batch -> class probabilities (numpy)
+        self.label_encoder = label_encoder
+        self.responses = responses
+        self.backend = backend
+        # Identifies the loaded checkpoint + backend; keys the intent cache
+        self.version = f"{version}-{backend}"
+        self.tensor_type = "np" if backend == "onnx" else "pt"
+
+    @classmethod
+    def load(cls, model_dir, backend="torch"):
+        from transformers import DistilBertTokenizer
+
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown intent backend: {backend}")
+        version = model_version(model_dir)
+        tokenizer = DistilBertTokenizer.from_pretrained(model_dir)
+        if backend == "onnx":
+            forward = _onnx_forward(model_dir / ONNX_INT8_FILE)
+        elif backend == "int8":
+            import torch
+
+            model = torch.load(model_dir / TORCH_INT8_FILE, weights_only=False)
+            model.eval()
+            forward = _torch_forward(model)
+        else:
+            from transformers import DistilBertForSequenceClassification
+
+            model = DistilBertForSequenceClassification.from_pretrained(model_dir)
+            model.eval()
+            forward = _torch_forward(model)
+        label_encoder = joblib.load(model_dir / "label_encoder.pkl")
+        with open(model_dir / "responses.json", "r") as f:
+            responses = json.load(f)
+        return cls(tokenizer, forward, label_encoder, responses, backend, version)
+
+    def predict(self, message: str):
+        """(intent, confidence) for one message"""
+        return self.predict_batch([message])[0]
+
+    def predict_batch(self, messages: list) -> list:
+        """(intent, confidence) per message, from one padded forward pass"""
+        with metrics.stage("tokenize"):
+            inputs = self.tokenizer(messages, return_tensors=self.tensor_type, truncation=True,
+                                    padding=True, max_length=128)
+        with metrics.stage("model_forward"):
+            probabilities = self.forward(inputs)
+        predicted_class = probabilities.argmax(axis=-1)
+        confidence = probabilities.max(axis=-1)
+        intents = self.label_encoder.inverse_transform(predicted_class)
+        return list(zip(intents.tolist(), confidence.tolist()))
+
+    def respond(self, intent: str) -> str:
+        """A random response for that intent"""
+        return random.choice(self.responses.get(intent, ["I'm not sure how to respond to that."]))
@@ -0,0 +1,200 @@
+"""Keyword intent detection and template responses.
+
+Shared by app_simple.py and by app.py, which answers with these while the
+DistilBERT model is still loading. All keywords are compiled into one
+table of whole-word phrases, and a message is tokenized once and probed
+phrase by phrase for its intent and its course/category/rank entities
+("it" no longer matches inside "with", nor "ST" inside "STUDENT").
+"""
+import re
+from typing import NamedTuple, Optional
+
+# Simple intent-response mapping
+RESPONSES = {
+    "greeting": [
+        "Hello! I'm here to help you with college admissions. I have access to cutoff data from 500+ colleges!",
+        "Hi there! I can help you find the perfect college based on your rank, course preference, and category.",
+        "Welcome to CampusMate! Ask me about college cutoffs, admission chances, or get personalized recommendations."
+    ],
+    "admission_process": [
+        "The admission process typically involves: 1) Check eligibility, 2) Take entrance exams, 3) Submit applications, 4) Attend counseling.",
+        "First, ensure you meet the eligibility criteria. Then prepare for entrance exams like JEE or state exams, and submit your application before the deadline."
+    ],
+    "cutoff": [
+        "I can provide specific cutoff information! Please tell me: your course (CSE/IT/ECE/EEE/MECH/CIVIL), category (OC/BC/MBC/SC/ST), and year.",
+        "Cutoff ranks vary by college, course, and category. Share your preferences and I'll give you detailed cutoff information from our database!",
+        "I have cutoff data from 2020-2023 for 500+ colleges. What course and category are you interested in?"
+    ],
+    "fees": [
+        "Fee structures vary significantly. Government colleges: ₹30,000-₹80,000/year. Private colleges: ₹80,000-₹3,00,000/year.",
+        "Most engineering colleges charge between ₹50,000 to ₹2,50,000 per year. Government colleges are more affordable.",
+        "Scholarships are available for SC/ST/BC categories. Many private colleges also offer merit scholarships."
+    ],
+    "eligibility": [
+        "Basic eligibility: Pass 12th with Physics, Chemistry, and Mathematics. Valid entrance exam scores (JEE/State exams).",
+        "Most colleges require minimum 50% in 12th (45% for reserved categories) and valid entrance exam ranks.",
+        "Check specific college websites for detailed eligibility. Requirements vary by course and institution type."
+    ],
+    "safe_dream_target": [
+        "Based on your rank, I can categorize colleges! Safe: 20% above cutoff, Target: Near cutoff, Dream: 10-20% below cutoff.",
+        "Share your rank, course, and category - I'll give you personalized Safe, Target, and Dream college lists from our database!",
+        "I recommend: 40% safe colleges, 40% target colleges, 20% dream colleges. Want me to find them for you?"
+    ],
+    "admission_probability": [
+        "I can calculate your admission chances! Just tell me: your rank, desired course, category, and the college you're interested in.",
+        "Share your rank and preferences - I'll analyze our cutoff database and give you probability estimates for multiple colleges!",
+        "Probability depends on historical cutoffs, your rank, category, and course. Give me your details for accurate predictions."
+    ],
+    "reservation": [
+        "Categories: OC (Open), BC (Backward Class), MBC (Most Backward), SC (Scheduled Caste), ST (Scheduled Tribe).",
+        "Reserved categories have lower cutoff ranks. Our database has separate cutoffs for each category.",
+        "Tell me your category (OC/BC/MBC/SC/ST) and I'll show you relevant cutoffs and colleges!"
+    ],
+    "college_search": [
+        "I can search our database of 500+ colleges! Tell me your rank, course preference (CSE/IT/ECE/EEE/MECH/CIVIL), and category.",
+        "Looking for specific colleges? Share your criteria and I'll find matching options from our comprehensive database!",
+        "Want college recommendations? Give me: your rank, course, and category - I'll find the best matches!"
+    ],
+    "courses": [
+        "Available courses: CSE (Computer Science), IT (Information Technology), ECE (Electronics), EEE (Electrical), MECH (Mechanical), CIVIL.",
+        "Popular choices: CSE and IT have high demand. ECE and EEE offer electronics focus. MECH and CIVIL are core engineering branches.",
+        "Each course has different cutoffs. Which one interests you? I can show specific cutoff data!"
+    ],
+    "trends": [
+        "You can view cutoff trends from 2020-2023 in our database. Trends show how cutoffs changed over years.",
+        "Historical data helps predict future cutoffs. Generally, cutoffs are increasing for popular branches like CSE and IT.",
+        "Want trend analysis for a specific college or course? Tell me and I'll pull the data!"
+    ],
+    "thanks": [
+        "You're welcome! Feel free to ask about more colleges or admission queries.",
+        "Happy to help! I'm here if you need more college information or predictions.",
+        "Glad I could assist! Come back anytime for admission guidance."
+    ],
+    "goodbye": [
+        "Goodbye! Best of luck with your admissions! 🎓",
+        "Take care! Remember, we're here to help with your college journey.",
+        "Best wishes! Feel free to return with more questions anytime."
+    ],
+    "default": [
+        "I can help with: college recommendations, cutoff information, admission probability, course details, and more!",
+        "Try asking: 'Show me colleges for CSE with rank 25000' or 'What's the cutoff for IT in Anna University?'",
+        "I have data on 500+ colleges! Ask about cutoffs, admission chances, courses (CSE/IT/ECE/EEE/MECH/CIVIL), or categories."
+    ]
+}
+
+# Intent rules in priority order: the first rule with a keyword in the message wins
+INTENT_RULES = [
+    ("greeting", ["hi", "hello", "hey", "greetings", "good morning", "good afternoon"]),
+    ("college_search", ["find college", "show college", "recommend college", "suggest college", "list college"]),
+    ("course_mention", ["cse", "it", "ece", "eee", "mech", "mechanical", "civil", "computer science", "information technology"]),
+    ("safe_dream_target", ["safe college", "dream college", "target college", "categorize"]),
+    ("admission_probability", ["admission probability", "my chances", "will i get", "can i get", "probability"]),
+    ("cutoff", ["cutoff", "rank", "score", "marks"]),
+    ("fees", ["fee", "cost", "tuition", "fees", "scholarship"]),
+    ("eligibility", ["eligible", "eligibility", "qualify", "criteria"]),
+    ("admission_process", ["process", "apply", "application", "admission"]),
+    ("reservation", ["reservation", "category", "bc", "sc", "st", "obc", "mbc"]),
+    ("trends", ["trend", "historical", "previous year", "past data"]),
+    ("thanks", ["thank", "thanks", "appreciate"]),
+    ("goodbye", ["bye", "goodbye", "see you", "exit", "quit"]),
+]
+# A course mention is a "courses" question if it also has one of these
+COURSE_QUESTION_WORDS = ["course", "branch", "available", "what is"]
+
+# Entity keywords in priority order (first listed wins when several appear)
+COURSE_MAP = {
+    "cse": "CSE", "computer science": "CSE", "cs": "CSE",
+    "it": "IT", "information technology": "IT",
+    "ece": "ECE", "electronics": "ECE",
+    "eee": "EEE", "electrical": "EEE",
+    "mech": "MECH", "mechanical": "MECH",
+    "civil": "CIVIL"
+}
+CATEGORIES = ["OC", "BC", "MBC", "SC", "ST"]
+
+# Keywords of 4+ letters also match their plural ("colleges", "fees", "trends")
+PLURAL_MIN_LENGTH = 4
+
+
+def _compile_matcher():
+    """Table of every keyword surface form (whole words) and what it means.
+
+    Each form maps to (rule index, is course-question word, course priority,
+    category priority) so a scan only has to keep running minimums.
+    """
+    none = len(INTENT_RULES) + len(COURSE_MAP) + len(CATEGORIES)
+    meaning = {}
+    def note(kw, rule=none, question=False, course=none, category=none):
+        old = meaning.get(kw, (none, False, none, none))
+        meaning[kw] = (min(old[0], rule), old[1] or question, min(old[2], course), min(old[3], category))
+    for rule, (_, kws) in enumerate(INTENT_RULES):
+        for kw in kws:
+            note(kw, rule=rule)
+    for kw in COURSE_QUESTION_WORDS:
+        note(kw, question=True)
+    for priority, kw in enumerate(COURSE_MAP):
+        note(kw, course=priority)
+    for priority, cat in enumerate(CATEGORIES):
+        note(cat.lower(), category=priority)
+
+    surface = {}
+    for kw, info in meaning.items():
+        surface[kw] = info
+        if len(kw.split()[-1]) >= PLURAL_MIN_LENGTH:
+            surface.setdefault(kw + "s", info)
+            surface.setdefault(kw + "es", info)
+    max_words = max(len(form.split()) for form in surface)
+    return surface, max_words, none
+
+
+_WORD = re.compile(r"\w+")
+_SURFACE_FORMS, _MAX_WORDS, _NONE = _compile_matcher()
+_INTENTS = [intent for intent, _ in INTENT_RULES]
+_COURSES = list(COURSE_MAP.values())
+
+
+class MessageFeatures(NamedTuple):
+    intent: str
+    course: Optional[str]
+    category: Optional[str]
+    rank: Optional[int]
+
+
+def analyze_message(message: str) -> MessageFeatures:
+    """Intent and course/category/rank entities from one scan of the message"""
+    rule = course = category = _NONE
+    question = False
+    rank = None
+    words = _WORD.findall(message.lower())
+    for i, word in enumerate(words):
+        if rank is None and len(word) <= 6 and word.isascii() and word.isdecimal():
+            rank = int(word)
+        # Every 1..max_words phrase starting here is one dict probe
+        phrase = word
+        for j in range(i + 1, min(i + _MAX_WORDS, len(words)) + 1):
+            info = _SURFACE_FORMS.get(phrase)
+            if info is not None:
+                rule = min(rule, info[0])
+                question = question or info[1]
+                course = min(course, info[2])
+                category = min(category, info[3])
+            if j < len(words):
+                phrase += " " + words[j]
+
+    if rule == _NONE:
+        intent = "default"
+    elif _INTENTS[rule] == "course_mention":
+        intent = "courses" if question else "college_search"
+    else:
+        intent = _INTENTS[rule]
+    return MessageFeatures(
+        intent,
+        _COURSES[course] if course != _NONE else None,
+        CATEGORIES[category] if category != _NONE else None,
+        rank,
+    )
+
+
+def get_intent(message: str) -> str:
+    """Enhanced keyword-based intent detection"""
+    return analyze_message(message).intent
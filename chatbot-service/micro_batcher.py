@@ -0,0 +1,94 @@
+"""Dynamic micro-batching for model inference.
+
+Concurrent callers submit single items; a background task collects them
+for up to max_wait_ms (or until max_batch_size is reached), runs one
+batched call on a worker thread and resolves each caller's future with
+its own result. With max_pending set, submit() raises asyncio.QueueFull
+once that many items are already waiting.
+"""
+import asyncio
+
+
+class MicroBatcher:
+    """Groups concurrent submit() calls into predict_batch(list) calls"""
+
+    def __init__(self, predict_batch, max_batch_size: int = 16, max_wait_ms: float = 5.0,
+                 max_pending: int = 0, run=asyncio.to_thread):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_pending = max_pending  # 0 = unbounded
+        self.run = run  # async (fn, *args) -> result, e.g. a WorkPool's run
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._arrived = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._arrived = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def submit(self, item):
+        """Result of predict_batch for this item, batched with concurrent calls"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        self._arrived.set()
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while True:
+            # Items are only ever taken with get_nowait(); the window waits on an
+            # event, so a timeout can't cancel a get() that already dequeued one
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            timeout = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or timeout <= 0:
+                return batch
+            self._arrived.clear()
+            if not self._queue.empty():
+                continue
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout)
+            except asyncio.TimeoutError:
+                return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnect) don't need a slot
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                results = await self.run(self.predict_batch, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
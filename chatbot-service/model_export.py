@@ -0,0 +1,58 @@
+"""Export CPU inference backends for the fine-tuned intent classifier.
+
+Writes, next to the fp32 checkpoint in model/:
+  model_int8.pt    - torch dynamic int8 quantization of every nn.Linear
+  model.onnx       - fp32 ONNX graph (dynamic batch and sequence axes)
+  model_int8.onnx  - ONNX Runtime dynamic int8 quantization of model.onnx
+
+Run after train_chatbot.py (which calls export_backends itself), or
+standalone to re-export an existing checkpoint: python model_export.py
+"""
+import sys
+from pathlib import Path
+
+import torch
+from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from intent_model import ONNX_FILE, ONNX_INT8_FILE, TORCH_INT8_FILE
+
+BASE_DIR = Path(__file__).resolve().parent
+MODEL_DIR = BASE_DIR / "model"
+
+
+def export_backends(model_dir=MODEL_DIR):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tokenizer = DistilBertTokenizer.from_pretrained(model_dir)
+    model = DistilBertForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    # Torch dynamic quantization: int8 weights, activations quantized on the fly
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    torch.save(quantized, model_dir / TORCH_INT8_FILE)
+
+    # ONNX export, then int8 weight quantization for ONNX Runtime
+    sample = tokenizer(["hello", "what is the cutoff for cse"], return_tensors="pt", padding=True)
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        str(model_dir / ONNX_FILE),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        dynamo=False,
+    )
+    quantize_dynamic(str(model_dir / ONNX_FILE), str(model_dir / ONNX_INT8_FILE),
+                     weight_type=QuantType.QInt8)
+
+
+if __name__ == "__main__":
+    export_backends()
+    print(f"Exported int8 torch and ONNX backends to {MODEL_DIR}")
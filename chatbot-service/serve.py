@@ -0,0 +1,15 @@
+"""Pre-fork server for chatbot-service (see shared/prefork.py).
+
+Use MODEL_LOADING=eager (the default): with lazy loading each worker
+would load its own copy after the fork.
+
+    python serve.py --workers 4 --port 8000
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from shared.prefork import main
+
+if __name__ == "__main__":
+    main()
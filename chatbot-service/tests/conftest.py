@@ -0,0 +1,17 @@
+"""Run from chatbot-service/: python -m pytest tests"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent))
+sys.path.append(str(SERVICE_DIR.parent / "database"))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def college_id_registry(tmp_path_factory):
+    """Keep test data out of database/college_ids.csv"""
+    os.environ["COLLEGE_IDS_PATH"] = str(tmp_path_factory.mktemp("registry") / "college_ids.csv")
@@ -0,0 +1,39 @@
+import importlib
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from synthetic_history import synthetic_history
+
+
+@pytest.fixture(scope="module")
+def app_simple(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("history")
+    synthetic_history(5000, 50, seed=7).to_csv(tmp / "cutoff_history.csv", index=False)
+    os.environ["CUTOFF_HISTORY_PATH"] = str(tmp / "cutoff_history.csv")
+    os.environ["CUTOFF_SNAPSHOT_ROOT"] = str(tmp / "snapshots")
+    return importlib.import_module("app_simple")
+
+
+@pytest.fixture(scope="module")
+def client(app_simple):
+    with TestClient(app_simple.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("message", [
+    "colleges for rank 12000 in CSE BC category", "cutoff for mech in sc category", "rank 10²", "hello",
+])
+def test_chat_answers_on_the_query_pool(app_simple, client, message):
+    before = app_simple.query_pool.stats()["completed"]
+    response = client.post("/chat", json={"message": message})
+    assert response.status_code == 200 and response.json()["response"]
+    assert app_simple.query_pool.stats()["completed"] == before + 1
+
+
+def test_chat_sheds_load_when_the_pool_is_full(app_simple, client, monkeypatch):
+    monkeypatch.setattr(app_simple.query_pool, "max_queue", -app_simple.query_pool.max_workers)
+    response = client.post("/chat", json={"message": "hello"})
+    assert response.status_code == 503 and response.headers["retry-after"] == "1"
+    assert client.get("/pool-stats").json()["query"]["rejected"] >= 1
@@ -0,0 +1,80 @@
+import itertools
+
+import pytest
+
+from cutoff_cube import CutoffCube
+from cutoff_snapshot import Snapshot, write_snapshot
+from synthetic_history import synthetic_history
+
+FIELDS = ["Name", "course", "category", "year", "cutoff_rank"]
+
+
+@pytest.fixture(scope="module")
+def history():
+    return synthetic_history(4000, 50, seed=13)
+
+
+@pytest.fixture(scope="module", params=["csv", "snapshot"])
+def frame(request, history, tmp_path_factory):
+    if request.param == "csv":
+        return history
+    # Snapshot frames have categorical string columns and rows in sorted order
+    root = tmp_path_factory.mktemp("snapshots")
+    return Snapshot(root / write_snapshot(history, root)).to_frame()
+
+
+def old_filter(df, course=None, category=None, year=None):
+    if course:
+        df = df[df["course"] == course]
+    if category:
+        df = df[df["category"] == category]
+    if year:
+        df = df[df["year"] == year]
+    return df
+
+
+def old_search(df, course=None, category=None, rank=None):
+    """search_colleges before the cube"""
+    df = old_filter(df, course, category)
+    if rank:
+        df = df[(df["cutoff_rank"] >= rank * 0.7) & (df["cutoff_rank"] <= rank * 1.3)]
+    if not df.empty:
+        df = df[df["year"] == df["year"].max()]
+    return [{k: (str(v) if k in ("Name", "course", "category") else int(v)) for k, v in r.items()}
+            for r in df[FIELDS].head(5).to_dict("records")]
+
+
+def test_stats_match_the_filtered_groupby(frame):
+    cube = CutoffCube(frame)
+    for course, category, year in itertools.product(
+            [None, "CSE", "MECH", "XX"], [None, "OC", "ST"], [None, 2020, 2023, 1999]):
+        rows = old_filter(frame, course, category, year)["cutoff_rank"]
+        stats = cube.stats(course, category, year)
+        if rows.empty:
+            assert stats is None
+            continue
+        assert stats["count"] == len(rows)
+        assert stats["mean"] == pytest.approx(rows.mean())
+        assert (stats["min"], stats["max"]) == (rows.min(), rows.max())
+
+
+@pytest.mark.parametrize("rank", [None, 800, 12000, 45000])
+def test_search_matches_the_old_filter(frame, rank):
+    cube = CutoffCube(frame)
+    for course, category in itertools.product([None, "CSE", "CIVIL", "XX"], [None, "BC", "SC"]):
+        found = [{k: r[k] for k in FIELDS} for r in cube.search(course, category, rank)]
+        found = [dict(r, Name=str(r["Name"]), course=str(r["course"]), category=str(r["category"]))
+                 for r in found]
+        assert found == old_search(frame, course, category, rank)
+
+
+def test_college_cutoffs_list_every_row_of_the_college(frame):
+    cube = CutoffCube(frame)
+    for name in frame["Name"].drop_duplicates().head(10).astype(str):
+        college_id = cube.colleges.college_id(name)
+        rows = frame[(frame["Name"].astype(str) == name) & (frame["course"] == "ECE")]
+        found = cube.college_cutoffs(college_id, "ECE")
+        assert sorted((r["year"], str(r["category"]), r["cutoff_rank"]) for r in found) == sorted(
+            zip(rows["year"], rows["category"].astype(str), rows["cutoff_rank"]))
+        assert [r["year"] for r in found] == sorted((r["year"] for r in found), reverse=True)
+    assert cube.college_cutoffs(10**6) == []
@@ -0,0 +1,73 @@
+import os
+
+import intent_cache
+from intent_cache import IntentCache
+from intent_model import IntentModel, model_version
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_messages_share_an_entry():
+    cache = IntentCache()
+    cache.put("  What is the CUTOFF\tfor CSE ", "v1", ("cutoff", 0.9))
+    assert cache.get("what is the cutoff for cse", "v1") == ("cutoff", 0.9)
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(intent_cache.time, "monotonic", clock)
+    cache = IntentCache(ttl=60)
+    cache.put("hello", "v1", ("greeting", 0.99))
+    clock.now += 59
+    assert cache.get("hello", "v1") == ("greeting", 0.99)
+    clock.now += 2
+    assert cache.get("hello", "v1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = IntentCache(max_size=2)
+    cache.put("a", "v1", 1)
+    cache.put("b", "v1", 2)
+    cache.get("a", "v1")
+    cache.put("c", "v1", 3)
+    assert (cache.get("a", "v1"), cache.get("b", "v1"), cache.get("c", "v1")) == (1, None, 3)
+
+
+def test_new_model_version_drops_old_predictions():
+    cache = IntentCache()
+    cache.put("hello", "v1", ("greeting", 0.99))
+    assert cache.get("hello", "v1") == ("greeting", 0.99)
+    assert cache.get("hello", "v2") is None
+    assert cache.stats()["size"] == 0
+    # A late put from the replaced model never answers for the new one
+    cache.put("hello", "v1", ("greeting", 0.99))
+    assert cache.get("hello", "v2") is None
+    cache.put("hello", "v2", ("farewell", 0.8))
+    assert cache.get("hello", "v2") == ("farewell", 0.8)
+    assert cache.stats()["version"] == "v2"
+
+
+def test_model_version_changes_with_checkpoint_files(tmp_path):
+    (tmp_path / "config.json").write_text("{}")
+    before = model_version(tmp_path)
+    assert model_version(tmp_path) == before
+    weights = tmp_path / "model.safetensors"
+    weights.write_bytes(b"new weights")
+    after = model_version(tmp_path)
+    assert after != before
+    os.utime(weights, ns=(1, 1))
+    assert model_version(tmp_path) != after
+
+
+def test_intent_model_version_includes_backend():
+    torch_model = IntentModel(None, None, None, {}, "torch", "abc")
+    onnx_model = IntentModel(None, None, None, {}, "onnx", "abc")
+    assert torch_model.version != onnx_model.version
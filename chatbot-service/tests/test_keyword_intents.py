@@ -0,0 +1,17 @@
+import pytest
+
+from keyword_intents import analyze_message, get_intent
+
+
+def test_rank_course_and_category():
+    features = analyze_message("colleges for rank 15000 in CSE BC category")
+    assert features.rank == 15000
+    assert features.course == "CSE"
+    assert features.category == "BC"
+
+
+@pytest.mark.parametrize("message", ["rank 10²", "my rank is ²³", "rank ١٢٣٤", "rank ①"])
+def test_non_ascii_digits_are_not_ranks(message):
+    features = analyze_message(message)
+    assert features.rank is None
+    assert get_intent(message)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+def run_batcher(coro_factory, **kwargs):
+    calls = []
+
+    def predict_batch(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def main():
+        batcher = MicroBatcher(predict_batch, **kwargs)
+        batcher.start()
+        try:
+            return await coro_factory(batcher)
+        finally:
+            await batcher.stop()
+    return asyncio.run(main()), calls
+
+
+def test_concurrent_submits_are_batched_and_all_resolve():
+    async def submit_all(batcher):
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(50))), 5)
+
+    results, calls = run_batcher(submit_all, max_batch_size=16, max_wait_ms=5)
+    assert results == [i * 2 for i in range(50)]
+    assert all(len(batch) <= 16 for batch in calls)
+    assert len(calls) < 50
+
+
+def test_trickling_submits_never_hang():
+    # Items arriving around the window deadline must not be lost
+    async def trickle(batcher):
+        async def one(i):
+            await asyncio.sleep((i % 7) * 0.001)
+            return await batcher.submit(i)
+        return await asyncio.wait_for(asyncio.gather(*(one(i) for i in range(300))), 10)
+
+    results, calls = run_batcher(trickle, max_batch_size=4, max_wait_ms=1)
+    assert results == [i * 2 for i in range(300)]
+    assert sum(len(batch) for batch in calls) == 300
+
+
+def test_full_queue_rejects():
+    async def main():
+        release = asyncio.Event()
+
+        async def held_run(fn, items):
+            await release.wait()
+            return fn(items)
+
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=1,
+                               max_wait_ms=0, max_pending=2, run=held_run)
+        batcher.start()
+        try:
+            # The first item is taken by the held batch, the next two fill the queue
+            first = asyncio.ensure_future(batcher.submit(0))
+            await asyncio.sleep(0.01)
+            assert batcher.stats()["pending"] == 0
+            queued = [asyncio.ensure_future(batcher.submit(i)) for i in (1, 2)]
+            await asyncio.sleep(0)
+            assert batcher.stats()["pending"] == 2
+            with pytest.raises(asyncio.QueueFull):
+                await batcher.submit(99)
+            release.set()
+            return await asyncio.wait_for(asyncio.gather(first, *queued), 5)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()) == [0, 2, 4]
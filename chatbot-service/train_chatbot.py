@@ -7,6 +7,8 @@ import joblib
 import os
 from pathlib import Path
 
+from model_export import export_backends
+
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR / "model"
@@ -92,4 +94,7 @@ trainer.train()
 model.save_pretrained(MODEL_DIR)
 tokenizer.save_pretrained(MODEL_DIR)
 
-print("Training complete. Model saved.")
\ No newline at end of file
+print("Training complete. Model saved.")
+
+# Export quantized CPU backends (select with INTENT_BACKEND in app.py)
+export_backends(MODEL_DIR)
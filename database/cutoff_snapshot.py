@@ -0,0 +1,205 @@
+"""Compact, memory-mapped snapshots of cutoff_history.csv.
+
+A snapshot is an immutable directory of .npy column files plus a
+manifest.json. String columns are dictionary-encoded (small-int codes and
+a fixed-width vocabulary), years and ranks are int32, and rows are sorted
+by (course, category, year, cutoff_rank) so each partition is a contiguous
+slice; source_row keeps each row's position in the CSV, and Name.ids.npy
+holds the registered college_id of each Name (shared/college_ids.py), so
+readers don't need the registry file. Services open the columns with mmap_mode="r", so every worker
+process shares the same page-cache copy instead of parsing the CSV.
+
+Publishing writes snapshots/<version>/ and then atomically replaces the
+snapshots/CURRENT pointer, so readers switch to a new release without a
+restart. Build one from the CSV with:
+
+    python database/cutoff_snapshot.py
+
+CUTOFF_HISTORY_PATH and CUTOFF_SNAPSHOT_ROOT point the services (and this
+script) at another history file and snapshot directory; COLLEGE_IDS_PATH at
+another college id registry.
+"""
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DB_DIR = Path(__file__).resolve().parent
+# The shared package sits next to the database directory
+sys.path.append(str(DB_DIR.parent))
+from shared.college_ids import CollegeIds, registry_path
+
+CSV_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", DB_DIR / "cutoff_history.csv"))
+SNAPSHOT_ROOT = Path(os.environ.get("CUTOFF_SNAPSHOT_ROOT", DB_DIR / "snapshots"))
+CURRENT_FILE = "CURRENT"
+FORMAT_VERSION = 2
+
+STRING_COLUMNS = ["Name", "course", "category"]
+INT_COLUMNS = ["year", "cutoff_rank", "source_row"]
+SORT_KEY = ["course", "category", "year", "cutoff_rank"]
+
+
+def _code_dtype(n_values: int):
+    # Same width pandas picks for Categorical codes, so from_codes won't copy
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of one published snapshot"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "manifest.json") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format in {self.path}")
+        self.version = self.manifest["version"]
+        self.rows = self.manifest["rows"]
+        self._codes = {}
+        self._vocab = {}
+        self._values = {}
+        for col in STRING_COLUMNS:
+            self._codes[col] = np.load(self.path / f"{col}.codes.npy", mmap_mode="r")
+            self._vocab[col] = np.load(self.path / f"{col}.vocab.npy", mmap_mode="r")
+        self._name_ids = np.load(self.path / "Name.ids.npy")
+        for col in INT_COLUMNS:
+            self._values[col] = np.load(self.path / f"{col}.npy", mmap_mode="r")
+        for array in list(self._codes.values()) + list(self._values.values()):
+            if len(array) != self.rows:
+                raise ValueError(f"Snapshot {self.path} has inconsistent column lengths")
+
+    def __len__(self):
+        return self.rows
+
+    def codes(self, col: str) -> np.ndarray:
+        return self._codes[col]
+
+    def vocab(self, col: str) -> np.ndarray:
+        return self._vocab[col]
+
+    def values(self, col: str) -> np.ndarray:
+        return self._values[col]
+
+    def college_ids(self) -> dict:
+        """{name: college_id} for the snapshot's colleges"""
+        return {str(name): int(college_id)
+                for name, college_id in zip(self._vocab["Name"].tolist(), self._name_ids.tolist())
+                if college_id >= 0}
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the mapped columns (categoricals, no copies)"""
+        data = {
+            col: pd.Categorical.from_codes(self._codes[col], categories=self._vocab[col])
+            for col in STRING_COLUMNS
+        }
+        data.update((col, self._values[col]) for col in ("year", "cutoff_rank"))
+        return pd.DataFrame(data, copy=False)
+
+
+def write_snapshot(df: pd.DataFrame, root=SNAPSHOT_ROOT, keep: int = 3, ids_path=None) -> str:
+    """Write df as a new snapshot, publish it as CURRENT and prune old ones.
+
+    College names are registered in the registry at ids_path (by default
+    the one next to CUTOFF_HISTORY_PATH).
+    """
+    college_ids = CollegeIds(ids_path or registry_path(CSV_PATH)).register(df["Name"].unique())
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = f"{time.strftime('%Y%m%d%H%M%S')}-{time.time_ns() % 10**9:09d}"
+    tmp_dir = root / f".{version}.tmp"
+    tmp_dir.mkdir()
+
+    df = df.assign(Name=df["Name"].fillna(""), source_row=np.arange(len(df)))
+    df = df.sort_values(SORT_KEY, kind="stable")
+    for col in STRING_COLUMNS:
+        codes, vocab = pd.factorize(df[col].astype(str))
+        np.save(tmp_dir / f"{col}.codes.npy", codes.astype(_code_dtype(len(vocab))))
+        np.save(tmp_dir / f"{col}.vocab.npy", np.asarray(vocab, dtype=str))
+        if col == "Name":
+            ids = [college_ids.get(name, -1) for name in vocab.tolist()]
+            np.save(tmp_dir / "Name.ids.npy", np.asarray(ids, dtype=np.int64))
+    for col in INT_COLUMNS:
+        np.save(tmp_dir / f"{col}.npy", df[col].to_numpy(dtype=np.int32))
+    with open(tmp_dir / "manifest.json", "w") as f:
+        json.dump({
+            "format": FORMAT_VERSION,
+            "version": version,
+            "rows": len(df),
+            "sorted_by": SORT_KEY,
+        }, f)
+
+    os.replace(tmp_dir, root / version)
+    pointer_tmp = root / f".{CURRENT_FILE}.{version}.tmp"
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, root / CURRENT_FILE)
+
+    # Readers that still map a pruned snapshot keep working until they swap
+    versions = sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in versions[:-keep]:
+        shutil.rmtree(root / old, ignore_errors=True)
+    return version
+
+
+def current_version(root=SNAPSHOT_ROOT):
+    try:
+        return (Path(root) / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class SnapshotStore:
+    """Holds build(Snapshot) for the CURRENT snapshot and swaps it on update.
+
+    get() re-checks the pointer at most every check_interval seconds and
+    never blocks: a new snapshot is built on a background thread (an index
+    rebuild can take seconds) while callers keep the old value, and swapped
+    in once complete. The first snapshot is built in __init__.
+    """
+
+    def __init__(self, build, root=SNAPSHOT_ROOT, check_interval: float = 5.0):
+        self.build = build
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self.version = None
+        self._value = None
+        self._lock = threading.Lock()
+        version = current_version(self.root)
+        if version is not None:
+            self._lock.acquire()
+            self._reload(version)
+        self._next_check = time.monotonic() + check_interval
+
+    def _reload(self, version):
+        try:
+            value = self.build(Snapshot(self.root / version))
+            self._value, self.version = value, version
+        except Exception as e:
+            print(f"⚠️ Warning: Could not load snapshot {version} - {e}")
+        finally:
+            self._lock.release()
+
+    def get(self):
+        """Current built value, or None if no snapshot has been published"""
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            self._next_check = now + self.check_interval
+            version = current_version(self.root)
+            if version is not None and version != self.version:
+                threading.Thread(target=self._reload, args=(version,), daemon=True).start()
+            else:
+                self._lock.release()
+        return self._value
+
+
+if __name__ == "__main__":
+    version = write_snapshot(pd.read_csv(CSV_PATH))
+    print(f"Published snapshot {version} to {SNAPSHOT_ROOT}")
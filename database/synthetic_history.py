@@ -0,0 +1,99 @@
+"""Synthetic cutoff_history.csv of any size, for benchmarks.
+
+Rows have the real file's columns and value ranges: college names built
+from the kind of words real names use (so name search behaves
+realistically), the six courses and five categories, and cutoff ranks
+driven by a per-college level, a course and category offset and year
+noise. The same arguments always give the same file.
+
+    python database/synthetic_history.py --rows 100000 --colleges 2000 --out /tmp/history.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COURSES = ["CSE", "IT", "ECE", "EEE", "MECH", "CIVIL"]
+CATEGORIES = ["OC", "BC", "MBC", "SC", "ST"]
+YEARS = [2020, 2021, 2022, 2023]
+MAX_RANK = 50_000
+
+# Relative cutoff level (lower = more competitive)
+COURSE_FACTOR = {"CSE": 0.7, "IT": 0.8, "ECE": 0.85, "EEE": 1.0, "MECH": 1.1, "CIVIL": 1.2}
+CATEGORY_FACTOR = {"OC": 0.8, "BC": 0.9, "MBC": 1.0, "SC": 1.3, "ST": 1.5}
+
+PREFIXES = ["", "SRI", "SREE", "ST.", "K.", "DR.", "NEW", "GOVERNMENT", "THE"]
+WORDS = [
+    "ANNAI", "ARUNAI", "BHARATHI", "CHRIST", "DHANALAKSHMI", "GANESH", "JAYA", "KAMARAJ",
+    "KONGU", "KRISHNA", "LAKSHMI", "MAHENDRA", "MEENAKSHI", "MUTHAYAMMAL", "NANDHA",
+    "PANIMALAR", "PARK", "PRATHYUSHA", "RAJALAKSHMI", "RAMAKRISHNA", "SAKTHI", "SARASWATHI",
+    "SELVAM", "SHANMUGA", "SIVA", "SONA", "SRINIVASA", "VEL", "VELAMMAL", "VIVEKANANDA",
+]
+SUFFIXES = [
+    "COLLEGE OF ENGINEERING", "ENGINEERING COLLEGE", "INSTITUTE OF TECHNOLOGY",
+    "COLLEGE OF ENGINEERING AND TECHNOLOGY", "COLLEGE OF TECHNOLOGY",
+]
+TOWNS = ["CHENNAI", "COIMBATORE", "MADURAI", "SALEM", "TRICHY", "ERODE", "VELLORE", "TIRUNELVELI"]
+
+
+def college_names(n: int, seed: int = 42) -> list:
+    """n distinct, realistic-looking college names"""
+    rng = np.random.default_rng(seed)
+    names, seen = [], set()
+    while len(names) < n:
+        name = " ".join(filter(None, [
+            PREFIXES[rng.integers(len(PREFIXES))], WORDS[rng.integers(len(WORDS))],
+            SUFFIXES[rng.integers(len(SUFFIXES))],
+        ]))
+        if name in seen:
+            name = f"{name} {TOWNS[rng.integers(len(TOWNS))]}"
+        if name in seen:
+            name = f"{name} CAMPUS {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def synthetic_history(rows: int, colleges: int = 500, seed: int = 42) -> pd.DataFrame:
+    """DataFrame shaped like cutoff_history.csv"""
+    rng = np.random.default_rng(seed)
+    names = np.array(college_names(colleges, seed))
+    level = rng.uniform(0.02, 0.8, size=colleges) * MAX_RANK
+
+    college = rng.integers(colleges, size=rows)
+    course = rng.integers(len(COURSES), size=rows)
+    category = rng.integers(len(CATEGORIES), size=rows)
+    year = rng.integers(len(YEARS), size=rows)
+    rank = (
+        level[college]
+        * np.array([COURSE_FACTOR[c] for c in COURSES])[course]
+        * np.array([CATEGORY_FACTOR[c] for c in CATEGORIES])[category]
+        * rng.lognormal(mean=0, sigma=0.1, size=rows)
+    )
+    rank = np.clip(rank, 1, MAX_RANK).astype(np.int64)
+    return pd.DataFrame({
+        "id": [f"1-{n}" for n in range(rows)],
+        "Name": names[college],
+        "course": np.array(COURSES)[course],
+        "category": np.array(CATEGORIES)[category],
+        "year": np.array(YEARS)[year],
+        "cutoff_rank": rank,
+        "cutoff_out_of_200": np.round(200 * (1 - rank / MAX_RANK), 2),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic cutoff history CSV")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--colleges", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    df = synthetic_history(args.rows, args.colleges, args.seed)
+    df.to_csv(args.out, index=False)
+    print(f"Wrote {len(df)} rows for {args.colleges} colleges to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,126 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 import joblib
 import numpy as np
-import pandas as pd
+import os
 from pathlib import Path
-import math
+import sys
+from typing import NamedTuple
+
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from encoding import EncoderLookup
+from forest_engine import FlatForest
+from history_index import TrendIndex
+from model_bundle import BUNDLE_FILE, ModelBundle
+from model_store import ModelStore, current_version
+from prediction_table import PredictionTable
+from response_cache import ResponseCache
+from shared.college_ids import CollegeIds, registry_path
+from shared.metrics import MetricsMiddleware, metrics
+from shared.work_pool import PoolOverloaded, WorkPool
 
 # Load model and encoders at startup
 BASE_DIR = Path(__file__).resolve().parent
-MODEL_DIR = BASE_DIR / "model"
+MODEL_DIR = Path(os.environ.get("MODEL_DIR", BASE_DIR / "model"))
+HISTORY_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", BASE_DIR / "../database/cutoff_history.csv"))
+
+# Persisted name -> college_id map shared with training, app_simple.py and the chatbot
+college_ids = CollegeIds(registry_path(HISTORY_PATH))
+
+# Inference engine: "flat" walks all trees with NumPy, "sklearn" uses model.predict
+INFERENCE_ENGINE = os.environ.get("INFERENCE_ENGINE", "flat")
+if INFERENCE_ENGINE not in ("flat", "sklearn"):
+    raise ValueError(f"Unknown INFERENCE_ENGINE: {INFERENCE_ENGINE}")
+
+# Optional table mode: serve predictions from the grid written by train_model.py,
+# falling back to the live model for rows outside it (e.g. unseen years)
+PREDICTION_TABLE = os.environ.get("PREDICTION_TABLE") == "1"
+
+class ServingModel(NamedTuple):
+    """Predictor plus the encoder lookups it was trained with"""
+    model: object
+    college_lookup: EncoderLookup
+    course_lookup: EncoderLookup
+    category_lookup: EncoderLookup
+    version: str
+
+def load_model(model_dir: Path) -> ServingModel:
+    version = current_version(model_dir)
+    if INFERENCE_ENGINE == "flat" and (model_dir / BUNDLE_FILE).exists():
+        # Map the bundle: no unpickling, rejected if corrupt or from another version
+        bundle = ModelBundle.load(model_dir / BUNDLE_FILE, expected_version=version)
+        model = bundle.forest
+        college_classes = bundle.classes["college"]
+        course_classes = bundle.classes["course"]
+        category_classes = bundle.classes["category"]
+    else:
+        model = joblib.load(model_dir / 'cutoff_model.pkl')
+        if INFERENCE_ENGINE == "flat":
+            model = FlatForest.from_sklearn(model)
+        college_classes = joblib.load(model_dir / 'le_college.pkl').classes_
+        course_classes = joblib.load(model_dir / 'le_course.pkl').classes_
+        category_classes = joblib.load(model_dir / 'le_category.pkl').classes_
+
+    if PREDICTION_TABLE:
+        if PredictionTable.exists(model_dir):
+            table = PredictionTable.load(model_dir, fallback=model)
+            expected = (len(college_classes), len(course_classes), len(category_classes))
+            if table.values.shape[:3] == expected:
+                model = table
+            else:
+                print("Prediction table does not match encoders, using live model")
+        else:
+            print("Prediction table not found, using live model")
+
+    # Lookup tables built once from the encoders; unseen values fall back to 0
+    if college_classes.dtype.kind in "OUS":
+        # Trained on the real history, which keys colleges by Name: clients send
+        # the name's registered college_id, the same id CollegeSearch and /trends use
+        ids = college_ids.register(college_classes)
+        college_lookup = EncoderLookup.by_ids(college_classes, ids)
+    else:
+        college_lookup = EncoderLookup(college_classes)
+    return ServingModel(
+        model,
+        college_lookup,
+        EncoderLookup(course_classes),
+        EncoderLookup(category_classes),
+        version or "unversioned",
+    )
 
-model = joblib.load(MODEL_DIR / 'cutoff_model.pkl')
-le_college = joblib.load(MODEL_DIR / 'le_college.pkl')
-le_course = joblib.load(MODEL_DIR / 'le_course.pkl')
-le_category = joblib.load(MODEL_DIR / 'le_category.pkl')
-features = joblib.load(MODEL_DIR / 'features.pkl')
+# Model and encoders are swapped together when model_refresh.py or
+# train_model.py publishes a new version (checked every MODEL_CHECK_INTERVAL s)
+model_store = ModelStore(load_model, MODEL_DIR,
+                         check_interval=float(os.environ.get("MODEL_CHECK_INTERVAL", "5")))
+
+# Historical cutoffs for /trends, parsed once and reloaded when the file changes
+trend_index = TrendIndex(HISTORY_PATH, college_ids.path)
+
+# Dedicated pool for model predict and trend queries; requests beyond
+# INFERENCE_WORKERS running + INFERENCE_QUEUE waiting get a 503
+inference_pool = WorkPool(
+    "inference",
+    max_workers=int(os.environ.get("INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.environ.get("INFERENCE_QUEUE", "64")),
+)
+
+# Cache of deterministic responses keyed on request + model/data version, with
+# ETag revalidation; RESPONSE_CACHE_SIZE=0 keeps ETags but stores nothing
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("RESPONSE_CACHE_SIZE", "2048")),
+    max_age=int(os.environ.get("RESPONSE_CACHE_MAX_AGE", "60")),
+)
 
 app = FastAPI(title="ML Admission Predictor", version="1.0")
 
+@app.exception_handler(PoolOverloaded)
+async def pool_overloaded(request, exc: PoolOverloaded):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +130,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus-style /metrics (per-route latency, hot-path stages, cache and
+# pool gauges); METRICS=0 turns collection off
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+metrics.add_stats("pool", {"pool": "inference"}, inference_pool.stats,
+                  gauges=("running", "queued", "peak_queued"), counters=("completed", "failed", "rejected"))
+metrics.add_stats("response_cache", {}, response_cache.stats,
+                  gauges=("size", "hit_ratio"), counters=("hits", "misses", "not_modified"))
+
 # Request/Response models
 class CutoffRequest(BaseModel):
     college_id: int
@@ -38,68 +149,123 @@ class CutoffRequest(BaseModel):
 class ProbabilityRequest(CutoffRequest):
     rank: int
 
+class BatchProbabilityRequest(BaseModel):
+    requests: list[ProbabilityRequest]
+
 class TrendRequest(BaseModel):
     college_id: int
     course: str
     years: list[int] = None  # optional list of years
 
-# Helper: encode input
-def encode_input(college_id, course, category, year):
-    try:
-        college_enc = le_college.transform([college_id])[0]
-    except ValueError:
-        # If unseen college, use the most frequent or a default
-        college_enc = 0  # fallback
-    try:
-        course_enc = le_course.transform([course])[0]
-    except ValueError:
-        course_enc = 0
-    try:
-        category_enc = le_category.transform([category])[0]
-    except ValueError:
-        category_enc = 0
-    return [college_enc, course_enc, category_enc, year]
+# Helper: encode input (scalars -> feature row, arrays -> feature matrix)
+@metrics.timed("encode_input")
+def encode_input(serving: ServingModel, college_id, course, category, year):
+    if np.ndim(college_id) == 0:
+        return [
+            serving.college_lookup.encode(college_id),
+            serving.course_lookup.encode(course),
+            serving.category_lookup.encode(category),
+            year,
+        ]
+    return np.column_stack([
+        serving.college_lookup.encode_array(college_id),
+        serving.course_lookup.encode_array(course),
+        serving.category_lookup.encode_array(category),
+        np.asarray(year),
+    ])
+
+# Helper: model forward pass, timed as its own stage (runs on the inference pool)
+@metrics.timed("model_forward")
+def model_forward(model, X):
+    return model.predict(X)
+
+# Helper: sigmoid admission probability, vectorized over arrays
+def cutoff_probability(pred_cutoff, rank):
+    # Simple logistic probability: if rank <= cutoff -> high probability, else low
+    # Using a sigmoid scaled by the cutoff value
+    diff = pred_cutoff - rank
+    # scale factor: 10% of predicted cutoff
+    scale = np.maximum(1, pred_cutoff * 0.1)
+    with np.errstate(over="ignore"):
+        return 1 / (1 + np.exp(-diff / scale))
 
 @app.get("/")
 def root():
-    return {"message": "ML Admission Predictor API"}
+    return {"message": "ML Admission Predictor API", "model_version": model_store.version}
+
+@app.get("/pool-stats")
+def pool_stats():
+    """Queue depth, rejections and timings of the inference pool"""
+    return {"inference": inference_pool.stats()}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of all collected metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS=0)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the response cache"""
+    return response_cache.stats()
+
+def response_version(serving: ServingModel) -> str:
+    """Everything cached responses depend on: the model and the history CSV"""
+    return f"{serving.version}:{trend_index.version()}"
 
 @app.post("/predict-cutoff")
-def predict_cutoff(req: CutoffRequest):
-    input_vec = encode_input(req.college_id, req.course, req.category, req.year)
-    X = np.array([input_vec])
-    pred = model.predict(X)[0]
-    return {"predicted_cutoff_rank": int(round(pred))}
+async def predict_cutoff(req: CutoffRequest, request: Request):
+    serving = model_store.get()
+
+    async def compute():
+        input_vec = encode_input(serving, req.college_id, req.course, req.category, req.year)
+        X = np.array([input_vec])
+        pred = (await inference_pool.run(model_forward, serving.model, X))[0]
+        return {"predicted_cutoff_rank": int(round(pred))}
+    return await response_cache.respond(request, req, response_version(serving), compute)
 
 @app.post("/admission-probability")
-def admission_probability(req: ProbabilityRequest):
-    input_vec = encode_input(req.college_id, req.course, req.category, req.year)
+async def admission_probability(req: ProbabilityRequest):
+    serving = model_store.get()
+    input_vec = encode_input(serving, req.college_id, req.course, req.category, req.year)
     X = np.array([input_vec])
-    pred_cutoff = model.predict(X)[0]
-    # Simple logistic probability: if rank <= cutoff -> high probability, else low
-    # Using a sigmoid scaled by the cutoff value
-    diff = pred_cutoff - req.rank
-    # scale factor: 10% of predicted cutoff
-    scale = max(1, pred_cutoff * 0.1)
-    prob = 1 / (1 + math.exp(-diff / scale))
+    pred_cutoff = (await inference_pool.run(model_forward, serving.model, X))[0]
+    prob = cutoff_probability(pred_cutoff, req.rank)
     return {
-        "probability": round(prob, 4),
+        "probability": round(float(prob), 4),
         "predicted_cutoff": int(round(pred_cutoff))
     }
 
+@app.post("/admission-probability/batch")
+async def admission_probability_batch(req: BatchProbabilityRequest):
+    if not req.requests:
+        return {"results": []}
+    # Encode every request column-wise and score them with one predict call
+    serving = model_store.get()
+    X = encode_input(
+        serving,
+        [r.college_id for r in req.requests],
+        [r.course for r in req.requests],
+        [r.category for r in req.requests],
+        [r.year for r in req.requests],
+    )
+    pred_cutoffs = await inference_pool.run(model_forward, serving.model, X)
+    probs = cutoff_probability(pred_cutoffs, np.array([r.rank for r in req.requests]))
+    return {
+        "results": [
+            {"probability": round(float(prob), 4), "predicted_cutoff": int(round(pred))}
+            for prob, pred in zip(probs, pred_cutoffs)
+        ]
+    }
+
 @app.post("/trends")
-def get_trends(req: TrendRequest):
-    # Load historical data from CSV for this college & course
-    data_path = BASE_DIR / "../database/cutoff_history.csv"
-    if not data_path.exists():
-        raise HTTPException(status_code=404, detail="Historical data not available")
-    df = pd.read_csv(data_path)
-    # Filter
-    filtered = df[(df['college_id'] == req.college_id) & (df['course'] == req.course)]
-    if req.years:
-        filtered = filtered[filtered['year'].isin(req.years)]
-    if filtered.empty:
-        return {"trends": []}
-    # Return as list of dicts
-    trends = filtered[['year', 'category', 'cutoff_rank']].to_dict(orient='records')
-    return {"trends": trends}
\ No newline at end of file
+async def get_trends(req: TrendRequest, request: Request):
+    # Historical data for this college & course, served from the memoized index
+    async def compute():
+        try:
+            trends = await inference_pool.run(trend_index.trends, req.college_id, req.course, req.years)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Historical data not available")
+        return {"trends": trends}
+    return await response_cache.respond(request, req, response_version(model_store.get()), compute)
@@ -1,13 +1,46 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 import pandas as pd
+import numpy as np
 from pathlib import Path
-import random
+import base64
+import json
+import os
+import sys
 from typing import Optional
 
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from cutoff_index import DEFAULT_SPREAD, CutoffIndex
+from response_cache import ResponseCache
+from shared.college_ids import CollegeIds, registry_path
+from shared.metrics import MetricsMiddleware, metrics
+from shared.work_pool import PoolOverloaded, WorkPool
+
 app = FastAPI(title="ML Admission Predictor", version="1.0")
 
+# Dedicated pool for DataFrame queries; requests beyond QUERY_WORKERS
+# running + QUERY_QUEUE waiting get a 503
+query_pool = WorkPool(
+    "query",
+    max_workers=int(os.environ.get("QUERY_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.environ.get("QUERY_QUEUE", "64")),
+)
+
+# Cache of deterministic responses keyed on request + dataset version, with
+# ETag revalidation; RESPONSE_CACHE_SIZE=0 keeps ETags but stores nothing
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("RESPONSE_CACHE_SIZE", "2048")),
+    max_age=int(os.environ.get("RESPONSE_CACHE_MAX_AGE", "60")),
+)
+
+@app.exception_handler(PoolOverloaded)
+async def pool_overloaded(request, exc: PoolOverloaded):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -17,16 +50,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus-style /metrics (per-route latency, hot-path stages, cache and
+# pool gauges); METRICS=0 turns collection off
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+metrics.add_stats("pool", {"pool": "query"}, query_pool.stats,
+                  gauges=("running", "queued", "peak_queued"), counters=("completed", "failed", "rejected"))
+metrics.add_stats("response_cache", {}, response_cache.stats,
+                  gauges=("size", "hit_ratio"), counters=("hits", "misses", "not_modified"))
+
 # Load database
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR.parent / "database" / "cutoff_history.csv"
+DB_DIR = BASE_DIR.parent / "database"
+DB_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", DB_DIR / "cutoff_history.csv"))
 
-try:
-    cutoff_df = pd.read_csv(DB_PATH)
-    print(f"✅ Loaded {len(cutoff_df)} records from database")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load database - {e}")
-    cutoff_df = pd.DataFrame()
+sys.path.append(str(DB_DIR))
+from cutoff_snapshot import SnapshotStore
+
+def load_snapshot(snapshot):
+    """DataFrame view and lookup index over a memory-mapped snapshot"""
+    return snapshot.to_frame(), CutoffIndex.from_snapshot(snapshot)
+
+# Prefer the shared memory-mapped snapshot (swapped when a new one is published),
+# fall back to a private CSV load when none exists
+snapshot_store = SnapshotStore(load_snapshot)
+csv_data = None
+csv_version = None
+if snapshot_store.version:
+    print(f"✅ Mapped snapshot {snapshot_store.version} with {snapshot_store.get()[1].size} records")
+else:
+    try:
+        stat = DB_PATH.stat()
+        cutoff_df = pd.read_csv(DB_PATH)
+        csv_version = f"csv-{stat.st_mtime_ns}-{stat.st_size}"
+        print(f"✅ Loaded {len(cutoff_df)} records from database")
+        # Build lookup index once; requests never rescan cutoff_df
+        college_ids = CollegeIds(registry_path(DB_PATH)).register(cutoff_df["Name"].unique())
+        csv_data = (cutoff_df, CutoffIndex.from_frame(cutoff_df, college_ids))
+    except Exception as e:
+        print(f"⚠️ Warning: Could not load database - {e}")
+        csv_data = (pd.DataFrame(), None)
+
+def cutoff_data():
+    """(cutoff_df, cutoff_index) for the current dataset"""
+    return snapshot_store.get() or csv_data
 
 # Request models
 class CutoffRequest(BaseModel):
@@ -38,111 +105,222 @@ class CutoffRequest(BaseModel):
 class ProbabilityRequest(CutoffRequest):
     rank: int
 
+class BatchProbabilityRequest(BaseModel):
+    requests: list[ProbabilityRequest]
+
 class StudentRequest(BaseModel):
     rank: int
     course: str
     category: str
     year: Optional[int] = 2024
 
+class RankingRequest(StudentRequest):
+    sort: str = "closeness"  # closeness | cutoff_rank | probability
+    limit: int = 20
+    cursor: Optional[str] = None
+
 class TrendRequest(BaseModel):
     college_id: int
     course: str
     years: list = None
 
-def get_college_cutoff(college_name: str, course: str, category: str, year: int):
+def get_college_cutoff(college_id: int, course: str, category: str, year: int):
     """Get historical cutoff from database"""
-    if cutoff_df.empty:
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
         return None
     
-    filtered = cutoff_df[
-        (cutoff_df['Name'].str.contains(college_name, case=False, na=False)) &
-        (cutoff_df['course'] == course.upper()) &
-        (cutoff_df['category'] == category.upper()) &
-        (cutoff_df['year'] == year)
-    ]
-    
-    if not filtered.empty:
-        return int(filtered.iloc[0]['cutoff_rank'])
-    return None
+    return cutoff_index.college_cutoff(college_id, course.upper(), category.upper(), year)
+
+def cutoff_spread(course: str, category: str) -> float:
+    """Calibrated relative spread of cutoffs for a course & category"""
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
+        return DEFAULT_SPREAD
+    return cutoff_index.cutoff_spread(course.upper(), category.upper())
 
+def admission_chance(cutoffs, rank, spread):
+    """Probability that rank clears each cutoff, vectorized over arrays.
+
+    Logistic in (cutoff - rank) with scale spread x cutoff, where spread is
+    how much a college's cutoff moves from year to year (see CutoffIndex).
+    """
+    cutoffs = np.asarray(cutoffs, dtype=np.float64)
+    scale = np.maximum(1, cutoffs * spread)
+    with np.errstate(over="ignore"):
+        return 1 / (1 + np.exp(-(cutoffs - rank) / scale))
+
+@metrics.timed("get_matching_colleges")
 def get_matching_colleges(rank: int, course: str, category: str, year: int = 2024):
     """Find colleges matching student criteria"""
-    if cutoff_df.empty:
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
         return []
     
     # Use latest year data if specified year not available
-    available_years = cutoff_df['year'].unique()
-    if year not in available_years:
-        year = max(available_years)
+    if year not in cutoff_index.years:
+        year = cutoff_index.max_year
     
-    filtered = cutoff_df[
-        (cutoff_df['course'] == course.upper()) &
-        (cutoff_df['category'] == category.upper()) &
-        (cutoff_df['year'] == year)
-    ]
+    partition = cutoff_index.partition(course.upper(), category.upper(), year)
+    if partition is None:
+        return []
     
-    # Categorize colleges
-    safe_colleges = filtered[filtered['cutoff_rank'] >= rank * 1.2].copy()
-    target_colleges = filtered[(filtered['cutoff_rank'] >= rank * 0.95) & 
-                               (filtered['cutoff_rank'] < rank * 1.2)].copy()
-    dream_colleges = filtered[(filtered['cutoff_rank'] >= rank * 0.7) & 
-                              (filtered['cutoff_rank'] < rank * 0.95)].copy()
+    # One searchsorted over the rank-sorted partition splits it into
+    # Dream [0.7r, 0.95r), Target [0.95r, 1.2r) and Safe [1.2r, end)
+    dream_lo, target_lo, safe_lo = partition.band_bounds([rank * 0.7, rank * 0.95, rank * 1.2])
+    bands = [
+        ("Safe", safe_lo, len(partition)),
+        ("Target", target_lo, safe_lo),
+        ("Dream", dream_lo, target_lo),
+    ]
     
+    spread = cutoff_index.cutoff_spread(course.upper(), category.upper())
     results = []
-    
-    # Add safe colleges
-    for _, row in safe_colleges.head(5).iterrows():
-        prob = min(0.95, 0.75 + random.uniform(0, 0.2))
-        results.append({
-            "name": row['Name'],
-            "course": row['course'],
-            "category": row['category'],
-            "cutoff_rank": int(row['cutoff_rank']),
-            "probability": round(prob, 2),
-            "status": "Safe",
-            "year": int(row['year'])
-        })
-    
-    # Add target colleges
-    for _, row in target_colleges.head(5).iterrows():
-        prob = 0.5 + random.uniform(0, 0.25)
-        results.append({
-            "name": row['Name'],
-            "course": row['course'],
-            "category": row['category'],
-            "cutoff_rank": int(row['cutoff_rank']),
-            "probability": round(prob, 2),
-            "status": "Target",
-            "year": int(row['year'])
-        })
-    
-    # Add dream colleges
-    for _, row in dream_colleges.head(5).iterrows():
-        prob = 0.15 + random.uniform(0, 0.35)
-        results.append({
-            "name": row['Name'],
-            "course": row['course'],
-            "category": row['category'],
-            "cutoff_rank": int(row['cutoff_rank']),
-            "probability": round(prob, 2),
-            "status": "Dream",
-            "year": int(row['year'])
-        })
+    for status, lo, hi in bands:
+        # Top 5 per band: the cutoffs closest to the student's rank
+        positions = partition.nearest(rank, lo, hi, 5)
+        chances = admission_chance(partition.ranks[positions], rank, spread)
+        for pos, chance in zip(positions, chances.tolist()):
+            college = cutoff_index.record(partition.start + pos)
+            college["probability"] = round(chance, 2)
+            college["status"] = status
+            results.append(college)
     
     return results
 
+RANKING_SORTS = ("closeness", "cutoff_rank", "probability")
+RANKING_MAX_LIMIT = 100
+
+def band_status(cutoff_rank: int, rank: int) -> str:
+    """Safe / Target / Dream band of a cutoff for this student rank"""
+    if cutoff_rank >= rank * 1.2:
+        return "Safe"
+    if cutoff_rank >= rank * 0.95:
+        return "Target"
+    return "Dream"
+
+def data_version() -> str:
+    """Identifies the dataset currently served (for cursors and cached responses)"""
+    return snapshot_store.version or csv_version or "empty"
+
+def encode_cursor(query: list, state: list) -> str:
+    payload = json.dumps({"v": data_version(), "q": query, "s": state}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, query: list, size: int) -> list:
+    """size-int walk state stored in cursor; 400 if it is invalid, for another query or stale"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        state = payload["s"]
+        valid = (payload["q"] == query and isinstance(state, list) and len(state) == size
+                 and all(type(x) is int for x in state))
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor for this query")
+    if payload["v"] != data_version():
+        raise HTTPException(status_code=400, detail="Cursor expired, the cutoff data was updated")
+    return payload["s"]
+
+def rank_colleges(rank: int, course: str, category: str, year: int, sort: str,
+                  limit: int, cursor: Optional[str]):
+    """One page of eligible colleges (cutoff >= 0.7 x rank) in sort order.
+
+    Each page continues a walk over the rank-sorted partition from the
+    position stored in the cursor, so a page costs O(limit) no matter how
+    large the partition is or how deep the page.
+    """
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
+        return 0, [], None
+    if year not in cutoff_index.years:
+        year = cutoff_index.max_year
+    partition = cutoff_index.partition(course.upper(), category.upper(), year)
+    if partition is None:
+        return 0, [], None
+
+    lo, hi = partition.band_bounds([rank * 0.7])[0], len(partition)
+    query = [rank, course.upper(), category.upper(), year, sort]
+    if sort == "closeness":
+        # Outward from the student's rank
+        pivot = min(max(int(np.searchsorted(partition.ranks, rank)), lo), hi)
+        left, right = decode_cursor(cursor, query, 2) if cursor else (pivot - 1, pivot)
+        if not lo - 1 <= left < right <= hi:
+            raise HTTPException(status_code=400, detail="Invalid cursor for this query")
+        positions, left, right = partition.walk_nearest(rank, left, right, lo, hi, limit)
+        state = [left, right] if left >= lo or right < hi else None
+    elif sort == "cutoff_rank":
+        # Most competitive (lowest cutoff) first
+        start = decode_cursor(cursor, query, 1)[0] if cursor else lo
+        if cursor and not lo <= start < hi:
+            raise HTTPException(status_code=400, detail="Invalid cursor for this query")
+        positions = list(range(start, min(start + limit, hi)))
+        state = [start + limit] if start + limit < hi else None
+    else:
+        # Highest admission chance (largest cutoff) first
+        start = decode_cursor(cursor, query, 1)[0] if cursor else hi - 1
+        if cursor and not lo <= start < hi:
+            raise HTTPException(status_code=400, detail="Invalid cursor for this query")
+        positions = list(range(start, max(start - limit, lo - 1), -1))
+        state = [start - limit] if start - limit >= lo else None
+
+    spread = cutoff_index.cutoff_spread(course.upper(), category.upper())
+    chances = admission_chance(partition.ranks[positions], rank, spread)
+    colleges = []
+    for pos, chance in zip(positions, chances.tolist()):
+        college = cutoff_index.record(partition.start + pos)
+        college["probability"] = round(chance, 2)
+        college["status"] = band_status(college["cutoff_rank"], rank)
+        colleges.append(college)
+    next_cursor = encode_cursor(query, state) if state is not None else None
+    return hi - lo, colleges, next_cursor
+
+@app.get("/pool-stats")
+def pool_stats():
+    """Queue depth, rejections and timings of the query pool"""
+    return {"query": query_pool.stats()}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of all collected metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS=0)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the response cache"""
+    return response_cache.stats()
+
+@app.get("/colleges/search")
+async def search_colleges(q: str, limit: int = 5):
+    """College ids for a (possibly misspelt or partial) college name"""
+    if not 1 <= limit <= RANKING_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {RANKING_MAX_LIMIT}")
+    return await query_pool.run(find_colleges, q, limit)
+
+def find_colleges(q: str, limit: int):
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
+        return {"colleges": []}
+    return {
+        "colleges": [
+            {"college_id": college_id, "name": name, "score": score}
+            for college_id, name, score in cutoff_index.colleges.search(q, limit)
+        ]
+    }
+
 @app.get("/")
 def root():
     return {
         "message": "ML Admission Predictor API", 
         "status": "running",
-        "database_records": len(cutoff_df)
+        "database_records": len(cutoff_data()[0])
     }
 
-@app.post("/predict-cutoff")
-def predict_cutoff(req: CutoffRequest):
+def estimate_cutoff(req: CutoffRequest):
     # Try to get from database first
-    cutoff = get_college_cutoff(str(req.college_id), req.course, req.category, req.year)
+    cutoff = get_college_cutoff(req.college_id, req.course, req.category, req.year)
     
     if cutoff:
         return {"predicted_cutoff_rank": cutoff, "source": "historical"}
@@ -151,37 +329,61 @@ def predict_cutoff(req: CutoffRequest):
     base_cutoff = 15000 + (req.college_id * 50)
     return {"predicted_cutoff_rank": int(base_cutoff), "source": "estimated"}
 
+@app.post("/predict-cutoff")
+async def predict_cutoff(req: CutoffRequest, request: Request):
+    return await response_cache.respond(
+        request, req, data_version(), lambda: query_pool.run(estimate_cutoff, req))
+
+def lookup_cutoff(college_id: int, course: str, category: str, year: int) -> int:
+    """Historical cutoff, or the estimate used when there is none"""
+    cutoff = get_college_cutoff(college_id, course, category, year)
+    return cutoff if cutoff else 15000 + (college_id * 50)
+
 @app.post("/admission-probability")
-def admission_probability(req: ProbabilityRequest):
+async def admission_probability(req: ProbabilityRequest):
+    return await query_pool.run(score_admission, req)
+
+def score_admission(req: ProbabilityRequest):
     # Get actual cutoff from database
-    cutoff = get_college_cutoff(str(req.college_id), req.course, req.category, req.year)
-    
-    if not cutoff:
-        cutoff = 15000 + (req.college_id * 50)
-    
-    # Calculate probability based on rank vs cutoff
-    rank_ratio = req.rank / cutoff
+    cutoff = lookup_cutoff(req.college_id, req.course, req.category, req.year)
     
-    if rank_ratio <= 0.8:
-        prob = 0.85 + random.uniform(0, 0.14)
-    elif rank_ratio <= 0.95:
-        prob = 0.65 + random.uniform(0, 0.2)
-    elif rank_ratio <= 1.1:
-        prob = 0.45 + random.uniform(0, 0.2)
-    elif rank_ratio <= 1.3:
-        prob = 0.25 + random.uniform(0, 0.2)
-    else:
-        prob = 0.05 + random.uniform(0, 0.15)
+    # Calibrated, deterministic probability from rank vs cutoff
+    prob = admission_chance(cutoff, req.rank, cutoff_spread(req.course, req.category))
     
     return {
-        "probability": round(min(prob, 1.0), 4),
+        "probability": round(float(prob), 4),
         "predicted_cutoff": int(cutoff)
     }
 
+@app.post("/admission-probability/batch")
+async def admission_probability_batch(req: BatchProbabilityRequest):
+    return await query_pool.run(score_admission_batch, req)
+
+def score_admission_batch(req: BatchProbabilityRequest):
+    # Cutoffs are index hits; all probabilities are scored in one vectorized pass
+    if not req.requests:
+        return {"results": []}
+    cutoffs = [lookup_cutoff(r.college_id, r.course, r.category, r.year) for r in req.requests]
+    probs = admission_chance(
+        cutoffs,
+        np.array([r.rank for r in req.requests]),
+        np.array([cutoff_spread(r.course, r.category) for r in req.requests]),
+    )
+    return {
+        "results": [
+            {"probability": round(prob, 4), "predicted_cutoff": int(cutoff)}
+            for prob, cutoff in zip(probs.tolist(), cutoffs)
+        ]
+    }
+
 @app.post("/recommend-colleges")
-def recommend_colleges(req: StudentRequest):
+async def recommend_colleges(req: StudentRequest, request: Request):
     """Get personalized college recommendations based on student rank"""
-    colleges = get_matching_colleges(req.rank, req.course, req.category, req.year or 2024)
+    return await response_cache.respond(request, req, data_version(), lambda: recommendations(req))
+
+async def recommendations(req: StudentRequest):
+    colleges = await query_pool.run(
+        get_matching_colleges, req.rank, req.course, req.category, req.year or 2024)
     
     if not colleges:
         raise HTTPException(status_code=404, detail="No colleges found matching your criteria")
@@ -196,28 +398,39 @@ def recommend_colleges(req: StudentRequest):
         }
     }
 
-@app.post("/trends")
-def get_trends(req: TrendRequest):
-    if cutoff_df.empty:
+def find_trends(college_id: int, course: str):
+    """Trend response for one college & course (index lookup, runs on the query pool)"""
+    _, cutoff_index = cutoff_data()
+    if cutoff_index is None:
         return {"trends": [], "error": "Database not available"}
     
-    college_data = cutoff_df[
-        cutoff_df['Name'].str.contains(str(req.college_id), case=False, na=False) &
-        (cutoff_df['course'] == req.course.upper())
-    ]
-    
-    if college_data.empty:
+    trends = cutoff_index.college_history(college_id, course.upper())
+    if not trends:
         return {"trends": [], "message": "No data found"}
     
-    trends = []
-    for _, row in college_data.iterrows():
-        trends.append({
-            "year": int(row['year']),
-            "category": row['category'],
-            "cutoff_rank": int(row['cutoff_rank'])
-        })
-    
-    return {"trends": trends}
+    return {"college": cutoff_index.colleges.name(college_id), "trends": trends}
+
+@app.post("/rank-colleges")
+async def rank_colleges_endpoint(req: RankingRequest):
+    """Eligible colleges for a student, ranked and paginated with next_cursor"""
+    if req.sort not in RANKING_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(RANKING_SORTS)}")
+    if not 1 <= req.limit <= RANKING_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {RANKING_MAX_LIMIT}")
+    total, colleges, next_cursor = await query_pool.run(
+        rank_colleges, req.rank, req.course, req.category, req.year or 2024,
+        req.sort, req.limit, req.cursor)
+    return {
+        "total": total,
+        "sort": req.sort,
+        "colleges": colleges,
+        "next_cursor": next_cursor
+    }
+
+@app.post("/trends")
+async def get_trends(req: TrendRequest, request: Request):
+    return await response_cache.respond(
+        request, req, data_version(), lambda: query_pool.run(find_trends, req.college_id, req.course))
 
 if __name__ == "__main__":
     import uvicorn
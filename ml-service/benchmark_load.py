@@ -0,0 +1,65 @@
+"""Throughput and tail latency of the service under a realistic request mix.
+
+Starts app_simple.py (or app.py with --app app) in-process over a
+synthetic cutoff history of --rows rows (database/synthetic_history.py),
+and replays a weighted mix of predict-cutoff, admission-probability,
+recommend-colleges and trends requests from --concurrency closed-loop
+clients through httpx's ASGI transport, so no server process or sockets
+are involved. Reports p50/p95/p99 latency and RPS per route and overall,
+plus the process RSS. --json also writes the numbers, with the git commit
+and settings, so runs can be compared across commits. Needs httpx (requirements-dev.txt).
+
+    python benchmark_load.py --rows 100000 --requests 5000 --concurrency 16
+    python benchmark_load.py --app app --json load_app.json
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR.parent))
+from shared.college_ids import CollegeIds, registry_path
+from shared.load_benchmark import parse_args, run
+
+# Relative weight of each route in the mix; app.py has no recommend-colleges
+MIX = {
+    "app_simple": {"predict-cutoff": 3, "admission-probability": 3, "recommend-colleges": 2, "trends": 2},
+    "app": {"predict-cutoff": 4, "admission-probability": 4, "trends": 2},
+}
+
+
+def make_requests(df, mix: dict, n: int, seed: int) -> list:
+    """n (route, path, body) tuples drawn from the dataset's own values"""
+    rng = np.random.default_rng(seed)
+    # The ids the app registered for the synthetic history
+    college_ids = CollegeIds(registry_path(os.environ["CUTOFF_HISTORY_PATH"])).register(df["Name"].unique())
+    rows = df.sample(n, replace=True, random_state=seed)
+    routes = rng.choice(list(mix), size=n, p=np.array(list(mix.values())) / sum(mix.values()))
+    ranks = rng.integers(df["cutoff_rank"].min(), df["cutoff_rank"].max() + 1, size=n)
+
+    requests = []
+    for route, row, rank in zip(routes, rows.itertuples(index=False), ranks.tolist()):
+        college = {"college_id": college_ids[row.Name], "course": row.course,
+                   "category": row.category, "year": int(row.year)}
+        if route == "predict-cutoff":
+            body = college
+        elif route == "admission-probability":
+            body = dict(college, rank=rank)
+        elif route == "recommend-colleges":
+            body = {"rank": rank, "course": row.course, "category": row.category, "year": int(row.year)}
+        else:
+            body = {"college_id": college["college_id"], "course": row.course}
+        requests.append((route, f"/{route}", body))
+    return requests
+
+
+def main():
+    args = parse_args("In-process load test of ml-service", sorted(MIX))
+    run("ml-service", BASE_DIR, args,
+        lambda df, n: make_requests(df, MIX[args.app], n, args.seed), MIX[args.app])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""Memory of the service with 1, 4 and 8 workers.
+
+Compares `uvicorn app:app --workers N` (every worker loads its own model)
+with `python serve.py --workers N` (model loaded once, workers forked);
+the measurement itself is in shared/memory_benchmark.py. Run after
+training the model (Linux).
+
+    python benchmark_memory.py --workers 1 4 8
+"""
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR.parent))
+from shared.memory_benchmark import main
+
+PATH = "/admission-probability"
+BODY = {"college_id": 3, "course": "CSE", "category": "OC", "year": 2024, "rank": 5000}
+
+if __name__ == "__main__":
+    main(BASE_DIR, PATH, BODY)
@@ -0,0 +1,240 @@
+"""Load-time index over the cutoff history table.
+
+Rows are dictionary-encoded on (course, category, year) and split into
+partitions sorted by cutoff_rank, so lookups no longer rescan the whole
+DataFrame: point lookups are dict hits and rank ranges are binary searches.
+The index is built either from a DataFrame (sorted copy of the columns) or
+directly over a memory-mapped snapshot, whose rows are already sorted.
+Colleges are addressed by their registered college_id (college_ids.py),
+via a CollegeSearch over the names.
+"""
+import numpy as np
+import pandas as pd
+
+from shared.college_search import CollegeSearch
+
+# Relative year-to-year spread of a college's cutoff, used when there is
+# not enough multi-year history to fit one
+DEFAULT_SPREAD = 0.1
+MIN_SPREAD_COLLEGES = 5
+SPREAD_BOUNDS = (0.02, 0.5)
+
+
+class CutoffPartition:
+    """All rows of one (course, category, year), sorted by cutoff_rank"""
+
+    __slots__ = ("ranks", "start")
+
+    def __init__(self, ranks: np.ndarray, start: int):
+        self.ranks = ranks  # ascending cutoff ranks (a view into the index)
+        self.start = start  # index row of ranks[0]
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def band_bounds(self, thresholds) -> list:
+        """Positions of each threshold in ranks (one vectorized searchsorted)"""
+        return np.searchsorted(self.ranks, thresholds, side="left").tolist()
+
+    def nearest(self, rank: int, lo: int, hi: int, n: int) -> list:
+        """Up to n positions in [lo, hi) whose cutoff is closest to rank"""
+        pivot = min(max(int(np.searchsorted(self.ranks, rank)), lo), hi)
+        return self.walk_nearest(rank, pivot - 1, pivot, lo, hi, n)[0]
+
+    def walk_nearest(self, rank: int, left: int, right: int, lo: int, hi: int, n: int):
+        """Next n positions by closeness to rank, resuming a walk at (left, right).
+
+        Two-pointer merge of the cutoffs below and above rank, so the cost
+        is O(n) regardless of partition size. Returns (positions, left, right).
+        """
+        picked = []
+        while len(picked) < n and (left >= lo or right < hi):
+            if right >= hi or (left >= lo and rank - self.ranks[left] <= self.ranks[right] - rank):
+                picked.append(left)
+                left -= 1
+            else:
+                picked.append(right)
+                right += 1
+        return picked, left, right
+
+
+class CutoffIndex:
+    """Partitioned, rank-sorted view of the cutoff history.
+
+    String columns are passed as (codes, vocabulary) pairs. If presorted is
+    False the rows are stably sorted by (course, category, year, rank) here;
+    source_rows gives each row's position in the original file so point
+    lookups still prefer the first matching CSV row. college_ids maps each
+    name to its public college_id.
+    """
+
+    def __init__(self, names, name_codes, courses, course_codes, categories,
+                 category_codes, years, ranks, source_rows=None, presorted=False, college_ids=None):
+        self.size = len(ranks)
+        self.names = np.asarray(names)
+        self.courses = np.asarray(courses)
+        self.categories = np.asarray(categories)
+        self.colleges = CollegeSearch(self.names.tolist(), ids=college_ids)
+        self._name_codes = {str(name): code for code, name in enumerate(self.names.tolist())}
+
+        self._course_ids = {value: code for code, value in enumerate(self.courses.tolist())}
+        self._category_ids = {value: code for code, value in enumerate(self.categories.tolist())}
+        self.years = frozenset(np.unique(years).tolist())
+        self.max_year = max(self.years) if self.years else None
+
+        # Point lookups: first row (source order) per (name, course, category, year)
+        if source_rows is None:
+            source_rows = np.arange(self.size)
+        keys = pd.DataFrame({
+            "name": name_codes, "course": course_codes, "category": category_codes,
+            "year": years, "rank": ranks, "row": source_rows,
+        })
+        self._spreads, self.default_spread = self._fit_spreads(keys)
+        if presorted:
+            keys = keys.sort_values("row", kind="stable")
+        first = keys.drop_duplicates(["name", "course", "category", "year"])
+        self._points = {}
+        for row, name, course, category, year, rank in zip(
+            first["row"].tolist(), first["name"].tolist(), first["course"].tolist(),
+            first["category"].tolist(), first["year"].tolist(), first["rank"].tolist(),
+        ):
+            self._points.setdefault((course, category, year), {})[name] = (row, rank)
+
+        if not presorted:
+            # One stable sort by (course, category, year, rank); ties keep file order
+            order = np.lexsort((ranks, years, category_codes, course_codes))
+            name_codes, course_codes, category_codes, years, ranks = (
+                np.asarray(col)[order]
+                for col in (name_codes, course_codes, category_codes, years, ranks)
+            )
+        self.name_codes = name_codes
+        self.course_codes = course_codes
+        self.category_codes = category_codes
+        self.year_values = years
+        self.ranks = ranks
+
+        # Partitions are contiguous runs of equal (course, category, year)
+        if self.size:
+            change = (
+                (course_codes[1:] != course_codes[:-1])
+                | (category_codes[1:] != category_codes[:-1])
+                | (years[1:] != years[:-1])
+            )
+            starts = np.concatenate(([0], np.flatnonzero(change) + 1))
+        else:
+            starts = np.array([], dtype=np.int64)
+        ends = np.append(starts[1:], self.size)
+
+        self._partitions = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = (int(course_codes[start]), int(category_codes[start]), int(years[start]))
+            self._partitions[key] = CutoffPartition(ranks[start:end], start)
+
+        # Rows of each college, for per-college history
+        self._rows_by_name = np.argsort(name_codes, kind="stable")
+        self._name_starts = np.searchsorted(
+            np.asarray(name_codes)[self._rows_by_name], np.arange(len(self.names) + 1))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, college_ids=None):
+        """Index a DataFrame with Name, course, category, year, cutoff_rank"""
+        name_codes, names = pd.factorize(df["Name"].fillna(""))
+        course_codes, courses = pd.factorize(df["course"])
+        category_codes, categories = pd.factorize(df["category"])
+        return cls(
+            names, name_codes, courses, course_codes, categories, category_codes,
+            df["year"].to_numpy(dtype=np.int64), df["cutoff_rank"].to_numpy(dtype=np.int64),
+            college_ids=college_ids,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Index a memory-mapped cutoff snapshot without copying its columns"""
+        return cls(
+            snapshot.vocab("Name"), snapshot.codes("Name"),
+            snapshot.vocab("course"), snapshot.codes("course"),
+            snapshot.vocab("category"), snapshot.codes("category"),
+            snapshot.values("year"), snapshot.values("cutoff_rank"),
+            source_rows=snapshot.values("source_row"), presorted=True,
+            college_ids=snapshot.college_ids(),
+        )
+
+    @staticmethod
+    def _fit_spreads(keys: pd.DataFrame):
+        """Pooled relative std of each college's cutoff across years.
+
+        Returns ({(course_code, category_code): spread}, overall spread);
+        groups with fewer than MIN_SPREAD_COLLEGES multi-year colleges
+        use the overall value, which falls back to DEFAULT_SPREAD.
+        """
+        per_college = keys.groupby(["name", "course", "category"])["rank"].agg(["std", "mean", "count"])
+        per_college = per_college[(per_college["count"] >= 2) & (per_college["mean"] > 0)]
+        rel_var = (per_college["std"] / per_college["mean"]) ** 2
+        low, high = SPREAD_BOUNDS
+        overall = DEFAULT_SPREAD
+        if len(rel_var) >= MIN_SPREAD_COLLEGES:
+            overall = float(np.clip(np.sqrt(rel_var.mean()), low, high))
+        pooled = rel_var.groupby(level=["course", "category"]).agg(["mean", "count"])
+        spreads = {
+            (int(course), int(category)): float(np.clip(np.sqrt(mean), low, high))
+            for (course, category), mean, count in zip(pooled.index, pooled["mean"], pooled["count"])
+            if count >= MIN_SPREAD_COLLEGES
+        }
+        return spreads, overall
+
+    def _name_code(self, college_id: int):
+        name = self.colleges.name(college_id)
+        return self._name_codes.get(name) if name is not None else None
+
+    def _key(self, course: str, category: str, year: int):
+        course_id = self._course_ids.get(course)
+        category_id = self._category_ids.get(category)
+        if course_id is None or category_id is None:
+            return None
+        return course_id, category_id, int(year)
+
+    def partition(self, course: str, category: str, year: int):
+        """Rank-sorted partition for (course, category, year), or None"""
+        key = self._key(course, category, year)
+        return self._partitions.get(key) if key else None
+
+    def cutoff_spread(self, course: str, category: str) -> float:
+        """Relative year-to-year spread of cutoffs for a course & category"""
+        course_id = self._course_ids.get(course)
+        category_id = self._category_ids.get(category)
+        return self._spreads.get((course_id, category_id), self.default_spread)
+
+    def record(self, row: int) -> dict:
+        """Decoded fields of one (sorted) index row"""
+        return {
+            "name": str(self.names[self.name_codes[row]]),
+            "course": str(self.courses[self.course_codes[row]]),
+            "category": str(self.categories[self.category_codes[row]]),
+            "cutoff_rank": int(self.ranks[row]),
+            "year": int(self.year_values[row]),
+        }
+
+    def college_cutoff(self, college_id: int, course: str, category: str, year: int):
+        """Cutoff of a college (by college_id) in its first matching row, or None"""
+        key = self._key(course, category, year)
+        name_code = self._name_code(college_id)
+        if key is None or name_code is None:
+            return None
+        hit = self._points.get(key, {}).get(name_code)
+        return hit[1] if hit else None
+
+    def college_history(self, college_id: int, course: str) -> list:
+        """All (year, category, cutoff_rank) records of a college for a course"""
+        name_code = self._name_code(college_id)
+        course_id = self._course_ids.get(course)
+        if name_code is None or course_id is None:
+            return []
+        rows = self._rows_by_name[self._name_starts[name_code]:self._name_starts[name_code + 1]]
+        rows = rows[np.asarray(self.course_codes)[rows] == course_id]
+        records = [
+            {"year": int(self.year_values[row]),
+             "category": str(self.categories[self.category_codes[row]]),
+             "cutoff_rank": int(self.ranks[row])}
+            for row in rows.tolist()
+        ]
+        return sorted(records, key=lambda r: (r["year"], r["category"]))
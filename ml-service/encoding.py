@@ -0,0 +1,42 @@
+"""Constant-time label encoding for request features.
+
+LabelEncoder.transform does a sorted-array search per call and signals
+unseen values with an exception. EncoderLookup is built once from a fitted
+encoder's classes_ and maps values to codes with a dict (scalars) or a
+hashed pandas Index (arrays), with unseen values mapped to a fallback code.
+"""
+import numpy as np
+import pandas as pd
+
+
+class EncoderLookup:
+    """Value -> code table for one fitted LabelEncoder"""
+
+    def __init__(self, classes, fallback: int = 0):
+        self.classes = np.asarray(classes)
+        self.fallback = fallback
+        self._codes = {value: code for code, value in enumerate(self.classes.tolist())}
+        self._index = pd.Index(self.classes)
+
+    @classmethod
+    def from_encoder(cls, encoder, fallback: int = 0):
+        return cls(encoder.classes_, fallback)
+
+    @classmethod
+    def by_ids(cls, classes, ids: dict, fallback: int = 0):
+        """Lookup from a class's id in ids ({value: id}) to its code.
+
+        College ids come from the persisted registry (college_ids.py), while
+        encoder codes follow the encoder's own order, which model_refresh.py
+        extends by appending new colleges.
+        """
+        return cls([ids.get(str(value), -1) for value in np.asarray(classes).tolist()], fallback)
+
+    def encode(self, value) -> int:
+        """Code for a single value, or the fallback if unseen"""
+        return self._codes.get(value, self.fallback)
+
+    def encode_array(self, values) -> np.ndarray:
+        """Codes for an array of values, unseen values get the fallback"""
+        codes = self._index.get_indexer(np.asarray(values))
+        return np.where(codes < 0, self.fallback, codes)
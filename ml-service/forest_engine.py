@@ -0,0 +1,64 @@
+"""Flattened RandomForest inference.
+
+sklearn's RandomForestRegressor.predict carries validation and joblib
+dispatch overhead that dominates single-row latency. FlatForest copies the
+fitted trees into contiguous node arrays (feature, threshold, left, right,
+value) and walks every tree at once with NumPy, one level per step.
+"""
+import numpy as np
+
+
+class FlatForest:
+    """All trees of a fitted forest packed into one set of node arrays"""
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_estimators = len(roots)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Flatten a fitted RandomForestRegressor (single output)"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            nodes = np.arange(offset, offset + n)
+            leaf = tree.children_left < 0
+            # Leaves point at themselves so extra steps are no-ops
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, nodes, tree.children_left + offset))
+            rights.append(np.where(leaf, nodes, tree.children_right + offset))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += n
+        return cls(
+            np.concatenate(features).astype(np.intp),
+            np.concatenate(thresholds),
+            np.concatenate(lefts).astype(np.intp),
+            np.concatenate(rights).astype(np.intp),
+            np.concatenate(values),
+            np.asarray(roots, dtype=np.intp),
+            depth,
+        )
+
+    def predict(self, X) -> np.ndarray:
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(len(X))[None, :]
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].sum(axis=0) / self.n_estimators
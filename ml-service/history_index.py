@@ -0,0 +1,68 @@
+"""Memoized, grouped view of cutoff_history.csv for the /trends endpoint.
+
+The CSV is parsed once into per-(college_id, course) record lists and only
+re-read when its mtime or size changes, so a request is a stat() plus a
+dict lookup instead of a full read_csv and filter. Histories without a
+college_id column (the real one, keyed by Name) use the registered ids of
+college_ids.py, which app.py maps to the model's college codes by name.
+"""
+import os
+import threading
+
+import pandas as pd
+
+from shared.college_ids import CollegeIds, registry_path
+
+TREND_COLUMNS = ['year', 'category', 'cutoff_rank']
+
+
+class TrendIndex:
+    """Per-(college_id, course) trend records, reloaded when the file changes"""
+
+    def __init__(self, path, ids_path=None):
+        self.path = path
+        self.college_ids = CollegeIds(ids_path or registry_path(path))
+        self._stamp = None
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        df = pd.read_csv(self.path)
+        if 'college_id' not in df.columns:
+            df = df.dropna(subset=['Name'])
+            ids = self.college_ids.register(df['Name'].unique())
+            df = df.assign(college_id=df['Name'].astype(str).map(ids))
+            df = df.dropna(subset=['college_id']).astype({'college_id': 'int64'})
+        return {
+            key: group[TREND_COLUMNS].to_dict(orient='records')
+            for key, group in df.groupby(['college_id', 'course'], sort=False)
+        }
+
+    def version(self) -> str:
+        """Changes whenever the CSV does ("missing" if it is gone)"""
+        try:
+            mtime_ns, size = self._file_stamp()
+        except FileNotFoundError:
+            return "missing"
+        return f"{mtime_ns}-{size}"
+
+    def groups(self) -> dict:
+        """Current grouped records; raises FileNotFoundError if the CSV is gone"""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._groups = self._load()
+                    self._stamp = stamp
+        return self._groups
+
+    def trends(self, college_id, course, years=None) -> list:
+        records = self.groups().get((college_id, course), [])
+        if years:
+            wanted = set(years)
+            records = [r for r in records if r['year'] in wanted]
+        return records
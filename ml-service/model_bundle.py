@@ -0,0 +1,156 @@
+"""Single-file, memory-mappable model artifact for app.py.
+
+Unpickling a 100-tree forest and converting it to a FlatForest dominates
+startup. The bundle stores the FlatForest node arrays and the encoder
+vocabularies as raw NumPy arrays in one file:
+
+    b"CMBUNDLE" | uint32 header length | JSON header | arrays (64-byte aligned)
+
+The header holds the format and model version, the feature list, every
+array's dtype/shape/offset and a sha256 of the array payload. Loading maps
+the file read-only and serves thresholds and leaf values straight from the
+mapping, so it costs one checksum pass plus widening the small index
+arrays to intp. Arrays use compact dtypes: int8 split features, int32
+child indices and float32 thresholds rounded down, which keeps every
+comparison against the float32 request features exact.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from forest_engine import FlatForest
+from training_data import FEATURES
+
+BUNDLE_FILE = "cutoff_model.bundle"
+MAGIC = b"CMBUNDLE"
+FORMAT_VERSION = 1
+ALIGN = 64
+ENCODERS = ("college", "course", "category")
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """Largest float32 <= each value, so x32 <= t  <=>  x32 <= floor32(t)"""
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _vocabulary(classes) -> np.ndarray:
+    classes = np.asarray(classes)
+    return classes.astype(str) if classes.dtype.kind == "O" else classes
+
+
+class ModelBundle:
+    """FlatForest and encoder vocabularies mapped from one bundle file"""
+
+    def __init__(self, forest: FlatForest, classes: dict, meta: dict):
+        self.forest = forest
+        self.classes = classes
+        self.meta = meta
+        self.version = meta["version"]
+
+    @staticmethod
+    def write(path, forest: FlatForest, classes: dict, version: str, metadata: dict = None):
+        """Write forest and {college, course, category} classes to path atomically"""
+        n_nodes = len(forest.value)
+        arrays = {
+            "feature": forest.feature.astype(np.int8),
+            "threshold": _float32_floor(np.asarray(forest.threshold, dtype=np.float64)),
+            "left": forest.left.astype(np.int32),
+            "right": forest.right.astype(np.int32),
+            "value": np.asarray(forest.value, dtype=np.float64),
+            "roots": forest.roots.astype(np.int32),
+        }
+        if n_nodes >= np.iinfo(np.int32).max:
+            raise ValueError("Forest too large for int32 node indices")
+        for name in ENCODERS:
+            arrays[f"classes_{name}"] = _vocabulary(classes[name])
+
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // ALIGN) * ALIGN
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+        digest = hashlib.sha256()
+        for array in arrays.values():
+            digest.update(np.ascontiguousarray(array).tobytes())
+
+        header = json.dumps({
+            "format": FORMAT_VERSION,
+            "version": version,
+            "features": FEATURES,
+            "depth": int(forest.depth),
+            "n_estimators": int(forest.n_estimators),
+            "arrays": layout,
+            "payload_bytes": offset,
+            "sha256": digest.hexdigest(),
+            "metadata": metadata or {},
+        }).encode()
+        start = -(-(len(MAGIC) + 4 + len(header)) // ALIGN) * ALIGN
+
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(start + layout[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(start + offset)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, expected_version: str = None, verify: bool = True):
+        """Map a bundle read-only; raise ValueError if it is corrupt or mismatched"""
+        path = Path(path)
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a model bundle")
+            header_length = int.from_bytes(f.read(4), "little")
+            header = json.loads(f.read(header_length))
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model bundle format in {path}")
+        if header["features"] != FEATURES:
+            raise ValueError(f"Model bundle features {header['features']} do not match {FEATURES}")
+        if expected_version is not None and header["version"] != expected_version:
+            raise ValueError(f"Model bundle version {header['version']} does not match {expected_version}")
+
+        start = -(-(len(MAGIC) + 4 + header_length) // ALIGN) * ALIGN
+        if os.path.getsize(path) != start + header["payload_bytes"]:
+            raise ValueError(f"Model bundle {path} is truncated")
+        payload = np.memmap(path, dtype=np.uint8, mode="r", offset=start, shape=(header["payload_bytes"],))
+
+        arrays = {}
+        digest = hashlib.sha256()
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            array = payload[spec["offset"]:spec["offset"] + count * dtype.itemsize].view(dtype)
+            arrays[name] = array.reshape(spec["shape"])
+            if verify:
+                digest.update(arrays[name])
+        if verify and digest.hexdigest() != header["sha256"]:
+            raise ValueError(f"Model bundle {path} failed its checksum")
+
+        n_nodes = len(arrays["value"])
+        if not (len(arrays["feature"]) == len(arrays["threshold"]) == len(arrays["left"])
+                == len(arrays["right"]) == n_nodes and len(arrays["roots"]) == header["n_estimators"]):
+            raise ValueError(f"Model bundle {path} has inconsistent tree arrays")
+
+        # Plain ndarray views skip np.memmap's per-operation subclass overhead
+        # (pages stay shared); index arrays are widened to intp once so fancy
+        # indexing in predict() doesn't convert them on every call
+        arrays = {name: array.view(np.ndarray) for name, array in arrays.items()}
+        forest = FlatForest(
+            arrays["feature"].astype(np.intp), arrays["threshold"],
+            arrays["left"].astype(np.intp), arrays["right"].astype(np.intp),
+            arrays["value"], arrays["roots"].astype(np.intp), header["depth"],
+        )
+        classes = {name: arrays[f"classes_{name}"] for name in ENCODERS}
+        return cls(forest, classes, header)
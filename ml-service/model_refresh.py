@@ -0,0 +1,84 @@
+"""Incremental model refresh after new cutoff rows are appended.
+
+Instead of retraining from scratch, this extends the current encoders
+(existing codes are kept, new colleges/courses/categories are appended)
+and adds REFRESH_TREES trees fitted on the full history with warm_start,
+keeping the existing trees. When the forest exceeds REFRESH_MAX_TREES
+the oldest trees are dropped. Publishing bumps model/MODEL_VERSION, which
+a running app.py picks up without a restart.
+
+    python model_refresh.py
+
+If the history was edited rather than appended, run train_model.py.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import joblib
+
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from model_store import history_status, publish_model, read_training_state
+from shared.college_ids import CollegeIds, registry_path
+from training_data import read_history
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", BASE_DIR / "../database/cutoff_history.csv"))
+MODEL_DIR = Path(os.environ.get("MODEL_DIR", BASE_DIR / "model"))
+
+REFRESH_TREES = int(os.environ.get("REFRESH_TREES", "20"))
+REFRESH_MAX_TREES = int(os.environ.get("REFRESH_MAX_TREES", "200"))
+TRAIN_CHUNK_ROWS = int(os.environ.get("TRAIN_CHUNK_ROWS", "200000"))
+TRAIN_JOBS = int(os.environ.get("TRAIN_JOBS", "-1"))
+PREDICTION_YEARS_AHEAD = int(os.environ.get("PREDICTION_YEARS_AHEAD", "2"))
+PREDICTION_TABLE_MAX_MB = int(os.environ.get("PREDICTION_TABLE_MAX_MB", "256"))
+
+
+def main() -> int:
+    status = history_status(MODEL_DIR, DATA_PATH)
+    if status == "unchanged":
+        print("No new rows in the cutoff history, model is up to date.")
+        return 0
+    if status == "rewritten":
+        print("Cutoff history changed beyond appended rows (or no training state), "
+              "run train_model.py for a full retrain.")
+        return 1
+
+    start = time.perf_counter()
+    model = joblib.load(MODEL_DIR / 'cutoff_model.pkl')
+    encoders = [joblib.load(MODEL_DIR / f'le_{name}.pkl') for name in ('college', 'course', 'category')]
+    X, y, years, (le_college, le_course, le_category) = read_history(
+        DATA_PATH, chunk_rows=TRAIN_CHUNK_ROWS, classes=[le.classes_ for le in encoders])
+    previous_rows = read_training_state(MODEL_DIR)["rows"]
+    added = [len(new.classes_) - len(old.classes_)
+             for new, old in zip((le_college, le_course, le_category), encoders)]
+    print(f"{len(y) - previous_rows} new rows; new classes: {added[0]} colleges, "
+          f"{added[1]} courses, {added[2]} categories")
+    if le_college.classes_.dtype.kind in "OUS":
+        # New colleges get the next persisted college_ids; existing ids never change
+        CollegeIds(registry_path(DATA_PATH)).register(le_college.classes_)
+
+    # Keep the fitted trees and grow the forest on the updated history
+    model.set_params(warm_start=True, n_jobs=TRAIN_JOBS,
+                     n_estimators=len(model.estimators_) + REFRESH_TREES)
+    model.fit(X, y)
+    if len(model.estimators_) > REFRESH_MAX_TREES:
+        model.estimators_ = model.estimators_[-REFRESH_MAX_TREES:]
+        model.n_estimators = REFRESH_MAX_TREES
+    model.set_params(warm_start=False)
+    print(f"Forest has {len(model.estimators_)} trees after refresh "
+          f"({time.perf_counter() - start:.2f}s)")
+
+    publish_model(
+        MODEL_DIR, model, le_college, le_course, le_category, DATA_PATH,
+        rows=len(y), years=years,
+        table_years_ahead=PREDICTION_YEARS_AHEAD, table_max_mb=PREDICTION_TABLE_MAX_MB,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Publishing and hot reload of the ml-service model files.
+
+train_model.py and model_refresh.py write the pickles, the model bundle
+and the prediction table into model/ and then atomically replace model/MODEL_VERSION.
+ModelStore (used by app.py) notices the new version and loads it on a
+background thread while requests keep using the previous model; the swap
+is a single reference assignment, so a request sees either the old or the
+new model and encoders, never a mix.
+
+training_state.json records how much of cutoff_history.csv the current
+model has seen (byte size and a hash of that prefix), so a refresh can
+tell appended rows from a rewritten history.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import joblib
+
+from forest_engine import FlatForest
+from model_bundle import BUNDLE_FILE, ModelBundle
+from prediction_table import PredictionTable
+from training_data import FEATURES
+
+VERSION_FILE = "MODEL_VERSION"
+STATE_FILE = "training_state.json"
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def current_version(model_dir):
+    try:
+        return (Path(model_dir) / VERSION_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def history_fingerprint(path, size: int = None) -> str:
+    """sha256 of the first size bytes of path (all of it by default)"""
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def read_training_state(model_dir):
+    try:
+        with open(Path(model_dir) / STATE_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def history_status(model_dir, path) -> str:
+    """'unchanged', 'appended' or 'rewritten' relative to the trained history"""
+    state = read_training_state(model_dir)
+    if state is None:
+        return "rewritten"
+    size = os.path.getsize(path)
+    if size < state["history_bytes"]:
+        return "rewritten"
+    if history_fingerprint(path, state["history_bytes"]) != state["history_sha256"]:
+        return "rewritten"
+    return "unchanged" if size == state["history_bytes"] else "appended"
+
+
+def publish_model(model_dir, model, le_college, le_course, le_category, history_path,
+                  rows: int, years, table_years_ahead: int, table_max_mb: int) -> str:
+    """Save model, encoders, bundle and prediction table, then publish a new version"""
+    model_dir = Path(model_dir)
+    version = f"{time.strftime('%Y%m%d%H%M%S')}-{time.time_ns() % 10**9:09d}"
+    joblib.dump(model, model_dir / 'cutoff_model.pkl')
+    joblib.dump(le_college, model_dir / 'le_college.pkl')
+    joblib.dump(le_course, model_dir / 'le_course.pkl')
+    joblib.dump(le_category, model_dir / 'le_category.pkl')
+    joblib.dump(FEATURES, model_dir / 'features.pkl')
+    print("Model and encoders saved successfully.")
+
+    # Fast-loading bundle that app.py maps instead of unpickling (see model_bundle.py)
+    ModelBundle.write(
+        model_dir / BUNDLE_FILE, FlatForest.from_sklearn(model),
+        {"college": le_college.classes_, "course": le_course.classes_, "category": le_category.classes_},
+        version, metadata={"rows": rows, "years": list(years)},
+    )
+    print(f"Model bundle saved: {(model_dir / BUNDLE_FILE).stat().st_size / 1024:.0f} KB.")
+
+    # Precompute predictions over the full feature grid (serve with PREDICTION_TABLE=1)
+    table = PredictionTable.build(
+        model,
+        len(le_college.classes_), len(le_course.classes_), len(le_category.classes_),
+        years=range(years[0], years[1] + 1 + table_years_ahead),
+        max_bytes=table_max_mb * 1024 * 1024,
+    )
+    if table is None:
+        # Don't leave a stale table from an earlier model behind
+        PredictionTable.remove(model_dir)
+        print(f"Prediction grid exceeds {table_max_mb} MB, table not written.")
+    else:
+        table.save(model_dir)
+        print(f"Prediction table saved: shape {table.values.shape}.")
+
+    _write_atomic(model_dir / STATE_FILE, json.dumps({
+        "history_bytes": os.path.getsize(history_path),
+        "history_sha256": history_fingerprint(history_path),
+        "rows": rows,
+        "years": list(years),
+        "trees": len(getattr(model, "estimators_", [])),
+    }))
+    _write_atomic(model_dir / VERSION_FILE, version)
+    print(f"Published model version {version}.")
+    return version
+
+
+class ModelStore:
+    """Holds build(model_dir) and reloads it when MODEL_VERSION changes.
+
+    get() re-checks the version file at most every check_interval seconds
+    and never blocks: a new version is loaded on a background thread and
+    swapped in once complete.
+    """
+
+    def __init__(self, build, model_dir, check_interval: float = 5.0):
+        self.build = build
+        self.model_dir = Path(model_dir)
+        self.check_interval = check_interval
+        self.version = current_version(self.model_dir)
+        self._value = build(self.model_dir)
+        self._next_check = time.monotonic() + check_interval
+        self._lock = threading.Lock()
+
+    def _reload(self, version):
+        try:
+            value = self.build(self.model_dir)
+            # A newer publish may have overwritten files mid-load; retry next check
+            if current_version(self.model_dir) == version:
+                self._value, self.version = value, version
+                print(f"✅ Loaded model version {version}")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not load model version {version} - {e}")
+        finally:
+            self._lock.release()
+
+    def get(self):
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            self._next_check = now + self.check_interval
+            version = current_version(self.model_dir)
+            if version is not None and version != self.version:
+                threading.Thread(target=self._reload, args=(version,), daemon=True).start()
+            else:
+                self._lock.release()
+        return self._value
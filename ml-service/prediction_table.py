@@ -0,0 +1,122 @@
+"""Precomputed predictions over the full discrete feature grid.
+
+Every feature the cutoff model sees is discrete (college, course and
+category codes plus year), so the forest can be evaluated once over the
+cartesian grid and stored as a dense array. PredictionTable answers
+predict() with an array lookup and only calls the live model for rows
+outside the grid (e.g. years the table was not built for).
+"""
+import json
+import os
+
+import numpy as np
+
+TABLE_FILE = "prediction_table.npy"
+META_FILE = "prediction_table.json"
+
+
+def _write_atomic(path, write):
+    """Write path via a synced temp file and rename.
+
+    Serving processes memory-map the table; truncating and rewriting the
+    file they map would fault them (SIGBUS), while a rename leaves them on
+    the old inode until they reload.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class PredictionTable:
+    """Dense (college, course, category, year) -> predicted cutoff grid"""
+
+    def __init__(self, values: np.ndarray, year_min: int, fallback=None):
+        # A plain ndarray view of a mapped table: np.memmap adds per-index overhead
+        self.values = values.view(np.ndarray)
+        self.year_min = year_min
+        self.fallback = fallback
+        self._shape = self.values.shape
+
+    @staticmethod
+    def grid_bytes(n_colleges, n_courses, n_categories, n_years) -> int:
+        return n_colleges * n_courses * n_categories * n_years * np.dtype(np.float64).itemsize
+
+    @classmethod
+    def build(cls, model, n_colleges, n_courses, n_categories, years,
+              max_bytes, chunk_rows=65536):
+        """Evaluate model over the grid, or return None if it exceeds max_bytes"""
+        years = np.arange(min(years), max(years) + 1)
+        shape = (n_colleges, n_courses, n_categories, len(years))
+        if cls.grid_bytes(*shape) > max_bytes:
+            return None
+        grid = np.indices(shape).reshape(4, -1).T
+        X = np.column_stack([grid[:, :3], years[grid[:, 3]]])
+        values = np.empty(len(X))
+        for start in range(0, len(X), chunk_rows):
+            values[start:start + chunk_rows] = model.predict(X[start:start + chunk_rows])
+        return cls(values.reshape(shape), int(years[0]))
+
+    def save(self, model_dir):
+        meta = json.dumps({"year_min": self.year_min, "shape": list(self.values.shape)})
+        _write_atomic(model_dir / TABLE_FILE, lambda f: np.save(f, self.values))
+        _write_atomic(model_dir / META_FILE, lambda f: f.write(meta.encode()))
+
+    @staticmethod
+    def remove(model_dir):
+        # Unlinking is safe for mapped readers: they keep the old inode
+        for name in (TABLE_FILE, META_FILE):
+            (model_dir / name).unlink(missing_ok=True)
+
+    @staticmethod
+    def exists(model_dir) -> bool:
+        return (model_dir / TABLE_FILE).exists() and (model_dir / META_FILE).exists()
+
+    @classmethod
+    def load(cls, model_dir, fallback=None):
+        """Memory-map a saved table read-only"""
+        with open(model_dir / META_FILE) as f:
+            meta = json.load(f)
+        values = np.load(model_dir / TABLE_FILE, mmap_mode="r")
+        if list(values.shape) != meta["shape"]:
+            raise ValueError(f"Prediction table shape {values.shape} does not match metadata")
+        return cls(values, meta["year_min"], fallback)
+
+    def _lookup_one(self, row):
+        """Table value for one feature row, or None if it is outside the grid"""
+        college, course, category, year = row
+        if year != int(year):
+            return None
+        index = (int(college), int(course), int(category), int(year) - self.year_min)
+        for i, size in zip(index, self._shape):
+            if not 0 <= i < size:
+                return None
+        return float(self.values[index])
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if len(X) == 1:
+            # Single-row requests: plain Python indexing, no temporary arrays
+            value = self._lookup_one(X[0].tolist())
+            if value is not None:
+                return np.array([value])
+        codes = X[:, :3].astype(np.intp)
+        year_idx = X[:, 3].astype(np.intp) - self.year_min
+        in_grid = (
+            np.all((codes >= 0) & (codes < self.values.shape[:3]), axis=1)
+            & (year_idx >= 0) & (year_idx < self.values.shape[3])
+            & (X[:, 3] == np.floor(X[:, 3]))
+        )
+        out = np.empty(len(X))
+        hit = np.flatnonzero(in_grid)
+        out[hit] = self.values[codes[hit, 0], codes[hit, 1], codes[hit, 2], year_idx[hit]]
+        miss = np.flatnonzero(~in_grid)
+        if len(miss):
+            if self.fallback is None:
+                raise ValueError("Rows outside the prediction grid and no fallback model")
+            out[miss] = self.fallback.predict(X[miss])
+        return out
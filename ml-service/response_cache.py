@@ -0,0 +1,106 @@
+"""HTTP response cache with ETags for deterministic endpoints.
+
+A cached response is identified by the route, the request body
+(normalized: pydantic dump with sorted keys) and a version string for
+everything the response depends on (dataset and/or model). Since the
+response is a pure function of that key, the ETag is a hash of the key:
+a client revalidating with a matching If-None-Match gets a 304 without
+the response being computed or even looked up. Bodies are kept as
+serialized JSON in a bounded LRU, which is cleared whenever the version
+changes.
+"""
+import hashlib
+import inspect
+import json
+import threading
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from shared.metrics import metrics
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class ResponseCache:
+    """Thread-safe LRU of (route, body, version) -> (etag, JSON bytes)"""
+
+    def __init__(self, max_entries: int = 2048, max_age: int = 60):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _get(self, key, version: str):
+        with self._lock:
+            if version != self._version:
+                # Data or model changed: nothing cached is valid any more
+                self._entries.clear()
+                self._version = version
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def _put(self, key, version: str, body: bytes):
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def respond(self, request: Request, body, version: str, compute) -> Response:
+        """Cached JSON response for body at version, computing it on a miss.
+
+        compute() returns the response content (or an awaitable of it);
+        exceptions such as HTTPException propagate and are not cached.
+        """
+        normalized = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"))
+        key = (request.url.path, normalized)
+        etag = '"' + hashlib.sha256(f"{version}\0{key[0]}\0{normalized}".encode()).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={self.max_age}"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        content = self._get(key, version)
+        if content is None:
+            result = compute()
+            if inspect.isawaitable(result):
+                result = await result
+            with metrics.stage("serialize"):
+                content = json.dumps(jsonable_encoder(result), ensure_ascii=False, allow_nan=False,
+                                     separators=(",", ":")).encode("utf-8")
+            self._put(key, version, content)
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "version": self._version,
+            }
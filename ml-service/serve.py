@@ -0,0 +1,12 @@
+"""Pre-fork server for ml-service (see shared/prefork.py).
+
+    python serve.py --workers 4 --port 8000
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from shared.prefork import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import importlib
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
+
+from model_store import publish_model
+from synthetic_history import synthetic_history
+from training_data import read_history
+
+
+def train(history_path, model_dir, trees: int = 10):
+    """Small forest over history_path, published into model_dir"""
+    X, y, years, (le_college, le_course, le_category) = read_history(history_path)
+    model = RandomForestRegressor(n_estimators=trees, max_depth=8, random_state=0).fit(X, y)
+    return publish_model(model_dir, model, le_college, le_course, le_category, history_path,
+                         rows=len(y), years=years, table_years_ahead=1, table_max_mb=16)
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("app")
+    synthetic_history(3000, 40, seed=9).to_csv(tmp / "cutoff_history.csv", index=False)
+    (tmp / "model").mkdir()
+    train(tmp / "cutoff_history.csv", tmp / "model")
+    os.environ["CUTOFF_HISTORY_PATH"] = str(tmp / "cutoff_history.csv")
+    os.environ["MODEL_DIR"] = str(tmp / "model")
+    return importlib.import_module("app")
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    with TestClient(app.app) as client:
+        yield client
+
+
+def test_batch_matches_single_requests(client):
+    rng = np.random.default_rng(3)
+    requests = [
+        {"college_id": int(college_id), "course": course, "category": category,
+         "year": int(year), "rank": int(rank)}
+        for college_id, course, category, year, rank in zip(
+            rng.integers(0, 45, 40), rng.choice(["CSE", "ECE", "MECH", "XX"], 40),
+            rng.choice(["OC", "BC", "SC"], 40), rng.integers(2020, 2026, 40), rng.integers(100, 50000, 40))
+    ]
+    batch = client.post("/admission-probability/batch", json={"requests": requests}).json()["results"]
+    singles = [client.post("/admission-probability", json=r).json() for r in requests]
+    assert batch == singles
+    assert client.post("/admission-probability/batch", json={"requests": []}).json() == {"results": []}
@@ -0,0 +1,110 @@
+import base64
+import importlib
+import json
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from synthetic_history import synthetic_history
+
+
+@pytest.fixture(scope="module")
+def app_simple(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("history")
+    synthetic_history(5000, 50, seed=7).to_csv(tmp / "cutoff_history.csv", index=False)
+    os.environ["CUTOFF_HISTORY_PATH"] = str(tmp / "cutoff_history.csv")
+    os.environ["CUTOFF_SNAPSHOT_ROOT"] = str(tmp / "snapshots")
+    return importlib.import_module("app_simple")
+
+
+@pytest.fixture(scope="module")
+def client(app_simple):
+    with TestClient(app_simple.app) as client:
+        yield client
+
+
+STUDENT = {"rank": 20000, "course": "CSE", "category": "BC", "year": 2023, "limit": 5}
+
+
+def forged_cursor(app_simple, sort, state):
+    query = [STUDENT["rank"], STUDENT["course"], STUDENT["category"], STUDENT["year"], sort]
+    return app_simple.encode_cursor(query, state)
+
+
+@pytest.mark.parametrize("sort", ["closeness", "cutoff_rank", "probability"])
+def test_pages_cover_every_eligible_college_once(client, sort):
+    body, seen = dict(STUDENT, sort=sort), []
+    while True:
+        page = client.post("/rank-colleges", json=body).json()
+        seen += [(c["name"], c["cutoff_rank"]) for c in page["colleges"]]
+        if not page["next_cursor"]:
+            break
+        body["cursor"] = page["next_cursor"]
+    assert len(seen) == page["total"] == len(set(seen))
+
+
+@pytest.mark.parametrize("sort, state", [
+    ("cutoff_rank", [-5]), ("cutoff_rank", [10**9]), ("cutoff_rank", []),
+    ("probability", [10**9]), ("probability", [-1]), ("probability", [1, 2]),
+    ("closeness", [5]), ("closeness", [10**9, 10**9 + 1]),
+])
+def test_out_of_range_cursor_is_rejected(app_simple, client, sort, state):
+    body = dict(STUDENT, sort=sort, cursor=forged_cursor(app_simple, sort, state))
+    assert client.post("/rank-colleges", json=body).status_code == 400
+
+
+def test_cursor_for_another_query_is_rejected(app_simple, client):
+    cursor = forged_cursor(app_simple, "cutoff_rank", [0])
+    body = dict(STUDENT, sort="cutoff_rank", rank=STUDENT["rank"] + 1, cursor=cursor)
+    assert client.post("/rank-colleges", json=body).status_code == 400
+    garbage = base64.urlsafe_b64encode(json.dumps({"s": [0]}).encode()).decode()
+    body = dict(STUDENT, sort="cutoff_rank", cursor=garbage)
+    assert client.post("/rank-colleges", json=body).status_code == 400
+
+
+def test_batch_matches_single_requests(client):
+    requests = [
+        {"college_id": college_id, "course": course, "category": category, "year": year, "rank": rank}
+        for college_id, course, category, year, rank in [
+            (0, "CSE", "OC", 2023, 5000), (3, "ece", "bc", 2022, 20000), (7, "MECH", "SC", 2021, 40000),
+            (10**6, "CSE", "OC", 2023, 1000), (5, "XX", "OC", 2023, 1000), (12, "IT", "MBC", 1999, 3000),
+        ]
+    ]
+    batch = client.post("/admission-probability/batch", json={"requests": requests}).json()["results"]
+    assert batch == [client.post("/admission-probability", json=r).json() for r in requests]
+
+
+def test_admission_chance_is_a_calibrated_sigmoid(app_simple):
+    chance = app_simple.admission_chance
+    assert chance(10000, 10000, 0.1) == pytest.approx(0.5)
+    # One spread-scaled step either side of the cutoff
+    assert chance(10000, 9000, 0.1) == pytest.approx(1 / (1 + np.exp(-1)))
+    assert chance(10000, 11000, 0.1) == pytest.approx(1 / (1 + np.exp(1)))
+    ranks = np.arange(1, 50000, 250)
+    probs = chance(np.full(len(ranks), 20000), ranks, 0.15)
+    assert np.all(np.diff(probs) < 0)
+    # Vectorized over cutoffs, ranks and spreads alike, matching scalar calls
+    cutoffs, spreads = np.linspace(0, 60000, len(ranks)), np.linspace(0.02, 0.5, len(ranks))
+    np.testing.assert_allclose(chance(cutoffs, ranks, spreads),
+                               [chance(c, r, s) for c, r, s in zip(cutoffs, ranks, spreads)])
+    # Extreme gaps saturate without warnings; a zero cutoff still has a scale of 1
+    with np.errstate(all="raise"):
+        assert chance(1, 10**9, 0.1) == 0.0
+        # A rank far inside the cutoff is capped by the spread: 1 / (1 + e^-10)
+        assert chance(10**9, 1, 0.1) == pytest.approx(1 / (1 + np.exp(-10)))
+        assert chance(0, 1, 0.1) == pytest.approx(1 / (1 + np.e))
+
+
+def test_probabilities_are_deterministic(app_simple, client):
+    body = {"college_id": 4, "course": "CSE", "category": "OC", "year": 2023, "rank": 9000}
+    first = client.post("/admission-probability", json=body).json()
+    assert all(client.post("/admission-probability", json=body).json() == first for _ in range(5))
+    # Uncached: the banded recommendations are scored the same way every time
+    runs = [app_simple.get_matching_colleges(9000, "CSE", "OC", 2023) for _ in range(3)]
+    assert runs[0] and runs[0] == runs[1] == runs[2]
+    for college in runs[0]:
+        spread = app_simple.cutoff_spread("CSE", "OC")
+        assert college["probability"] == round(float(app_simple.admission_chance(
+            college["cutoff_rank"], 9000, spread)), 2)
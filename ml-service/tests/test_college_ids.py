@@ -0,0 +1,57 @@
+import pandas as pd
+
+from cutoff_index import CutoffIndex
+from cutoff_snapshot import Snapshot, write_snapshot
+from history_index import TrendIndex
+from shared.college_ids import CollegeIds
+from synthetic_history import synthetic_history
+
+
+def test_seeded_ids_are_sorted_positions_and_new_names_append(tmp_path):
+    registry = CollegeIds(tmp_path / "college_ids.csv")
+    assert registry.register(["KONGU", "ANNA", None, " ", "PSG"]) == {"KONGU": 1, "ANNA": 0, "PSG": 2}
+    assert registry.register(["PSG", "ZION", "AAA"]) == {"PSG": 2, "ZION": 4, "AAA": 3}
+    assert CollegeIds(tmp_path / "college_ids.csv").ids() == {
+        "ANNA": 0, "KONGU": 1, "PSG": 2, "AAA": 3, "ZION": 4}
+
+
+def test_processes_with_stale_views_never_reuse_an_id(tmp_path):
+    first = CollegeIds(tmp_path / "college_ids.csv")
+    second = CollegeIds(tmp_path / "college_ids.csv")
+    first.register(["ANNA"])
+    second.ids()
+    first.register(["KONGU"])
+    assert second.register(["PSG"]) == {"PSG": 2}
+    assert first.ids() == second.ids() == {"ANNA": 0, "KONGU": 1, "PSG": 2}
+
+
+def test_refresh_with_new_colleges_keeps_every_id(tmp_path):
+    history_path = tmp_path / "cutoff_history.csv"
+    ids_path = tmp_path / "college_ids.csv"
+    df = synthetic_history(3000, 40, seed=5)
+    old = df[df["year"] < 2023]
+    old.to_csv(history_path, index=False)
+    trends = TrendIndex(history_path, ids_path)
+    trends.groups()
+    before = CollegeIds(ids_path).ids()
+
+    # 2023 rows arrive, including two colleges that sort before all others
+    new_rows = df[df["year"] == 2023].head(2).assign(Name=["AA COLLEGE", "AAB COLLEGE"])
+    pd.concat([df, new_rows]).to_csv(history_path, index=False)
+    refreshed = pd.read_csv(history_path)
+    index = CutoffIndex.from_frame(refreshed, CollegeIds(ids_path).register(refreshed["Name"].unique()))
+    snapshot_index = CutoffIndex.from_snapshot(
+        Snapshot(tmp_path / "snapshots" / write_snapshot(refreshed, tmp_path / "snapshots", ids_path=ids_path)))
+
+    after = CollegeIds(ids_path).ids()
+    assert {name: after[name] for name in before} == before
+    assert sorted(after[name] for name in ("AA COLLEGE", "AAB COLLEGE")) == [len(before), len(before) + 1]
+    for name, college_id in list(after.items())[::7] + [("AA COLLEGE", after["AA COLLEGE"])]:
+        assert index.colleges.name(college_id) == snapshot_index.colleges.name(college_id) == name
+        row = refreshed[refreshed["Name"] == name].iloc[0]
+        expected = int(row["cutoff_rank"])
+        assert index.college_cutoff(college_id, row["course"], row["category"], row["year"]) == expected
+        assert snapshot_index.college_cutoff(college_id, row["course"], row["category"], row["year"]) == expected
+        # /trends (TrendIndex) and /predict-cutoff (CutoffIndex) see the same college
+        assert {(r["year"], r["category"], r["cutoff_rank"]) for r in trends.trends(college_id, row["course"])} == {
+            (r["year"], r["category"], r["cutoff_rank"]) for r in index.college_history(college_id, row["course"])}
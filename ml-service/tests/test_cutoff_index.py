@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cutoff_index import DEFAULT_SPREAD, SPREAD_BOUNDS, CutoffIndex
+from cutoff_snapshot import Snapshot, write_snapshot
+from synthetic_history import synthetic_history
+
+
+@pytest.fixture(scope="module")
+def history():
+    df = synthetic_history(4000, 60, seed=11).sample(frac=1.0, random_state=1)
+    # Repeat some rows with other ranks: point lookups must keep the first CSV row
+    return pd.concat([df, df.head(300).assign(cutoff_rank=1)], ignore_index=True)
+
+
+@pytest.fixture(scope="module", params=["frame", "snapshot"])
+def index(request, history, tmp_path_factory):
+    if request.param == "frame":
+        return CutoffIndex.from_frame(history)
+    root = tmp_path_factory.mktemp("snapshots")
+    return CutoffIndex.from_snapshot(Snapshot(root / write_snapshot(history, root)))
+
+
+def filtered(df, course, category, year):
+    return df[(df["course"] == course) & (df["category"] == category) & (df["year"] == year)]
+
+
+def test_point_lookups_match_the_first_filtered_row(history, index):
+    for row in history.sample(200, random_state=2).itertuples(index=False):
+        college_id = index.colleges.college_id(row.Name)
+        matches = filtered(history, row.course, row.category, row.year)
+        expected = int(matches[matches["Name"] == row.Name].iloc[0]["cutoff_rank"])
+        assert index.college_cutoff(college_id, row.course, row.category, row.year) == expected
+    assert index.college_cutoff(0, "CSE", "OC", 1999) is None
+    assert index.college_cutoff(10**6, "CSE", "OC", 2023) is None
+
+
+def test_partitions_hold_exactly_the_filtered_rows(history, index):
+    for (course, category, year), rows in history.groupby(["course", "category", "year"]):
+        partition = index.partition(course, category, year)
+        np.testing.assert_array_equal(partition.ranks, np.sort(rows["cutoff_rank"].to_numpy()))
+        records = [index.record(partition.start + pos) for pos in range(len(partition))]
+        assert sorted((r["name"], r["cutoff_rank"]) for r in records) == sorted(
+            zip(rows["Name"], rows["cutoff_rank"]))
+    assert index.partition("CSE", "XX", 2023) is None
+
+
+def test_college_history_matches_the_filtered_rows(history, index):
+    for name in history["Name"].drop_duplicates().head(20):
+        rows = history[(history["Name"] == name) & (history["course"] == "CSE")]
+        expected = sorted(zip(rows["year"], rows["category"], rows["cutoff_rank"]))
+        records = index.college_history(index.colleges.college_id(name), "CSE")
+        assert sorted((r["year"], r["category"], r["cutoff_rank"]) for r in records) == expected
+
+
+BANDS = {"Safe": (1.2, None), "Target": (0.95, 1.2), "Dream": (0.7, 0.95)}
+
+
+@pytest.mark.parametrize("rank", [500, 4000, 15000, 40000])
+def test_bands_and_nearest_match_the_filter_masks(history, index, rank):
+    for (course, category, year), rows in history.groupby(["course", "category", "year"]):
+        partition = index.partition(course, category, year)
+        dream_lo, target_lo, safe_lo = partition.band_bounds([rank * 0.7, rank * 0.95, rank * 1.2])
+        bounds = {"Safe": (safe_lo, len(partition)), "Target": (target_lo, safe_lo), "Dream": (dream_lo, target_lo)}
+        for status, (low, high) in BANDS.items():
+            mask = rows["cutoff_rank"] >= rank * low
+            if high is not None:
+                mask &= rows["cutoff_rank"] < rank * high
+            band = np.sort(rows.loc[mask, "cutoff_rank"].to_numpy())
+            lo, hi = bounds[status]
+            np.testing.assert_array_equal(partition.ranks[lo:hi], band)
+            # nearest: the 5 cutoffs of the band closest to rank, closest first
+            picked = partition.ranks[partition.nearest(rank, lo, hi, 5)]
+            distances = np.abs(picked.astype(np.int64) - rank)
+            assert list(distances) == sorted(distances)
+            np.testing.assert_array_equal(distances, np.sort(np.abs(band.astype(np.int64) - rank))[:5])
+
+
+def spread_keys(groups):
+    """keys frame for _fit_spreads: {(course, category): [per-college rank lists]}"""
+    rows = []
+    for (course, category), colleges in groups.items():
+        for name, ranks in enumerate(colleges):
+            rows += [{"name": name, "course": course, "category": category, "rank": rank} for rank in ranks]
+    return pd.DataFrame(rows)
+
+
+def test_fit_spreads_pools_relative_variation_per_group():
+    # Group (0, 0): 6 colleges each varying by std/mean = 0.1; (1, 0): 0.3
+    steady = [[1000 * (i + 1) * f for f in (0.9, 1.0, 1.1)] for i in range(6)]
+    volatile = [[1000 * (i + 1) * f for f in (0.7, 1.0, 1.3)] for i in range(6)]
+    spreads, overall = CutoffIndex._fit_spreads(spread_keys({(0, 0): steady, (1, 0): volatile}))
+    assert spreads[(0, 0)] == pytest.approx(0.1)
+    assert spreads[(1, 0)] == pytest.approx(0.3)
+    assert overall == pytest.approx(np.sqrt((0.1 ** 2 + 0.3 ** 2) / 2))
+
+
+def test_fit_spreads_falls_back_and_clips():
+    few = [[1000, 1100], [2000, 2200]]
+    single_year = [[1000]] * 10
+    wild = [[100 * (i + 1), 10000 * (i + 1)] for i in range(6)]
+    flat = [[1000 * (i + 1)] * 3 for i in range(6)]
+    spreads, overall = CutoffIndex._fit_spreads(spread_keys({(0, 0): few, (0, 1): single_year}))
+    # Too few multi-year colleges anywhere: no per-group spreads, default overall
+    assert spreads == {} and overall == DEFAULT_SPREAD
+    spreads, overall = CutoffIndex._fit_spreads(spread_keys({(0, 0): wild, (1, 1): flat, (2, 2): few}))
+    low, high = SPREAD_BOUNDS
+    assert spreads[(0, 0)] == high and spreads[(1, 1)] == low
+    assert (2, 2) not in spreads
+    assert low <= overall <= high
+
+
+def test_index_uses_group_spread_or_the_overall_one(index):
+    for course, category in [("CSE", "OC"), ("CIVIL", "ST")]:
+        assert SPREAD_BOUNDS[0] <= index.cutoff_spread(course, category) <= SPREAD_BOUNDS[1]
+    assert index.cutoff_spread("XX", "OC") == index.default_spread
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cutoff_snapshot import Snapshot, SnapshotStore, current_version, write_snapshot
+from synthetic_history import synthetic_history
+
+
+def test_snapshot_round_trips_the_frame(tmp_path):
+    df = synthetic_history(500, 20, seed=3)
+    version = write_snapshot(df, root=tmp_path)
+    snapshot = Snapshot(tmp_path / version)
+    frame = snapshot.to_frame()
+    # Rows are partition-sorted; source_row points back at the CSV order
+    restored = frame.iloc[np.argsort(snapshot.values("source_row"))].reset_index(drop=True)
+    expected = df[["Name", "course", "category", "year", "cutoff_rank"]]
+    pd.testing.assert_frame_equal(restored.astype({c: str for c in ("Name", "course", "category")}),
+                                  expected, check_dtype=False)
+    keys = frame[["course", "category", "year", "cutoff_rank"]].astype({"course": str, "category": str})
+    assert keys.equals(keys.sort_values(list(keys.columns), kind="stable"))
+
+
+def test_current_pointer_moves_and_old_snapshots_are_pruned(tmp_path):
+    df = synthetic_history(50, 5, seed=3)
+    versions = [write_snapshot(df, root=tmp_path, keep=2) for _ in range(4)]
+    assert current_version(tmp_path) == versions[-1]
+    published = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+    assert published == versions[-2:]
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+
+def wait_for(store, value, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while store.get() != value and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return store.get()
+
+
+def test_store_swaps_to_new_snapshot_and_survives_a_broken_one(tmp_path):
+    assert current_version(tmp_path) is None
+    store = SnapshotStore(len, root=tmp_path, check_interval=0)
+    assert store.get() is None
+
+    write_snapshot(synthetic_history(30, 5, seed=3), root=tmp_path)
+    assert wait_for(store, 30) == 30
+    write_snapshot(synthetic_history(40, 5, seed=3), root=tmp_path)
+    assert wait_for(store, 40) == 40
+
+    good = store.version
+    broken = write_snapshot(synthetic_history(50, 5, seed=3), root=tmp_path)
+    (tmp_path / broken / "year.npy").unlink()
+    store.get()
+    time.sleep(0.1)
+    assert store.get() == 40 and store.version == good
+
+
+def test_store_builds_new_snapshots_off_the_calling_thread(tmp_path):
+    write_snapshot(synthetic_history(30, 5, seed=3), root=tmp_path)
+    release = threading.Event()
+
+    def slow_build(snapshot):
+        if len(snapshot) != 30:
+            release.wait(5)
+        return len(snapshot)
+
+    store = SnapshotStore(slow_build, root=tmp_path, check_interval=0)
+    assert store.get() == 30
+    write_snapshot(synthetic_history(40, 5, seed=3), root=tmp_path)
+    start = time.monotonic()
+    assert store.get() == 30  # build started in the background, old value served
+    assert time.monotonic() - start < 1
+    release.set()
+    assert wait_for(store, 40) == 40
@@ -0,0 +1,29 @@
+import numpy as np
+
+from shared.college_ids import CollegeIds
+from shared.college_search import CollegeSearch
+from encoding import EncoderLookup
+from training_data import IncrementalEncoder
+
+
+def test_college_ids_map_to_codes_after_refresh_appends(tmp_path):
+    # Refresh keeps existing codes and appends new colleges, so codes are not sorted
+    registry = CollegeIds(tmp_path / "college_ids.csv")
+    encoder = IncrementalEncoder(["PSG COLLEGE", "ANNA UNIVERSITY", "KONGU COLLEGE"])
+    registry.register(encoder.classes)
+    encoder.fit_transform(np.array(["BANNARI AMMAN", "ZION COLLEGE", "PSG COLLEGE"], dtype=object))
+    classes = encoder.classes
+    ids = registry.register(classes)
+    lookup = EncoderLookup.by_ids(classes, ids)
+    search = CollegeSearch(classes, ids=ids)
+    for college_id in ids.values():
+        assert classes[lookup.encode(college_id)] == search.name(college_id)
+    np.testing.assert_array_equal(classes[lookup.encode_array(search.ids)], search.names)
+    assert lookup.encode(len(search)) == 0
+
+
+def test_value_lookup_falls_back_for_unseen():
+    lookup = EncoderLookup(np.array(["BC", "OC", "SC"]), fallback=1)
+    assert lookup.encode("SC") == 2
+    assert lookup.encode("XX") == 1
+    np.testing.assert_array_equal(lookup.encode_array(["OC", "XX", "BC"]), [1, 1, 0])
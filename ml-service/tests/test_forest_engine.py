@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_engine import FlatForest
+
+
+def training_data(rng, n=400):
+    X = np.column_stack([rng.integers(60, size=n), rng.integers(6, size=n),
+                         rng.integers(5, size=n), rng.integers(2018, 2024, size=n)]).astype(np.float32)
+    y = 1000 + 300 * X[:, 0] + 2000 * X[:, 1] - 1500 * X[:, 2] + rng.normal(0, 500, n)
+    return X, y
+
+
+@pytest.mark.parametrize("params", [
+    {"n_estimators": 1},
+    {"n_estimators": 20},
+    {"n_estimators": 15, "max_depth": 3},
+    {"n_estimators": 15, "min_samples_leaf": 7, "max_samples": 0.5},
+])
+def test_predictions_match_sklearn(params):
+    rng = np.random.default_rng(4)
+    X, y = training_data(rng)
+    model = RandomForestRegressor(random_state=0, **params).fit(X, y)
+    flat = FlatForest.from_sklearn(model)
+    # Seen rows, unseen codes and years outside the training range
+    queries = np.vstack([X, np.column_stack([rng.integers(-5, 80, 200), rng.integers(-1, 8, 200),
+                                             rng.integers(-1, 7, 200), rng.integers(2010, 2030, 200)])])
+    np.testing.assert_allclose(flat.predict(queries), model.predict(queries), rtol=1e-12)
+
+
+def test_rows_on_split_thresholds_go_the_same_way():
+    rng = np.random.default_rng(5)
+    X, y = training_data(rng)
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    flat = FlatForest.from_sklearn(model)
+    # Every feature value sitting exactly on (or a float32 step from) a threshold
+    thresholds = np.unique(flat.threshold[flat.threshold > -2])
+    queries = np.repeat(X[:len(thresholds)], 3, axis=0)
+    for feature in range(X.shape[1]):
+        probes = np.concatenate([np.nextafter(thresholds.astype(np.float32), -np.inf),
+                                 thresholds.astype(np.float32),
+                                 np.nextafter(thresholds.astype(np.float32), np.inf)])
+        rows = queries.copy()
+        rows[:, feature] = probes[:len(rows)]
+        np.testing.assert_allclose(flat.predict(rows), model.predict(rows), rtol=1e-12)
+
+
+def test_single_row_and_grown_forest():
+    rng = np.random.default_rng(6)
+    X, y = training_data(rng)
+    model = RandomForestRegressor(n_estimators=5, random_state=0, warm_start=True).fit(X, y)
+    model.set_params(n_estimators=12)
+    model.fit(*training_data(rng))
+    flat = FlatForest.from_sklearn(model)
+    assert flat.n_estimators == 12
+    assert flat.predict(X[0].tolist()).shape == (1,)
+    np.testing.assert_allclose(flat.predict(X[0].tolist()), model.predict(X[:1]), rtol=1e-12)
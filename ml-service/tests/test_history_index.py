@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+from history_index import TrendIndex
+from shared.college_ids import CollegeIds
+from synthetic_history import synthetic_history
+
+
+def expected_trends(df, name, course, years=None):
+    rows = df[(df["Name"] == name) & (df["course"] == course)]
+    if years:
+        rows = rows[rows["year"].isin(years)]
+    return rows[["year", "category", "cutoff_rank"]].to_dict(orient="records")
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = tmp_path / "cutoff_history.csv"
+    df = synthetic_history(2000, 30, seed=8)
+    df[df["year"] < 2023].to_csv(path, index=False)
+    return path, df
+
+
+def test_trends_match_the_filtered_csv(history, tmp_path):
+    path, df = history
+    index = TrendIndex(path, tmp_path / "college_ids.csv")
+    old = df[df["year"] < 2023]
+    ids = CollegeIds(tmp_path / "college_ids.csv").register(old["Name"].unique())
+    for name in old["Name"].drop_duplicates().head(10):
+        assert index.trends(ids[name], "CSE") == expected_trends(old, name, "CSE")
+        assert index.trends(ids[name], "CSE", [2021]) == expected_trends(old, name, "CSE", [2021])
+    assert index.trends(10**6, "CSE") == []
+
+
+def test_reloads_only_when_the_file_changes(history, tmp_path, monkeypatch):
+    path, df = history
+    index = TrendIndex(path, tmp_path / "college_ids.csv")
+    loads = []
+    real_load = index._load
+    monkeypatch.setattr(index, "_load", lambda: loads.append(1) or real_load())
+    name = df["Name"].iloc[0]
+    college_id = CollegeIds(tmp_path / "college_ids.csv").register([name])[name]
+    before = index.trends(college_id, "CSE")
+    version = index.version()
+    for _ in range(5):
+        assert index.trends(college_id, "CSE") == before
+    assert len(loads) == 1
+
+    # The 2023 rows are appended; a new mtime/size triggers one reload
+    df.to_csv(path, index=False)
+    os.utime(path, ns=(1, 1))
+    assert index.version() != version
+    assert index.trends(college_id, "CSE") == expected_trends(df, name, "CSE")
+    assert index.trends(college_id, "CSE") != before
+    assert len(loads) == 2
+
+
+def test_missing_file(tmp_path):
+    index = TrendIndex(tmp_path / "missing.csv", tmp_path / "college_ids.csv")
+    assert index.version() == "missing"
+    with pytest.raises(FileNotFoundError):
+        index.trends(0, "CSE")
+
+
+def test_histories_with_a_college_id_column_use_it(tmp_path):
+    path = tmp_path / "cutoff_history.csv"
+    df = pd.DataFrame({"college_id": [7, 7, 9], "course": ["CSE", "CSE", "ECE"], "category": ["OC", "BC", "OC"],
+                       "year": [2022, 2023, 2023], "cutoff_rank": [100, 200, 300]})
+    df.to_csv(path, index=False)
+    index = TrendIndex(path, tmp_path / "college_ids.csv")
+    assert [r["cutoff_rank"] for r in index.trends(7, "CSE")] == [100, 200]
+    assert not (tmp_path / "college_ids.csv").exists()
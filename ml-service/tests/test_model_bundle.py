@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_engine import FlatForest
+from model_bundle import ModelBundle
+
+CLASSES = {"college": np.array(["A", "B", "C"]), "course": np.array(["CSE", "ECE"]),
+           "category": np.array(["BC", "OC"])}
+
+
+@pytest.fixture
+def forest():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(3, size=200), rng.integers(2, size=200),
+                         rng.integers(2, size=200), rng.integers(2020, 2024, size=200)])
+    y = rng.integers(1000, 50000, size=200)
+    return RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y), X
+
+
+def test_round_trip_matches_sklearn(tmp_path, forest):
+    model, X = forest
+    flat = FlatForest.from_sklearn(model)
+    ModelBundle.write(tmp_path / "m.bundle", flat, CLASSES, "v1")
+    bundle = ModelBundle.load(tmp_path / "m.bundle", expected_version="v1")
+    np.testing.assert_allclose(bundle.forest.predict(X), model.predict(X))
+    assert bundle.classes["college"].tolist() == ["A", "B", "C"]
+
+
+def test_loaded_arrays_are_plain_intp_indices(tmp_path, forest):
+    ModelBundle.write(tmp_path / "m.bundle", FlatForest.from_sklearn(forest[0]), CLASSES, "v1")
+    loaded = ModelBundle.load(tmp_path / "m.bundle").forest
+    for name in ("feature", "left", "right", "roots"):
+        array = getattr(loaded, name)
+        assert type(array) is np.ndarray and array.dtype == np.intp
+    assert type(loaded.threshold) is np.ndarray and type(loaded.value) is np.ndarray
+
+
+def test_rejects_corrupt_and_mismatched_bundles(tmp_path, forest):
+    path = tmp_path / "m.bundle"
+    ModelBundle.write(path, FlatForest.from_sklearn(forest[0]), CLASSES, "v1")
+    with pytest.raises(ValueError, match="version"):
+        ModelBundle.load(path, expected_version="v2")
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="checksum"):
+        ModelBundle.load(path)
+
+    path.write_bytes(bytes(data[:-8]))
+    with pytest.raises(ValueError, match="truncated"):
+        ModelBundle.load(path)
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+import model_refresh
+from encoding import EncoderLookup
+from model_store import ModelStore, current_version, history_status, publish_model
+from shared.college_ids import CollegeIds
+from synthetic_history import synthetic_history
+from training_data import read_history
+
+
+def publish(history_path, model_dir, trees: int = 5):
+    X, y, years, (le_college, le_course, le_category) = read_history(history_path)
+    model = RandomForestRegressor(n_estimators=trees, max_depth=6, random_state=0).fit(X, y)
+    return publish_model(model_dir, model, le_college, le_course, le_category, history_path,
+                         rows=len(y), years=years, table_years_ahead=1, table_max_mb=16)
+
+
+def wait_for(store, version, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while store.get()[0] != version and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return store.get()[0]
+
+
+def test_store_swaps_model_and_encoders_together(tmp_path):
+    history = tmp_path / "cutoff_history.csv"
+    synthetic_history(800, 20, seed=2).to_csv(history, index=False)
+    first = publish(history, tmp_path)
+    release = threading.Event()
+
+    def build(model_dir):
+        if current_version(model_dir) != first:
+            release.wait(5)
+        return current_version(model_dir), joblib.load(model_dir / "le_college.pkl").classes_
+
+    store = ModelStore(build, tmp_path, check_interval=0)
+    assert store.get()[0] == first
+    synthetic_history(900, 25, seed=3).to_csv(history, index=False)
+    second = publish(history, tmp_path)
+    # The new version loads in the background; requests keep the old pair meanwhile
+    assert store.get()[0] == first
+    release.set()
+    assert wait_for(store, second) == second
+    assert store.version == second and len(store.get()[1]) == 25
+
+
+def test_failed_load_keeps_the_current_model(tmp_path):
+    history = tmp_path / "cutoff_history.csv"
+    synthetic_history(500, 10, seed=2).to_csv(history, index=False)
+    first = publish(history, tmp_path)
+
+    def build(model_dir):
+        if current_version(model_dir) != first:
+            raise ValueError("corrupt")
+        return current_version(model_dir), None
+
+    store = ModelStore(build, tmp_path, check_interval=0)
+    publish(history, tmp_path)
+    for _ in range(20):
+        assert store.get()[0] == first
+        time.sleep(0.01)
+
+
+def test_refresh_appends_encoders_and_grows_the_forest(tmp_path, monkeypatch):
+    df = synthetic_history(2000, 30, seed=4)
+    history = tmp_path / "cutoff_history.csv"
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    df[df["year"] < 2023].to_csv(history, index=False)
+    publish(history, model_dir)
+    old_classes = joblib.load(model_dir / "le_college.pkl").classes_
+    ids = CollegeIds(tmp_path / "college_ids.csv")
+    ids.register(old_classes)
+    monkeypatch.setenv("COLLEGE_IDS_PATH", str(tmp_path / "college_ids.csv"))
+    monkeypatch.setattr(model_refresh, "DATA_PATH", history)
+    monkeypatch.setattr(model_refresh, "MODEL_DIR", model_dir)
+    monkeypatch.setattr(model_refresh, "REFRESH_TREES", 3)
+    monkeypatch.setattr(model_refresh, "TRAIN_JOBS", 1)
+    assert model_refresh.main() == 0  # nothing new yet
+
+    # 2023 rows are appended, with a college that sorts before every other one
+    new_rows = df[df["year"] == 2023].assign(Name=lambda d: d["Name"].where(d.index % 10 > 0, "AA COLLEGE"))
+    with open(history, "a") as f:
+        new_rows.to_csv(f, header=False, index=False)
+    before = ids.ids()
+    old_version = current_version(model_dir)
+    assert history_status(model_dir, history) == "appended"
+    assert model_refresh.main() == 0
+
+    assert current_version(model_dir) != old_version
+    assert history_status(model_dir, history) == "unchanged"
+    classes = joblib.load(model_dir / "le_college.pkl").classes_
+    np.testing.assert_array_equal(classes[:len(old_classes)], old_classes)
+    assert classes[-1] == "AA COLLEGE"
+    assert len(joblib.load(model_dir / "cutoff_model.pkl").estimators_) == 8
+    # Existing college ids are unchanged and the new one maps to its appended code
+    after = ids.ids()
+    assert {name: after[name] for name in before} == before
+    lookup = EncoderLookup.by_ids(classes, after)
+    assert lookup.encode(after["AA COLLEGE"]) == len(classes) - 1
+    for name in old_classes[:5]:
+        assert classes[lookup.encode(after[name])] == name
+
+
+def test_rewritten_history_needs_a_full_retrain(tmp_path, monkeypatch):
+    history = tmp_path / "cutoff_history.csv"
+    synthetic_history(500, 10, seed=2).to_csv(history, index=False)
+    publish(history, tmp_path)
+    pd.read_csv(history).iloc[::-1].to_csv(history, index=False)
+    monkeypatch.setattr(model_refresh, "DATA_PATH", history)
+    monkeypatch.setattr(model_refresh, "MODEL_DIR", tmp_path)
+    assert model_refresh.main() == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from prediction_table import PredictionTable
+
+
+class Constant:
+    def predict(self, X):
+        return np.full(len(X), -1.0)
+
+
+@pytest.fixture
+def table():
+    values = np.arange(3 * 2 * 2 * 4, dtype=np.float64).reshape(3, 2, 2, 4)
+    return PredictionTable(values, 2020, fallback=Constant())
+
+
+def test_single_row_matches_batch_lookup(table):
+    rows = [[c, co, ca, y] for c in range(3) for co in range(2) for ca in range(2) for y in range(2020, 2024)]
+    batch = table.predict(np.array(rows + [[0, 0, 0, 2030]]))
+    single = [table.predict(np.array([row]))[0] for row in rows]
+    np.testing.assert_array_equal(batch[:-1], single)
+    assert batch[-1] == -1.0
+
+
+@pytest.mark.parametrize("row", [[3, 0, 0, 2020], [0, 0, 0, 2019], [0, 0, 0, 2024], [-1, 0, 0, 2020],
+                                 [0, 0, 0, 2020.5]])
+def test_rows_outside_grid_use_fallback(table, row):
+    assert table.predict(np.array([row]))[0] == -1.0
+
+
+def test_saved_table_round_trips(tmp_path, table):
+    table.save(tmp_path)
+    loaded = PredictionTable.load(tmp_path)
+    assert type(loaded.values) is np.ndarray
+    np.testing.assert_array_equal(loaded.predict([1, 1, 0, 2022]), [table.values[1, 1, 0, 2]])
+
+
+def test_republish_leaves_mapped_table_intact(tmp_path, table):
+    table.save(tmp_path)
+    serving = PredictionTable.load(tmp_path)
+    PredictionTable(np.zeros((1, 1, 1, 1)), 2024).save(tmp_path)
+    # The old mapping still reads the old file, the new load sees the new one
+    np.testing.assert_array_equal(serving.values, table.values)
+    assert PredictionTable.load(tmp_path).values.shape == (1, 1, 1, 1)
+    PredictionTable.remove(tmp_path)
+    np.testing.assert_array_equal(serving.values, table.values)
+    assert not PredictionTable.exists(tmp_path)
+    assert not list(tmp_path.glob(".*.tmp"))
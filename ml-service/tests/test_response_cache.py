@@ -0,0 +1,66 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+import pytest
+
+from response_cache import ResponseCache, etag_matches
+
+
+@pytest.fixture
+def served():
+    app, cache, state = FastAPI(), ResponseCache(max_entries=2), {"version": "v1", "calls": 0}
+
+    @app.post("/echo")
+    async def echo(body: dict, request: Request):
+        def compute():
+            state["calls"] += 1
+            if body.get("fail"):
+                raise HTTPException(status_code=404, detail="no such thing")
+            return {"echo": body, "version": state["version"]}
+        return await cache.respond(request, body, state["version"], compute)
+
+    return TestClient(app), cache, state
+
+
+def test_repeat_request_is_served_from_cache(served):
+    client, cache, state = served
+    first = client.post("/echo", json={"a": 1, "b": 2})
+    second = client.post("/echo", json={"b": 2, "a": 1})
+    assert first.json() == second.json() == {"echo": {"a": 1, "b": 2}, "version": "v1"}
+    assert first.headers["etag"] == second.headers["etag"]
+    assert state["calls"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_matching_if_none_match_gets_304_without_compute(served):
+    client, cache, state = served
+    etag = client.post("/echo", json={"a": 1}).headers["etag"]
+    response = client.post("/echo", json={"a": 1}, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["etag"] == etag
+    assert state["calls"] == 1 and cache.stats()["not_modified"] == 1
+
+
+def test_new_version_changes_etag_and_drops_entries(served):
+    client, cache, state = served
+    etag = client.post("/echo", json={"a": 1}).headers["etag"]
+    state["version"] = "v2"
+    response = client.post("/echo", json={"a": 1}, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["version"] == "v2"
+    assert response.headers["etag"] != etag
+    assert state["calls"] == 2 and cache.stats()["size"] == 1
+
+
+def test_errors_are_not_cached_and_lru_is_bounded(served):
+    client, cache, state = served
+    assert client.post("/echo", json={"fail": True}).status_code == 404
+    assert client.post("/echo", json={"fail": True}).status_code == 404
+    assert state["calls"] == 2
+    for i in range(5):
+        client.post("/echo", json={"i": i})
+    assert cache.stats()["size"] == 2
+
+
+def test_etag_matching():
+    assert etag_matches('"x", "y"', '"y"')
+    assert etag_matches("*", '"y"')
+    assert not etag_matches(None, '"y"')
+    assert not etag_matches('"x"', '"y"')
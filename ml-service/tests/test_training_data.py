@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from synthetic_history import synthetic_history
+from training_data import IncrementalEncoder, college_key, read_history
+
+
+def label_encoded(df, key):
+    """Features, target and encoders the way train_model.py used to build them"""
+    encoders = [LabelEncoder() for _ in range(3)]
+    X = np.column_stack([
+        encoders[0].fit_transform(df[key]), encoders[1].fit_transform(df["course"]),
+        encoders[2].fit_transform(df["category"]), df["year"],
+    ]).astype(np.float32)
+    return X, df["cutoff_rank"].to_numpy(dtype=np.float64), encoders
+
+
+@pytest.fixture
+def history(tmp_path):
+    df = synthetic_history(3000, 40, seed=21)
+    df.to_csv(tmp_path / "names.csv", index=False)
+    ids = df.assign(college_id=pd.factorize(df["Name"])[0] * 7 + 3).drop(columns=["Name"])
+    ids.to_csv(tmp_path / "ids.csv", index=False)
+    return tmp_path, df, ids
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000, 10**6])
+@pytest.mark.parametrize("source", ["names", "ids"])
+def test_chunked_read_matches_one_shot_encoding(history, chunk_rows, source):
+    tmp_path, names_df, ids_df = history
+    path = tmp_path / f"{source}.csv"
+    if chunk_rows == 1:
+        # One row per chunk over the whole file is slow; a prefix shows the same thing
+        pd.read_csv(path).head(300).to_csv(path, index=False)
+    df = pd.read_csv(path)
+    key = college_key(path)
+    assert key == ("Name" if source == "names" else "college_id")
+    X, y, years, encoders = read_history(path, chunk_rows=chunk_rows)
+    X_ref, y_ref, encoders_ref = label_encoded(df, key)
+    np.testing.assert_array_equal(X, X_ref)
+    np.testing.assert_array_equal(y, y_ref)
+    assert years == (df["year"].min(), df["year"].max())
+    for encoder, reference in zip(encoders, encoders_ref):
+        np.testing.assert_array_equal(encoder.classes_, reference.classes_)
+
+
+def test_extending_classes_keeps_codes_and_appends_new_values(history):
+    tmp_path, df, _ = history
+    old = df[df["year"] < 2023]
+    old.to_csv(tmp_path / "old.csv", index=False)
+    _, _, _, old_encoders = read_history(tmp_path / "old.csv", chunk_rows=500)
+
+    # Refresh: new rows, including a new college and a new course
+    new_rows = df[df["year"] == 2023].head(50).assign(Name="AAA NEW COLLEGE", course="AERO")
+    full = pd.concat([df, new_rows])
+    full.to_csv(tmp_path / "full.csv", index=False)
+    X, y, years, encoders = read_history(tmp_path / "full.csv", chunk_rows=500,
+                                         classes=[e.classes_ for e in old_encoders])
+    for encoder, old_encoder in zip(encoders, old_encoders):
+        n = len(old_encoder.classes_)
+        np.testing.assert_array_equal(encoder.classes_[:n], old_encoder.classes_)
+    assert encoders[0].classes_[-1] == "AAA NEW COLLEGE"
+    assert encoders[1].classes_[-1] == "AERO"
+    # Every row decodes back to its own values
+    decoded = pd.DataFrame({
+        "Name": encoders[0].classes_[X[:, 0].astype(int)],
+        "course": encoders[1].classes_[X[:, 1].astype(int)],
+        "category": encoders[2].classes_[X[:, 2].astype(int)],
+    })
+    pd.testing.assert_frame_equal(decoded, full[["Name", "course", "category"]].reset_index(drop=True))
+    assert years == (2020, 2023) and len(y) == len(full)
+
+
+def test_incremental_encoder_codes_follow_first_appearance():
+    encoder = IncrementalEncoder(["B"])
+    np.testing.assert_array_equal(encoder.fit_transform(pd.Series(["C", "B", "A", "C"])), [1, 0, 2, 1])
+    np.testing.assert_array_equal(encoder.fit_transform(pd.Series(["A", "D"])), [2, 3])
+    assert encoder.classes.tolist() == ["B", "C", "A", "D"]
+    label_encoder, remap = encoder.to_label_encoder()
+    assert label_encoder.classes_.tolist() == ["A", "B", "C", "D"]
+    np.testing.assert_array_equal(label_encoder.classes_[remap], encoder.classes)
@@ -1,15 +1,23 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
-import joblib
 import os
+import resource
+import sys
+import time
 from pathlib import Path
 
+# The shared package sits next to the service directories
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from model_store import publish_model
+from shared.college_ids import CollegeIds, registry_path
+from training_data import read_history
+
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
-DATA_PATH = BASE_DIR / "../database/cutoff_history.csv"
-MODEL_DIR = BASE_DIR / "model"
+DATA_PATH = Path(os.environ.get("CUTOFF_HISTORY_PATH", BASE_DIR / "../database/cutoff_history.csv"))
+MODEL_DIR = Path(os.environ.get("MODEL_DIR", BASE_DIR / "model"))
 MODEL_DIR.mkdir(exist_ok=True)
 
 # Generate dummy data if CSV doesn't exist
@@ -32,35 +40,41 @@ if not DATA_PATH.exists():
     df = pd.DataFrame(data)
     df.to_csv(DATA_PATH, index=False)
     print(f"Synthetic data saved to {DATA_PATH}")
-else:
-    df = pd.read_csv(DATA_PATH)
-
-# Feature engineering
-# Encode categorical variables
-le_college = LabelEncoder()
-le_course = LabelEncoder()
-le_category = LabelEncoder()
 
-df['college_enc'] = le_college.fit_transform(df['college_id'])
-df['course_enc'] = le_course.fit_transform(df['course'])
-df['category_enc'] = le_category.fit_transform(df['category'])
+# Stream the history in typed chunks and encode it incrementally
+TRAIN_CHUNK_ROWS = int(os.environ.get("TRAIN_CHUNK_ROWS", "200000"))
+TRAIN_JOBS = int(os.environ.get("TRAIN_JOBS", "-1"))
+# Tree size grows with the data; on large histories bound it with a bootstrap
+# fraction per tree and/or a larger minimum leaf size
+TRAIN_MAX_SAMPLES = float(os.environ["TRAIN_MAX_SAMPLES"]) if os.environ.get("TRAIN_MAX_SAMPLES") else None
+TRAIN_MIN_SAMPLES_LEAF = int(os.environ.get("TRAIN_MIN_SAMPLES_LEAF", "1"))
+start = time.perf_counter()
+X, y, (year_min, year_max), (le_college, le_course, le_category) = read_history(
+    DATA_PATH, chunk_rows=TRAIN_CHUNK_ROWS)
+print(f"Loaded {len(y)} rows in {time.perf_counter() - start:.2f}s "
+      f"({len(le_college.classes_)} colleges, {len(le_course.classes_)} courses, "
+      f"{len(le_category.classes_)} categories, {year_min}-{year_max})")
+if le_college.classes_.dtype.kind in "OUS":
+    # New colleges get the next persisted college_ids; existing ids never change
+    CollegeIds(registry_path(DATA_PATH)).register(le_college.classes_)
 
-# Features and target
-features = ['college_enc', 'course_enc', 'category_enc', 'year']
-X = df[features]
-y = df['cutoff_rank']
-
-# Train model
-model = RandomForestRegressor(n_estimators=100, random_state=42)
+# Train model, building trees in parallel across cores
+fit_start = time.perf_counter()
+model = RandomForestRegressor(
+    n_estimators=100, random_state=42, n_jobs=TRAIN_JOBS,
+    max_samples=TRAIN_MAX_SAMPLES, min_samples_leaf=TRAIN_MIN_SAMPLES_LEAF,
+)
 model.fit(X, y)
+print(f"Trained {model.n_estimators} trees in {time.perf_counter() - fit_start:.2f}s")
 
-# Save model and encoders
-joblib.dump(model, MODEL_DIR / 'cutoff_model.pkl')
-joblib.dump(le_college, MODEL_DIR / 'le_college.pkl')
-joblib.dump(le_course, MODEL_DIR / 'le_course.pkl')
-joblib.dump(le_category, MODEL_DIR / 'le_category.pkl')
-
-# Save feature list (optional)
-joblib.dump(features, MODEL_DIR / 'features.pkl')
+# Save model, encoders and prediction table, then publish the new version
+PREDICTION_YEARS_AHEAD = int(os.environ.get("PREDICTION_YEARS_AHEAD", "2"))
+PREDICTION_TABLE_MAX_MB = int(os.environ.get("PREDICTION_TABLE_MAX_MB", "256"))
+publish_model(
+    MODEL_DIR, model, le_college, le_course, le_category, DATA_PATH,
+    rows=len(y), years=(year_min, year_max),
+    table_years_ahead=PREDICTION_YEARS_AHEAD, table_max_mb=PREDICTION_TABLE_MAX_MB,
+)
 
-print("Model and encoders saved successfully.")
\ No newline at end of file
+peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"Total wall time {time.perf_counter() - start:.2f}s, peak RSS {peak_rss_mb:.0f} MB")
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Streaming loader for the cutoff history used by train_model.py.
+
+The CSV is read in typed chunks of only the needed columns. Each chunk is
+label-encoded against vocabularies that grow as new values appear, and
+only the compact integer codes are kept, so peak memory is one raw chunk
+plus ~16 bytes per row instead of the whole history as Python strings.
+
+Colleges are keyed by the college_id column when the file has one
+(synthetic data) and by Name otherwise (the real cutoff_history.csv).
+Passing the classes of already-fitted encoders keeps their codes and only
+appends new values, which is what model_refresh.py needs so the existing
+trees stay valid.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+FEATURES = ['college_enc', 'course_enc', 'category_enc', 'year']
+
+
+def college_key(path) -> str:
+    """Column that identifies a college in this history file"""
+    columns = pd.read_csv(path, nrows=0).columns
+    return 'college_id' if 'college_id' in columns else 'Name'
+
+
+class IncrementalEncoder:
+    """Label encoder fitted chunk by chunk; codes follow first appearance"""
+
+    def __init__(self, classes=()):
+        self._codes = {value: code for code, value in enumerate(classes)}
+
+    def __len__(self):
+        return len(self._codes)
+
+    @property
+    def classes(self) -> np.ndarray:
+        return np.array(list(self._codes), dtype=object)
+
+    def fit_transform(self, values: pd.Series) -> np.ndarray:
+        """Codes for values, adding unseen values to the vocabulary"""
+        codes, uniques = pd.factorize(values)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques.tolist()):
+            mapping[i] = self._codes.setdefault(value, len(self._codes))
+        return mapping[codes]
+
+    def to_label_encoder(self, sort: bool = True):
+        """(LabelEncoder, code -> final code array); sort=False keeps code order"""
+        classes = self.classes
+        order = pd.Index(classes).argsort() if sort else np.arange(len(classes))
+        remap = np.empty(len(classes), dtype=np.int32)
+        remap[order] = np.arange(len(classes), dtype=np.int32)
+        encoder = LabelEncoder()
+        encoder.classes_ = np.asarray(classes[order].tolist())
+        return encoder, remap
+
+
+def read_history(path, chunk_rows: int = 200_000, classes=None):
+    """Stream path into (X float32, y, year range, encoders).
+
+    classes: optional (college, course, category) vocabularies to extend
+    instead of fitting from scratch.
+    """
+    key = college_key(path)
+    columns = (key, 'course', 'category')
+    if classes is None:
+        encoders = {col: IncrementalEncoder() for col in columns}
+    else:
+        encoders = {col: IncrementalEncoder(values.tolist()) for col, values in zip(columns, classes)}
+    dtypes = {key: str if key == 'Name' else 'int64', 'course': str, 'category': str,
+              'year': 'int32', 'cutoff_rank': 'int32'}
+    parts = []
+    for chunk in pd.read_csv(path, usecols=list(dtypes), dtype=dtypes, chunksize=chunk_rows):
+        chunk = chunk.dropna()
+        parts.append((
+            encoders[key].fit_transform(chunk[key]),
+            encoders['course'].fit_transform(chunk['course']),
+            encoders['category'].fit_transform(chunk['category']),
+            chunk['year'].to_numpy(),
+            chunk['cutoff_rank'].to_numpy(),
+        ))
+
+    n_rows = sum(len(part[0]) for part in parts)
+    X = np.empty((n_rows, len(FEATURES)), dtype=np.float32)
+    y = np.empty(n_rows, dtype=np.float64)
+    label_encoders = {}
+    remaps = []
+    for col in columns:
+        label_encoders[col], remap = encoders[col].to_label_encoder(sort=classes is None)
+        remaps.append(remap)
+    start = 0
+    while parts:
+        # Consume chunks as they are copied so codes aren't held twice
+        college, course, category, year, rank = parts.pop(0)
+        stop = start + len(rank)
+        for j, (codes, remap) in enumerate(zip((college, course, category), remaps)):
+            X[start:stop, j] = remap[codes]
+        X[start:stop, 3] = year
+        y[start:stop] = rank
+        start = stop
+    years = (int(X[:, 3].min()), int(X[:, 3].max())) if n_rows else None
+    return X, y, years, (label_encoders[key], label_encoders['course'], label_encoders['category'])
@@ -0,0 +1,7 @@
+"""Modules shared by ml-service and chatbot-service.
+
+Both services add the repository root (and database/) to sys.path before
+their own imports, so these are imported as shared.<module>. The Docker
+images copy shared/ and database/ next to the service directory, which
+keeps the same layout; build them from the repository root.
+"""
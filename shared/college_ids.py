@@ -0,0 +1,102 @@
+"""Persistent, append-only college ids for the Name-keyed cutoff history.
+
+The public college_id used to be a college's position in the sorted list
+of distinct names, so a refresh that added a college sorting early ("AA
+...") shifted every id after it, and services built from different files
+disagreed. Ids now live in college_ids.csv (college_id,Name) next to the
+history file (COLLEGE_IDS_PATH overrides): a name keeps its id forever and
+unseen names are appended, sorted among themselves, after the current
+maximum. Seeding an empty registry from the history therefore gives the
+old sorted-position ids.
+
+Training, model_refresh.py, cutoff snapshots, TrendIndex, CutoffIndex and
+the chatbot's CutoffCube all register the names they read, and the file is
+rewritten under an exclusive lock with an atomic replace, so concurrent
+processes agree on every id.
+"""
+import fcntl
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+IDS_FILE = "college_ids.csv"
+
+
+def registry_path(history_path) -> Path:
+    """Registry used with a history file: COLLEGE_IDS_PATH or its sibling"""
+    override = os.environ.get("COLLEGE_IDS_PATH")
+    return Path(override) if override else Path(history_path).with_name(IDS_FILE)
+
+
+def clean_names(names) -> list:
+    """Distinct non-blank names as strings, in first-seen order"""
+    return list(dict.fromkeys(str(name) for name in names if pd.notna(name) and str(name).strip()))
+
+
+class CollegeIds:
+    """Name -> college_id map backed by an append-only CSV file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._ids = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self):
+        stamp = self._file_stamp()
+        if stamp is not None and stamp != self._stamp:
+            df = pd.read_csv(self.path, dtype={"college_id": "int64", "Name": str}, keep_default_na=False)
+            self._ids = dict(zip(df["Name"].tolist(), df["college_id"].tolist()))
+            self._stamp = stamp
+
+    def _assign(self, names: list) -> bool:
+        """Give unseen names the next ids (sorted among themselves); True if any"""
+        new = sorted(name for name in names if name not in self._ids)
+        start = max(self._ids.values(), default=-1) + 1
+        self._ids.update((name, start + i) for i, name in enumerate(new))
+        return bool(new)
+
+    def _append(self, names: list):
+        """Assign ids to names that are still unseen and persist them"""
+        lock_path = self.path.with_name(f".{self.path.name}.lock")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another process may have appended since we last read the file
+            self._refresh()
+            if not self._assign(names):
+                return
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            pd.DataFrame({"college_id": list(self._ids.values()), "Name": list(self._ids)}).to_csv(
+                tmp, index=False)
+            os.replace(tmp, self.path)
+            self._stamp = self._file_stamp()
+
+    def register(self, names) -> dict:
+        """{name: college_id} for names, assigning ids to unseen ones"""
+        names = clean_names(names)
+        with self._lock:
+            self._refresh()
+            if any(name not in self._ids for name in names):
+                try:
+                    self._append(names)
+                except OSError as e:
+                    # Read-only deploy: ids still stable within this process
+                    print(f"⚠️ Warning: Could not update {self.path} - {e}")
+                    self._assign(names)
+            return {name: self._ids[name] for name in names}
+
+    def ids(self) -> dict:
+        """Current {name: college_id} for every registered name"""
+        with self._lock:
+            self._refresh()
+            return dict(self._ids)
@@ -0,0 +1,175 @@
+"""Fuzzy search over college names, built once per dataset load.
+
+Names are normalized to upper-case alphanumeric tokens. An inverted index
+maps each token to the colleges whose name contains it, and a trigram
+index over the token vocabulary finds the tokens a misspelt or truncated
+query word most likely meant ("ramakrishan", "sakthi engg"). Colleges are
+scored by the IDF weight of the query tokens they contain, so distinctive
+words count and COLLEGE / OF / ENGINEERING barely do. A word that is in
+the vocabulary is never fuzzed, and a fuzzy match is worth no more than
+the word itself (judged by how many colleges it matches), so a common
+word can't resolve to a rare misspelling of it in some name.
+
+Services pass ids, the persisted name -> college_id map of
+college_ids.py, so an id means the same college to app.py (which maps it
+to the model's college code by name), app_simple.py and the chatbot, and
+keeps meaning it when new colleges are added. Without ids a college's id
+is its position in the sorted names. The chatbot searches whole chat
+messages, so it passes CHAT_STOPWORDS to drop their filler words as well.
+"""
+import bisect
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+# Query words shorter than this only match exactly (too noisy to fuzz)
+MIN_FUZZY_LENGTH = 4
+# Trigram (Dice) similarity a vocabulary token needs to count as a match
+MIN_SIMILARITY = 0.5
+# A word that is a prefix of a longer name token ("ramakrish")
+PREFIX_SIMILARITY = 0.9
+# Share of a name's IDF weight a message must match to resolve to it
+MIN_COVERAGE = 0.5
+# Words that say nothing about which college is meant
+STOPWORDS = frozenset({"A", "AN", "AND", "AT", "FOR", "IN", "IS", "OF", "THE", "TO"})
+# ...plus the filler of chat questions ("which college can I get with my rank")
+CHAT_STOPWORDS = STOPWORDS | {
+    "ABOUT", "AM", "ANY", "ARE", "BEST", "CAN", "CHANCE", "CHANCES", "COULD", "DO", "DOES",
+    "GET", "GIVE", "GOOD", "HOW", "I", "IF", "IT", "LIST", "ME", "MY", "PLEASE", "RANK",
+    "SHOW", "TELL", "TOP", "WHAT", "WHICH", "WILL", "WITH",
+}
+
+
+def tokenize(text, stopwords=STOPWORDS) -> list:
+    """Upper-case alphanumeric tokens of text, without stopwords"""
+    return [token for token in TOKEN_RE.findall(str(text).upper()) if token not in stopwords]
+
+
+def trigrams(token: str) -> set:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CollegeSearch:
+    """Token inverted index with trigram fuzzy matching over college names"""
+
+    def __init__(self, names, cache_size: int = 4096, stopwords=STOPWORDS, ids=None):
+        self.names = sorted({str(name) for name in names if str(name).strip()})
+        self.stopwords = stopwords
+        # Scoring works on positions in self.names; results carry the public ids
+        if ids is None:
+            self.ids = np.arange(len(self.names))
+        else:
+            self.ids = np.array([ids[name] for name in self.names], dtype=np.int64)
+        self._ids = dict(zip(self.names, self.ids.tolist()))
+        self._positions = {college_id: position for position, college_id in enumerate(self.ids.tolist())}
+
+        postings = defaultdict(set)
+        for position, name in enumerate(self.names):
+            for token in tokenize(name, stopwords):
+                postings[token].add(position)
+        self.vocabulary = sorted(postings)
+        self._postings = {token: np.array(sorted(ids), dtype=np.int32) for token, ids in postings.items()}
+        n = max(len(self.names), 1)
+        self._idf = {token: math.log(1 + n / len(ids)) for token, ids in postings.items()}
+        self._name_weight = np.array([
+            sum(self._idf[token] for token in set(tokenize(name, stopwords))) or 1.0 for name in self.names
+        ])
+
+        self._trigrams = defaultdict(list)
+        for token in self.vocabulary:
+            if len(token) >= MIN_FUZZY_LENGTH - 1:
+                for gram in trigrams(token):
+                    self._trigrams[gram].append(token)
+
+        self._expand = lru_cache(maxsize=cache_size)(self._expand_token)
+        self.search = lru_cache(maxsize=cache_size)(self._search)
+
+    def __len__(self):
+        return len(self.names)
+
+    def name(self, college_id):
+        """Name of a college id, or None if there is no such college"""
+        position = self._positions.get(college_id)
+        return self.names[position] if position is not None else None
+
+    def college_id(self, name):
+        """Id of an exact college name, or None"""
+        return self._ids.get(str(name))
+
+    def _expand_token(self, token: str) -> tuple:
+        """(vocabulary token, weight) pairs a query token may stand for"""
+        if token in self._postings:
+            return ((token, self._idf[token]),)
+        if len(token) < MIN_FUZZY_LENGTH:
+            return ()
+        matches = {}
+        start = bisect.bisect_left(self.vocabulary, token)
+        for candidate in self.vocabulary[start:]:
+            if not candidate.startswith(token):
+                break
+            matches.setdefault(candidate, PREFIX_SIMILARITY)
+
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] += 1
+        for candidate, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(candidate))
+            if similarity >= MIN_SIMILARITY and similarity > matches.get(candidate, 0):
+                matches[candidate] = similarity
+        if not matches:
+            return ()
+        # The word's own IDF, as if it were a token of every college it matches
+        matched = np.unique(np.concatenate([self._postings[candidate] for candidate in matches]))
+        own_idf = math.log(1 + len(self.names) / len(matched))
+        return tuple((candidate, min(similarity * self._idf[candidate], own_idf))
+                     for candidate, similarity in matches.items())
+
+    def _search(self, query: str, limit: int = 5) -> tuple:
+        """Best colleges for query as ((college_id, name, score), ...).
+
+        score is the summed IDF weight of the matched query words; ties go
+        to the college whose name the query covers more of.
+        """
+        scores = np.zeros(len(self.names))
+        for token in dict.fromkeys(tokenize(query, self.stopwords)):
+            matches = self._expand(token)
+            if not matches:
+                continue
+            # Each query word counts once per college, via its best-matching token
+            best = np.zeros(len(self.names))
+            for candidate, weight in matches:
+                ids = self._postings[candidate]
+                best[ids] = np.maximum(best[ids], weight)
+            scores += best
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            # Keep everything tied with the limit-th best so tie-breaks stay exact
+            cut = np.partition(scores[matched], len(matched) - limit)[len(matched) - limit]
+            matched = matched[scores[matched] >= cut - 1e-6]
+        ranked = sorted(matched.tolist(), key=lambda c: (
+            -round(scores[c], 6), -scores[c] / self._name_weight[c], c))[:limit]
+        return tuple((int(self.ids[c]), self.names[c], round(float(scores[c]), 4)) for c in ranked)
+
+    def resolve(self, text: str, min_score: float = 3.0, min_coverage: float = MIN_COVERAGE):
+        """(college_id, name) of the college text most clearly names, or None.
+
+        min_score is roughly the weight of one word shared by 1 in 20
+        colleges, so generic words alone never resolve to a college, and
+        the match must also cover min_coverage of the name's own weight, so
+        one stray word can't pick a college with a long distinctive name.
+        """
+        hits = self.search(text, 1)
+        if not hits:
+            return None
+        college_id, name, score = hits[0]
+        if score >= min_score and score >= min_coverage * self._name_weight[self._positions[college_id]]:
+            return college_id, name
+        return None
@@ -0,0 +1,164 @@
+"""In-process load test driver behind each service's benchmark_load.py.
+
+run() writes a synthetic cutoff history of --rows rows
+(database/synthetic_history.py), points the service at it, imports the
+app and replays the service's request mix from --concurrency closed-loop
+clients through httpx's ASGI transport, so no server process or sockets
+are involved. It reports p50/p95/p99 latency and RPS per request kind and
+overall, plus the process RSS; --json also writes the numbers, with the
+git commit and settings, so runs can be compared across commits. Needs
+httpx (requirements-dev.txt).
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR / "database"))
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (FileNotFoundError, ValueError):
+        return float("nan")
+
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(ms),
+        "rps": round(len(ms) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+    }
+
+
+async def replay(app, requests: list, warmup: int, concurrency: int):
+    """Send requests from concurrency clients; (per-request results, elapsed s)"""
+    import httpx
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for _, path, body in requests[:warmup]:
+                await client.post(path, json=body)
+
+            queue = iter(requests[warmup:])
+
+            async def worker():
+                for kind, path, body in queue:
+                    start = time.perf_counter()
+                    try:
+                        status = (await client.post(path, json=body)).status_code
+                    except Exception:
+                        status = None
+                    results.append((kind, time.perf_counter() - start, status))
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return results, time.perf_counter() - start
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(description: str, apps: list):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--app", choices=apps, default="app_simple")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--colleges", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--snapshot", action="store_true",
+                        help="serve from a published memory-mapped snapshot instead of the CSV")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args()
+
+
+def run(service: str, service_dir, args, make_requests, kinds, label: str = "route",
+        kind_name=str):
+    """Benchmark args.app of service; make_requests(df, n) gives (kind, path, body) tuples"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app (and cutoff_snapshot, which reads these at import) at
+        # the synthetic data, so a published real snapshot is never picked up
+        # and synthetic names never enter the real college id registry
+        history_path = Path(tmp) / "cutoff_history.csv"
+        snapshot_root = Path(tmp) / "snapshots"
+        os.environ["CUTOFF_HISTORY_PATH"] = str(history_path)
+        os.environ["CUTOFF_SNAPSHOT_ROOT"] = str(snapshot_root)
+        os.environ["COLLEGE_IDS_PATH"] = str(Path(tmp) / "college_ids.csv")
+        from cutoff_snapshot import write_snapshot
+        from synthetic_history import synthetic_history
+
+        df = synthetic_history(args.rows, args.colleges, args.seed)
+        df.to_csv(history_path, index=False)
+        if args.snapshot:
+            write_snapshot(df, root=snapshot_root)
+
+        os.chdir(service_dir)
+        sys.path.insert(0, str(service_dir))
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        module = importlib.import_module(args.app)
+        startup = time.perf_counter() - start
+        store = getattr(module, "snapshot_store", None)
+        if args.snapshot and (store is None or store.root != snapshot_root or store.version is None):
+            raise SystemExit(f"{args.app} is not serving the synthetic snapshot in {snapshot_root}")
+        app = module.app
+
+        requests = make_requests(df, args.warmup + args.requests)
+        results, elapsed = asyncio.run(replay(app, requests, args.warmup, args.concurrency))
+
+    report = {
+        "service": service,
+        "app": args.app,
+        "commit": git_commit(),
+        "settings": vars(args),
+        "startup_s": round(startup, 3),
+        "rss_mb": {"before_app": round(rss_before, 1), "after": round(rss_mb(), 1),
+                   "peak": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)},
+        "status": {},
+        "overall": summarize([latency for _, latency, _ in results], elapsed),
+        "routes": {},
+    }
+    for _, _, status in results:
+        report["status"][str(status)] = report["status"].get(str(status), 0) + 1
+    for kind in kinds:
+        latencies = [latency for k, latency, _ in results if k == kind]
+        if latencies:
+            report["routes"][kind_name(kind)] = summarize(latencies, elapsed)
+
+    print(f"{args.app} @ {report['commit']}: {args.rows} rows, {args.colleges} colleges, "
+          f"{args.requests} requests x {args.concurrency} clients, startup {startup:.2f}s")
+    print(f"{label:<22} {'requests':>8} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route, stats in list(report["routes"].items()) + [("overall", report["overall"])]:
+        print(f"{route:<22} {stats['requests']:>8} {stats['rps']:>8.1f} {stats['p50_ms']:>8.2f} "
+              f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    print(f"status codes: {report['status']}")
+    print(f"RSS: {report['rss_mb']['after']:.0f} MB (before app {report['rss_mb']['before_app']:.0f} MB, "
+          f"peak {report['rss_mb']['peak']:.0f} MB)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
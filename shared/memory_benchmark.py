@@ -0,0 +1,107 @@
+"""Memory of a service with 1, 4 and 8 workers, for its benchmark_memory.py.
+
+Compares `uvicorn app:app --workers N` (every worker loads its own model)
+with `python serve.py --workers N` (model loaded once, workers forked).
+Memory is the summed PSS of the whole process tree, which splits shared
+copy-on-write pages between the processes that map them, so it is the
+real footprint. Linux only.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid: int) -> list:
+    pids = [pid]
+    for child in pids:
+        try:
+            with open(f"/proc/{child}/task/{child}/children") as f:
+                pids.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            pass
+    return pids
+
+
+def pss_mb(pid: int) -> float:
+    total_kb = 0
+    for child in process_tree(pid):
+        try:
+            with open(f"/proc/{child}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        total_kb += int(line.split()[1])
+        except FileNotFoundError:
+            pass
+    return total_kb / 1024
+
+
+def post(port: int, path: str, body: dict):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}", data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def wait_ready(port: int, workers: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            # Give the remaining workers a moment to finish starting
+            time.sleep(1 + 0.5 * workers)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"server on port {port} did not start")
+
+
+def measure(mode: str, workers: int, path: str, body: dict, requests: int, timeout: float) -> float:
+    port = free_port()
+    if mode == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "serve.py", "--port", str(port), "--host", "127.0.0.1",
+               "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, workers, timeout)
+        # Touch every worker's request path so lazy state is allocated
+        for _ in range(requests):
+            post(port, path, body)
+        return pss_mb(proc.pid)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main(service_dir, path: str, body: dict):
+    """Measure the service in service_dir, touching path with body"""
+    parser = argparse.ArgumentParser(description="Service memory vs worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=180)
+    args = parser.parse_args()
+
+    os.chdir(service_dir)
+    print(f"{'workers':>7} {'uvicorn MB':>11} {'prefork MB':>11} {'saved':>7}")
+    for workers in args.workers:
+        spawned = measure("uvicorn", workers, path, body, args.requests, args.timeout)
+        forked = measure("prefork", workers, path, body, args.requests, args.timeout)
+        print(f"{workers:>7} {spawned:>11.1f} {forked:>11.1f} {1 - forked / spawned:>7.0%}")
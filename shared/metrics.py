@@ -0,0 +1,171 @@
+"""Prometheus-style metrics without a client library.
+
+One process-wide registry (metrics) holds:
+  - http_request_duration_seconds{method,route,status}, recorded by
+    MetricsMiddleware per route template (not raw path, so ids in URLs
+    don't explode the label set)
+  - stage_duration_seconds{stage}, fed by @metrics.timed(...) and
+    metrics.stage(...) around hot-path functions
+  - gauges and counters read from existing stats() dicts (caches, work
+    pools) only when /metrics is scraped, so they cost nothing per request
+render() produces the text exposition format.
+
+METRICS=0 disables collection: timed() returns the function unchanged,
+stage() returns a shared no-op context, and the apps skip the middleware.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Upper bounds in seconds, from sub-millisecond lookups to slow model calls
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple, seconds: float):
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if slot < len(self.buckets):
+                series[slot] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _labels(self.label_names + ("le",), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.label_names + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {values[-1]}")
+            labels = _labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+class _Stage:
+    __slots__ = ("histogram", "key", "start")
+
+    def __init__(self, histogram, name):
+        self.histogram = histogram
+        self.key = (name,)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(self.key, time.perf_counter() - self.start)
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.requests = Histogram("http_request_duration_seconds", "HTTP request latency by route",
+                                  ("method", "route", "status"))
+        self.stages = Histogram("stage_duration_seconds", "Time spent in named hot-path stages",
+                                ("stage",))
+        self._stats = []  # (prefix, labels, stats_fn, gauges, counters)
+
+    def stage(self, name: str):
+        """Context manager timing a block into stage_duration_seconds{stage=name}"""
+        return _Stage(self.stages, name) if self.enabled else _NOOP
+
+    def timed(self, name: str):
+        """Decorator timing every call of a function as stage name"""
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+            key = (name,)
+            observe = self.stages.observe
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    observe(key, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def add_stats(self, prefix: str, labels: dict, stats, gauges=(), counters=()):
+        """Export fields of stats() as <prefix>_<field> gauges and _total counters"""
+        self._stats.append((prefix, labels, stats, gauges, counters))
+
+    def render(self) -> str:
+        lines = self.requests.render() + self.stages.render()
+        families = {}
+        for prefix, labels, stats, gauges, counters in self._stats:
+            values = stats()
+            label_text = _labels(tuple(labels), tuple(labels.values()))
+            for field in gauges:
+                families.setdefault((f"{prefix}_{field}", "gauge"), []).append(
+                    f"{prefix}_{field}{label_text} {values[field]}")
+            for field in counters:
+                families.setdefault((f"{prefix}_{field}_total", "counter"), []).append(
+                    f"{prefix}_{field}_total{label_text} {values[field]}")
+        for (name, kind), samples in families.items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request into metrics.requests"""
+
+    def __init__(self, app, metrics: "Metrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = scope.get("route")
+            self.metrics.requests.observe(
+                (scope["method"], route.path if route is not None else "unmatched", status[0]),
+                time.perf_counter() - start)
+
+
+metrics = Metrics(enabled=os.environ.get("METRICS", "1") != "0")
@@ -0,0 +1,102 @@
+"""Pre-fork server: load the app (and its model) once, then fork workers.
+
+`uvicorn app:app --workers N` spawns N fresh interpreters that each import
+the app and load their own copy of the weights. Here the parent imports the
+app once, freezes the GC (so collections don't write to the shared object
+pages) and forks N workers that serve a shared listening socket. The
+weights stay in copy-on-write pages, so each extra worker only adds its own
+interpreter and request state. Each service's serve.py runs main() from
+its own directory:
+
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+
+import uvicorn
+
+
+def load_app(target: str):
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "app")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, log_level: str):
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, timeout_graceful_shutdown=10)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, sock, log_level)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app:app", help="module:attribute of the ASGI app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", "1")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    app = load_app(args.app)
+    sock = bind_socket(args.host, args.port)
+    if args.workers <= 1:
+        run_worker(app, sock, args.log_level)
+        return
+    gc.collect()
+    gc.freeze()
+    print(f"✅ Loaded {args.app} once, forking {args.workers} workers on {args.host}:{args.port}")
+
+    workers = {spawn(app, sock, args.log_level) for _ in range(args.workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    # Replace workers that die unexpectedly until asked to stop
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited ({status}), restarting")
+            workers.add(spawn(app, sock, args.log_level))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Run from the repository root: python -m pytest shared/tests"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.append(str(ROOT_DIR / "database"))
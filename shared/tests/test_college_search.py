@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from shared.college_search import CHAT_STOPWORDS, CollegeSearch
+
+HISTORY = Path(__file__).resolve().parents[2] / "database" / "cutoff_history.csv"
+
+
+@pytest.fixture(scope="module")
+def colleges():
+    return CollegeSearch(pd.read_csv(HISTORY)["Name"].dropna().unique(), stopwords=CHAT_STOPWORDS)
+
+
+@pytest.mark.parametrize("message", [
+    "which engineering college can i get with rank 20000 in cse",
+    "is my rank 15000 good for cse",
+    "best engineering college cutoff for bc",
+    "engneering college cutoff",
+    "colleges for rank 5000 in ECE MBC",
+    "hello",
+])
+def test_ordinary_questions_name_no_college(colleges, message):
+    assert colleges.resolve(message) is None
+
+
+@pytest.mark.parametrize("message, name", [
+    ("cutoff of kongu engg", "KONGU ENGINEERING COLLEGE"),
+    ("ramakrishan college of technology cutoff", "K RAMAKRISHNAN COLLEGE OF TECHNOLOGY"),
+    ("what is the cutoff of psg college of technology", "PSG COLLEGE OF TECHNOLOGY"),
+    ("good shepherd college cutoff", "GOOD SHEPHERD COLLEGE OF ENGINEERING &"),
+    ("jayaraj annapackiam college", "JAYARAJ ANNAPACKIAM CSI COLLEGE OF ENGTINEERING"),
+])
+def test_named_colleges_resolve(colleges, message, name):
+    assert colleges.resolve(message) == (colleges.college_id(name), name)
+
+
+def test_exact_word_is_not_fuzzed_to_a_rare_misspelling(colleges):
+    assert colleges._expand("ENGINEERING") == (("ENGINEERING", colleges._idf["ENGINEERING"]),)
+
+
+def test_ids_are_sorted_name_positions(colleges):
+    assert colleges.names == sorted(colleges.names)
+    assert all(colleges.college_id(colleges.name(i)) == i for i in range(len(colleges)))
+    assert colleges.name(len(colleges)) is None
+
+
+def test_chat_stopwords_only_apply_when_asked():
+    names = ["GOOD SHEPHERD COLLEGE", "ANNA UNIVERSITY"]
+    assert CollegeSearch(names).search("good", 1)[0][1] == "GOOD SHEPHERD COLLEGE"
+    assert CollegeSearch(names, stopwords=CHAT_STOPWORDS).search("good", 1) == ()
@@ -0,0 +1,58 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.metrics import Metrics, MetricsMiddleware
+
+
+def test_stage_timers_render_cumulative_buckets():
+    metrics = Metrics()
+
+    @metrics.timed("work")
+    def work(x):
+        return x + 1
+
+    assert work(1) == 2
+    with metrics.stage("work"):
+        pass
+    text = metrics.render()
+    assert 'stage_duration_seconds_count{stage="work"} 2' in text
+    assert 'stage_duration_seconds_bucket{stage="work",le="+Inf"} 2' in text
+
+
+def test_disabled_metrics_leave_functions_untouched():
+    metrics = Metrics(enabled=False)
+
+    def work():
+        return 1
+
+    assert metrics.timed("work")(work) is work
+    with metrics.stage("work"):
+        pass
+    assert "stage=" not in metrics.render()
+
+
+def test_stats_are_exported_as_gauges_and_counters():
+    metrics = Metrics()
+    metrics.add_stats("cache", {"name": "responses"}, lambda: {"size": 3, "hits": 7},
+                      gauges=("size",), counters=("hits",))
+    text = metrics.render()
+    assert "# TYPE cache_size gauge" in text and 'cache_size{name="responses"} 3' in text
+    assert "# TYPE cache_hits_total counter" in text and 'cache_hits_total{name="responses"} 7' in text
+
+
+def test_middleware_labels_requests_by_route_template():
+    metrics = Metrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/colleges/{college_id}")
+    def college(college_id: int):
+        return {"id": college_id}
+
+    client = TestClient(app)
+    client.get("/colleges/1")
+    client.get("/colleges/2")
+    client.get("/nowhere")
+    text = metrics.render()
+    assert 'http_request_duration_seconds_count{method="GET",route="/colleges/{college_id}",status="200"} 2' in text
+    assert 'route="unmatched",status="404"' in text
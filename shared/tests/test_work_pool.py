@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from shared.work_pool import PoolOverloaded, WorkPool
+
+
+def test_calls_beyond_workers_and_queue_are_rejected():
+    pool = WorkPool("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolOverloaded):
+            await pool.run(lambda: "rejected")
+        release.set()
+        return await asyncio.gather(running, queued)
+
+    try:
+        assert asyncio.run(main()) == [True, "queued"]
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["peak_queued"], stats["queued"]) == (2, 1, 1, 0)
+
+
+def test_failures_propagate_and_free_their_slot():
+    pool = WorkPool("test", max_workers=1, max_queue=0)
+
+    async def main():
+        with pytest.raises(ZeroDivisionError):
+            await pool.run(lambda: 1 / 0)
+        return await pool.run(sum, [1, 2, 3])
+
+    try:
+        assert asyncio.run(main()) == 6
+    finally:
+        pool.shutdown()
+    assert (pool.stats()["failed"], pool.stats()["completed"]) == (1, 1)
@@ -0,0 +1,99 @@
+"""Bounded worker pool for CPU-heavy work called from async handlers.
+
+Handlers await pool.run(fn, *args) instead of blocking the event loop or
+sharing Starlette's default threadpool. At most max_workers calls run at
+once and at most max_queue more may wait; beyond that run() raises
+PoolOverloaded, which the app turns into a 503 so bursts are shed quickly
+instead of queueing without bound.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolOverloaded(Exception):
+    """The pool's queue is full"""
+
+    def __init__(self, pool_name: str):
+        super().__init__(f"{pool_name} pool is overloaded")
+        self.pool_name = pool_name
+
+
+class WorkPool:
+    """Dedicated, sized thread pool with admission control and counters"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self.pending = 0  # admitted calls, running or queued
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.peak_queued = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return self.pending - self.running
+
+    async def run(self, fn, *args):
+        """fn(*args) on a pool thread; raises PoolOverloaded when full"""
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolOverloaded(self.name)
+            self.pending += 1
+            self.peak_queued = max(self.peak_queued, self.pending - self.max_workers)
+        future = self._executor.submit(self._call, time.perf_counter(), fn, args)
+        # Released when the call finishes or is cancelled before starting
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def _call(self, submitted, fn, args):
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.wait_seconds += started - submitted
+        ok = False
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running -= 1
+                self.run_seconds += elapsed
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(1000 * self.wait_seconds / finished, 3) if finished else 0.0,
+                "avg_run_ms": round(1000 * self.run_seconds / finished, 3) if finished else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)